@@ -1,3 +1,4 @@
+import importlib.util
 import pathlib
 from importlib.metadata import version
 
@@ -19,14 +20,28 @@ class Extension(ext.Extension):
         schema = super().get_config_schema()
         schema["desktop_file"] = config.Deprecated()
         schema["bus_type"] = config.String(choices=["session", "system"])
+        schema["signal_coalesce_ms"] = config.Integer(minimum=0)
+        schema["art_cache_size"] = config.Integer(minimum=0)
+        schema["art_cache_ttl"] = config.Integer(minimum=1, optional=True)
+        schema["tracklist_window"] = config.Integer(minimum=0)
+        schema["position_refresh_ms"] = config.Integer(minimum=0)
+        schema["position_drift_check_ms"] = config.Integer(minimum=0)
+        schema["position_drift_threshold_ms"] = config.Integer(minimum=0)
+        schema["seeked_min_interval_ms"] = config.Integer(minimum=0)
+        schema["volume_min_interval_ms"] = config.Integer(minimum=0)
+        schema["transport_fire_and_forget"] = config.Boolean()
+        schema["core_timeout_ms"] = config.Integer(minimum=0)
+        schema["art_breaker_failures"] = config.Integer(minimum=0)
+        schema["art_breaker_slow_ms"] = config.Integer(minimum=1)
+        schema["art_breaker_cooldown"] = config.Integer(minimum=1)
         return schema
 
     def validate_environment(self) -> None:
-        try:
-            import pydbus  # noqa: F401, PLC0415
-        except ImportError as exc:
+        # Only look for pydbus, as importing it, and GLib with it, is slow.
+        # The frontend imports it when it starts.
+        if importlib.util.find_spec("pydbus") is None:
             msg = "pydbus library not found"
-            raise exceptions.ExtensionError(msg, exc) from exc
+            raise exceptions.ExtensionError(msg)
 
     def setup(self, registry: ext.Registry) -> None:
         from mopidy_mpris.frontend import MprisFrontend  # noqa: PLC0415
@@ -0,0 +1,62 @@
+"""Circuit breakers for core calls that keep failing."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Stops making a call that keeps failing, and tries again later.
+
+    After ``max_failures`` failures in a row, the breaker opens, and
+    :meth:`allow` returns :class:`False` for ``cooldown`` seconds. Then one
+    call is let through as a probe. If it succeeds, the breaker closes again,
+    and if it fails, the breaker stays open for another ``cooldown`` seconds.
+    A ``max_failures`` of zero disables the breaker.
+    """
+
+    def __init__(self, max_failures: int, cooldown: float) -> None:
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Check if the call should be made."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """Give up a probe without counting it as a success or a failure."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failed call, and return :class:`True` if the breaker opened."""
+        if self.max_failures <= 0:
+            return False
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            was_open = self._opened_at is not None
+            if was_open or self._failures >= self.max_failures:
+                self._opened_at = time.monotonic()
+            return not was_open and self._opened_at is not None
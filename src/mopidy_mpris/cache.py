@@ -0,0 +1,71 @@
+"""In-memory caches for values that are expensive to get from core."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache[K, V]:
+    """Mapping with a bounded number of entries and optional expiry.
+
+    When the cache is full, the least recently used entry is evicted. Entries
+    older than ``ttl`` seconds are treated as missing. A ``maxsize`` of zero
+    disables the cache.
+
+    Lookups of missing keys raise :exc:`KeyError`, just like for a dict. Hits
+    and misses are counted for diagnostics.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, key: K) -> V:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self._is_expired(entry[0]):
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                raise KeyError(key)
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the lookups that were hits, or zero without lookups."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return self.hits / lookups if lookups else 0.0
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
@@ -0,0 +1,121 @@
+"""Implementation of the Mopidy specific org.mopidy.Mpris.Debug interface.
+
+The interface exposes live counters from a running Mopidy, e.g.::
+
+    busctl --user get-property org.mpris.MediaPlayer2.mopidy \\
+        /org/mpris/MediaPlayer2 org.mopidy.Mpris.Debug Calls
+"""
+
+# ruff: noqa: N802
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from mopidy_mpris.interface import Interface
+from mopidy_mpris.stats import LATENCY_BUCKETS_US
+
+if TYPE_CHECKING:
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+
+    from mopidy_mpris.cache import LRUCache
+    from mopidy_mpris.stats import Stats
+
+logger = logging.getLogger(__name__)
+
+
+class Debug(Interface):
+    """
+    <node>
+      <interface name="org.mopidy.Mpris.Debug">
+        <method name="Reset"/>
+        <property name="Calls" type="a{st}" access="read">
+          <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+            value="false"/>
+        </property>
+        <property name="LatencyBuckets" type="at" access="read"/>
+        <property name="Latencies" type="a{sat}" access="read">
+          <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+            value="false"/>
+        </property>
+        <property name="CoreCalls" type="a{st}" access="read">
+          <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+            value="false"/>
+        </property>
+        <property name="Signals" type="a{st}" access="read">
+          <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+            value="false"/>
+        </property>
+        <property name="Timeouts" type="a{st}" access="read">
+          <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+            value="false"/>
+        </property>
+        <property name="CacheHitRates" type="a{sd}" access="read">
+          <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+            value="false"/>
+        </property>
+      </interface>
+    </node>
+    """
+
+    INTERFACE = "org.mopidy.Mpris.Debug"
+
+    def __init__(
+        self,
+        config: Config,
+        core: CoreProxy,
+        stats: Stats,
+        caches: dict[str, LRUCache],
+    ) -> None:
+        super().__init__(config, core, stats=stats)
+        self.caches = caches
+
+    def Reset(self) -> None:
+        logger.debug("%s.Reset called", self.INTERFACE)
+        self.stats.reset()
+        for cache in self.caches.values():
+            cache.reset_counters()
+
+    @property
+    def Calls(self) -> dict[str, int]:
+        self.log_trace("Getting %s.Calls", self.INTERFACE)
+        with self.stats.lock:
+            return dict(self.stats.calls)
+
+    @property
+    def LatencyBuckets(self) -> list[int]:
+        # Upper bounds of the buckets in microseconds. The histograms in
+        # Latencies have one more bucket, for the slower calls.
+        self.log_trace("Getting %s.LatencyBuckets", self.INTERFACE)
+        return list(LATENCY_BUCKETS_US)
+
+    @property
+    def Latencies(self) -> dict[str, list[int]]:
+        self.log_trace("Getting %s.Latencies", self.INTERFACE)
+        with self.stats.lock:
+            return {name: list(h) for name, h in self.stats.latencies.items()}
+
+    @property
+    def CoreCalls(self) -> dict[str, int]:
+        self.log_trace("Getting %s.CoreCalls", self.INTERFACE)
+        with self.stats.lock:
+            return dict(self.stats.core_calls)
+
+    @property
+    def Signals(self) -> dict[str, int]:
+        self.log_trace("Getting %s.Signals", self.INTERFACE)
+        with self.stats.lock:
+            return dict(self.stats.signals)
+
+    @property
+    def Timeouts(self) -> dict[str, int]:
+        self.log_trace("Getting %s.Timeouts", self.INTERFACE)
+        with self.stats.lock:
+            return dict(self.stats.timeouts)
+
+    @property
+    def CacheHitRates(self) -> dict[str, float]:
+        self.log_trace("Getting %s.CacheHitRates", self.INTERFACE)
+        return {name: cache.hit_rate for name, cache in self.caches.items()}
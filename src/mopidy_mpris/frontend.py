@@ -1,15 +1,22 @@
+from __future__ import annotations
+
 import logging
-from typing import override
+import threading
+import time
+from typing import TYPE_CHECKING, Any, override
 
 import pykka
-from mopidy.config import Config
 from mopidy.core import CoreEvent, CoreEventData, CoreListener, CoreProxy
-from mopidy.models import Playlist, TlTrack
 from mopidy.types import DurationMs, Percentage, PlaybackState, Uri
 
-from mopidy_mpris.interface import Interface
-from mopidy_mpris.playlists import get_playlist_id
-from mopidy_mpris.server import Server
+from mopidy_mpris.stats import Stats
+
+if TYPE_CHECKING:
+    from mopidy.config import Config
+    from mopidy.models import Playlist, TlTrack
+
+    from mopidy_mpris.interface import Interface
+    from mopidy_mpris.server import Server
 
 logger = logging.getLogger(__name__)
 
@@ -22,20 +29,86 @@ class MprisFrontend(pykka.ThreadingActor, CoreListener):
         self.core = core
         self.mpris: Server | None = None
 
+        self._coalesce_window = (
+            config["mpris"]["signal_coalesce_ms"] / 1000  # pyright: ignore[reportGeneralTypeIssues]
+        )
+        self._pending_lock = threading.Lock()
+        self._pending_properties: dict[Interface, list[str]] = {}
+        self._flush_timer: threading.Timer | None = None
+        # If the next Metadata signal should be followed by a
+        # TrackMetadataChanged signal on the tracklist.
+        self._track_metadata_changed = False
+
+        # Last emitted value of each property, per interface name. Signals
+        # are sent both from the actor and from the flush timer's thread.
+        self._emit_lock = threading.Lock()
+        self._emitted_values: dict[str, dict[str, Any]] = {}
+        self.stats = Stats()
+
+        self._drift_check_interval = (
+            config["mpris"]["position_drift_check_ms"] / 1000  # pyright: ignore[reportGeneralTypeIssues]
+        )
+        self._drift_threshold: int = config["mpris"]["position_drift_threshold_ms"]  # pyright: ignore[reportGeneralTypeIssues]
+        self._drift_check_stopped = threading.Event()
+
+        self._seeked_interval = (
+            config["mpris"]["seeked_min_interval_ms"] / 1000  # pyright: ignore[reportGeneralTypeIssues]
+        )
+        self._seeked_lock = threading.Lock()
+        self._seeked_pending: int | None = None
+        self._seeked_timer: threading.Timer | None = None
+        self._seeked_emitted_at = float("-inf")
+
     @override
     def on_start(self) -> None:
+        # Imported here, as the interfaces pull in pydbus and GLib, which
+        # Mopidy shouldn't have to load before it starts the frontends.
+        from mopidy_mpris.server import Server  # noqa: PLC0415
+
         try:
-            self.mpris = Server(self.config, self.core)
+            self.mpris = Server(self.config, self.core, self.stats)
             self.mpris.publish()
         except Exception as e:  # noqa: BLE001
             logger.warning("MPRIS frontend setup failed (%s)", e)
             self.stop()
+            return
+
+        # Mopidy waits for on_start before starting the next frontend, so
+        # don't wait longer than the getters would for a slow core.
+        player = self.mpris.player
+        try:
+            player.state.refresh(self.core, timeout=player.core_timeout)
+        except pykka.Timeout:
+            # The getters ask core until events have filled in the mirror.
+            player.on_core_timeout("refresh")
+
+        if self._drift_check_interval > 0:
+            threading.Thread(
+                target=self._run_drift_check,
+                name="MprisDriftCheck",
+                daemon=True,
+            ).start()
 
     @override
     def on_stop(self) -> None:
+        self._drift_check_stopped.set()
+        with self._seeked_lock:
+            if self._seeked_timer is not None:
+                self._seeked_timer.cancel()
+                self._seeked_timer = None
+            self._seeked_pending = None
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending_properties = {}
+            self._track_metadata_changed = False
+        with self._emit_lock:
+            self._emitted_values = {}
         logger.debug("Removing MPRIS object from D-Bus connection...")
         if self.mpris:
             self.mpris.unpublish()
+            self.mpris.player.shutdown()
             self.mpris = None
         logger.debug("Removed MPRIS object from D-Bus connection")
 
@@ -53,7 +126,10 @@ class MprisFrontend(pykka.ThreadingActor, CoreListener):
         time_position: DurationMs,
     ) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.player, ["PlaybackStatus"])
+        self.mpris.player.state.playback_state = PlaybackState.PAUSED
+        self.mpris.player.state.position.length = tl_track.track.length
+        self.mpris.player.state.position.set(time_position, running=False)
+        self._emit_properties_changed(self.mpris.player, ["PlaybackStatus"])
 
     @override
     def track_playback_resumed(
@@ -62,12 +138,21 @@ class MprisFrontend(pykka.ThreadingActor, CoreListener):
         time_position: DurationMs,
     ) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.player, ["PlaybackStatus"])
+        self.mpris.player.state.playback_state = PlaybackState.PLAYING
+        self.mpris.player.state.position.length = tl_track.track.length
+        self.mpris.player.state.position.set(time_position, running=True)
+        self._emit_properties_changed(self.mpris.player, ["PlaybackStatus"])
 
     @override
     def track_playback_started(self, tl_track: TlTrack) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.player, ["PlaybackStatus", "Metadata"])
+        self.mpris.player.invalidate_metadata()
+        self.mpris.player.state.playback_state = PlaybackState.PLAYING
+        self.mpris.player.state.position.length = tl_track.track.length
+        self.mpris.player.state.position.set(DurationMs(0), running=True)
+        self._emit_properties_changed(self.mpris.player, ["PlaybackStatus", "Metadata"])
+        # The exposed window of tracks follows the current track.
+        self.mpris.tracklist.refresh()
 
     @override
     def track_playback_ended(
@@ -76,7 +161,8 @@ class MprisFrontend(pykka.ThreadingActor, CoreListener):
         time_position: DurationMs,
     ) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.player, ["PlaybackStatus", "Metadata"])
+        self.mpris.player.invalidate_metadata()
+        self._emit_properties_changed(self.mpris.player, ["PlaybackStatus", "Metadata"])
 
     @override
     def playback_state_changed(
@@ -85,34 +171,52 @@ class MprisFrontend(pykka.ThreadingActor, CoreListener):
         new_state: PlaybackState,
     ) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.player, ["PlaybackStatus", "Metadata"])
+        self.mpris.player.invalidate_metadata()
+        self.mpris.player.state.playback_state = new_state
+        if new_state == PlaybackState.STOPPED:
+            # No event tells us where a stopped player is, so ask core.
+            self.mpris.player.state.position.clear()
+        self._emit_properties_changed(self.mpris.player, ["PlaybackStatus", "Metadata"])
 
     @override
     def tracklist_changed(self) -> None:
-        pass  # TODO: Implement if adding tracklist support
+        assert self.mpris
+        # The current track may have been removed.
+        self.mpris.player.invalidate_metadata()
+        self.mpris.tracklist.refresh()
 
     @override
     def playlists_loaded(self) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.playlists, ["PlaylistCount"])
+        # Core has no event for library reloads. Backends emit this event
+        # after refreshing their content, so use it as the cue to forget
+        # cached album art.
+        self.mpris.player.resolver.art_cache.clear()
+        self.mpris.playlists.index.clear()
+        self._emit_properties_changed(self.mpris.playlists, ["PlaylistCount"])
 
     @override
     def playlist_changed(self, playlist: Playlist) -> None:
         assert self.mpris
         if playlist.uri is None:
             return
+        from mopidy_mpris.playlists import get_playlist_id  # noqa: PLC0415
+
+        self.mpris.playlists.index.update(playlist.uri, playlist.name or "")
         playlist_id = get_playlist_id(playlist.uri)
         self.mpris.playlists.PlaylistChanged(playlist_id, playlist.name, "")  # pyright: ignore[reportCallIssue]
 
     @override
     def playlist_deleted(self, uri: Uri) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.playlists, ["PlaylistCount"])
+        self.mpris.playlists.index.remove(uri)
+        self._emit_properties_changed(self.mpris.playlists, ["PlaylistCount"])
 
     @override
     def options_changed(self) -> None:
         assert self.mpris
-        _emit_properties_changed(
+        self.mpris.player.state.refresh_options(self.core)
+        self._emit_properties_changed(
             self.mpris.player,
             ["LoopStatus", "Shuffle", "CanGoPrevious", "CanGoNext"],
         )
@@ -120,31 +224,189 @@ class MprisFrontend(pykka.ThreadingActor, CoreListener):
     @override
     def volume_changed(self, volume: Percentage) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.player, ["Volume"])
+        self._emit_properties_changed(self.mpris.player, ["Volume"])
 
     @override
     def mute_changed(self, mute: bool) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.player, ["Volume"])
+        self._emit_properties_changed(self.mpris.player, ["Volume"])
 
     @override
     def seeked(self, time_position: DurationMs) -> None:
         assert self.mpris
+        self.mpris.player.state.position.set(
+            time_position,
+            running=self.mpris.player.state.playback_state == PlaybackState.PLAYING,
+        )
         time_position_in_microseconds = time_position * 1000
-        self.mpris.player.Seeked(time_position_in_microseconds)  # pyright: ignore[reportCallIssue]
+        self._emit_seeked(time_position_in_microseconds)
 
     @override
     def stream_title_changed(self, title: str) -> None:
         assert self.mpris
-        _emit_properties_changed(self.mpris.player, ["Metadata"])
-
-
-def _emit_properties_changed(
-    interface: Interface, changed_properties: list[str]
-) -> None:
-    props_with_new_values = [(p, getattr(interface, p)) for p in changed_properties]
-    interface.PropertiesChanged(  # pyright: ignore[reportCallIssue]
-        interface.INTERFACE,
-        dict(props_with_new_values),
-        [],
-    )
+        self.mpris.player.invalidate_metadata()
+        with self._pending_lock:
+            self._track_metadata_changed = True
+        self._emit_properties_changed(self.mpris.player, ["Metadata"])
+
+    def _run_drift_check(self) -> None:
+        while not self._drift_check_stopped.wait(self._drift_check_interval):
+            try:
+                self._check_position_drift()
+            except pykka.ActorDeadError:
+                return
+            except Exception:
+                logger.exception("MPRIS position drift check failed")
+
+    def _check_position_drift(self) -> None:
+        # Clients are expected to extrapolate the position themselves, and to
+        # only ask again when we emit Seeked. Buffering or a stalled stream
+        # makes playback fall behind without a seek, so compare with where
+        # core really is now and then, and tell clients if it is too far off.
+        mpris = self.mpris
+        if mpris is None:
+            return
+        state = mpris.player.state
+        if state.playback_state != PlaybackState.PLAYING:
+            return
+        anchor = state.position.anchor
+        expected = state.position.extrapolate()
+        if anchor is None or expected is None:
+            return
+        position = self.core.playback.get_time_position().get()
+        # This runs on its own thread. If the actor handled a pause or seek
+        # while we waited for core, keep the position from that event.
+        if state.playback_state != PlaybackState.PLAYING:
+            return
+        if not state.position.replace(anchor, position, running=True):
+            return
+        if abs(position - expected) <= self._drift_threshold:
+            return
+        logger.debug(
+            "Playback position drifted by %d ms, emitting Seeked",
+            position - expected,
+        )
+        self.stats.record_signal("seeked_for_drift")
+        self._emit_seeked(position * 1000)
+
+    def _emit_seeked(self, position: int) -> None:
+        if self._seeked_interval <= 0:
+            self._send_seeked(position)
+            return
+
+        # A client scrubbing through a track seeks many times a second, and
+        # every Seeked signal goes to every client on the bus. Emit at most
+        # one per interval. The intermediate positions are dropped, but the
+        # last one is always emitted when the interval ends.
+        with self._seeked_lock:
+            wait = self._seeked_emitted_at + self._seeked_interval - time.monotonic()
+            if wait <= 0 and self._seeked_timer is None:
+                self._seeked_emitted_at = time.monotonic()
+            else:
+                if self._seeked_pending is not None:
+                    self.stats.record_signal("seeked_dropped")
+                self._seeked_pending = position
+                if self._seeked_timer is None:
+                    self._seeked_timer = threading.Timer(
+                        max(wait, 0), self._flush_seeked
+                    )
+                    self._seeked_timer.daemon = True
+                    self._seeked_timer.start()
+                return
+        self._send_seeked(position)
+
+    def _flush_seeked(self) -> None:
+        with self._seeked_lock:
+            if self._seeked_timer is not None:
+                self._seeked_timer.cancel()
+                self._seeked_timer = None
+            position = self._seeked_pending
+            self._seeked_pending = None
+            if position is None:
+                return
+            self._seeked_emitted_at = time.monotonic()
+        self._send_seeked(position)
+
+    def _send_seeked(self, position: int) -> None:
+        if self.mpris is None:
+            return
+        self.mpris.player.Seeked(position)  # pyright: ignore[reportCallIssue]
+
+    def _emit_properties_changed(
+        self, interface: Interface, changed_properties: list[str]
+    ) -> None:
+        if self._coalesce_window <= 0:
+            self._send_properties_changed(interface, changed_properties)
+            return
+
+        # A single change in core often causes a burst of events, e.g.
+        # track_playback_ended, playback_state_changed, and
+        # track_playback_started on track change. Collect the changed
+        # properties for a short while, so that we only compute and emit them
+        # once per burst.
+        with self._pending_lock:
+            pending = self._pending_properties.setdefault(interface, [])
+            pending.extend(p for p in changed_properties if p not in pending)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    self._coalesce_window, self._flush_properties_changed
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _flush_properties_changed(self) -> None:
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending = self._pending_properties
+            self._pending_properties = {}
+        for interface, changed_properties in pending.items():
+            self._send_properties_changed(interface, changed_properties)
+
+    def _send_properties_changed(
+        self, interface: Interface, changed_properties: list[str]
+    ) -> None:
+        # Only include the properties that differ from what we last told the
+        # clients, and skip the signal completely if nothing changed. The
+        # values are read and compared under the lock, so that a signal with
+        # older values can't overtake one with newer values.
+        with self._emit_lock:
+            emitted_values = self._emitted_values.setdefault(interface.INTERFACE, {})
+            props_with_new_values = {}
+            for prop in changed_properties:
+                value = getattr(interface, prop)
+                if prop in emitted_values and emitted_values[prop] == value:
+                    self.stats.record_signal("properties_suppressed")
+                    continue
+                props_with_new_values[prop] = value
+            track_metadata_changed = (
+                "Metadata" in changed_properties and self._take_track_metadata_changed()
+            )
+            if not props_with_new_values:
+                self.stats.record_signal("signals_suppressed")
+                return
+            emitted_values.update(props_with_new_values)
+            interface.PropertiesChanged(  # pyright: ignore[reportCallIssue]
+                interface.INTERFACE,
+                props_with_new_values,
+                [],
+            )
+            # The current track's entry in the tracklist changes along with
+            # the player's Metadata when the stream title changes. Reuse the
+            # value we just emitted, instead of getting the metadata again.
+            if (
+                track_metadata_changed
+                and "Metadata" in props_with_new_values
+                and self.mpris is not None
+            ):
+                self.mpris.tracklist.emit_track_metadata_changed(
+                    props_with_new_values["Metadata"]
+                )
+        self.stats.record_signal("signals_emitted")
+
+    def _take_track_metadata_changed(self) -> bool:
+        with self._pending_lock:
+            changed = self._track_metadata_changed
+            self._track_metadata_changed = False
+        return changed
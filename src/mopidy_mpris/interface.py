@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import functools
 import logging
+import time
+import xml.etree.ElementTree as ET
 from typing import TYPE_CHECKING, Any, ClassVar
 
+import pykka
 from pydbus.generic import signal
 
+from mopidy_mpris.stats import Stats
+
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
     from mopidy.config import Config
     from mopidy.core import CoreProxy
 
@@ -18,11 +26,140 @@ TRACE_LOG_LEVEL = 5
 class Interface:
     INTERFACE: ClassVar[str]
 
-    def __init__(self, config: Config, core: CoreProxy) -> None:
+    def __init__(
+        self,
+        config: Config,
+        core: CoreProxy,
+        *,
+        stats: Stats | None = None,
+    ) -> None:
         self.config = config
         self.core = core
+        self.stats = stats or Stats()
+        # How long property getters wait for core, or None to wait forever.
+        self.core_timeout: float | None = (
+            config["mpris"]["core_timeout_ms"] / 1000 or None  # pyright: ignore[reportGeneralTypeIssues]
+        )
+        # Last value returned by each getter decorated with @fallback.
+        self.last_values: dict[str, Any] = {}
 
     PropertiesChanged = signal()
 
+    def get_all_properties(self) -> dict[str, Any]:
+        """Get the values of all readable properties, e.g. to answer GetAll.
+
+        Interfaces whose getters share core calls should override this to
+        get all the values from a single snapshot of the core state.
+        """
+        _, properties = get_dbus_members(type(self))
+        return {name: getattr(self, name) for name in properties}
+
+    def get_last_known_properties(self) -> dict[str, Any]:
+        """Get the values of all readable properties without asking core.
+
+        Getters decorated with :func:`fallback` give their last value, or
+        their fallback value. The others don't ask core and are called.
+        """
+        _, properties = get_dbus_members(type(self))
+        result = {}
+        for name in properties:
+            getter = getattr(getattr(type(self), name, None), "fget", None)
+            if hasattr(getter, "fallback"):
+                result[name] = self.last_values.get(name, getter.fallback)  # pyright: ignore[reportOptionalMemberAccess]
+            else:
+                result[name] = getattr(self, name)
+        return result
+
+    def get_all(
+        self,
+        *futures: pykka.Future[Any],
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Wait for the results of several core calls.
+
+        All the calls must be made before this method is called, so that the
+        core actor can work through them while we wait for the first result.
+        Independent calls thus cost one round trip instead of one each.
+        """
+        return get_all(futures, timeout=timeout)
+
+    def on_core_timeout(self, name: str) -> None:
+        logger.debug(
+            "Core did not answer within %s seconds for %s.%s",
+            self.core_timeout,
+            self.INTERFACE,
+            name,
+        )
+        self.stats.record_timeout(f"{type(self).__name__}.{name}")
+
     def log_trace(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         logger.log(TRACE_LOG_LEVEL, *args, **kwargs)
+
+
+def deferred[F: Callable[..., Any]](method: F) -> F:
+    """Mark a D-Bus method as one that waits for core.
+
+    Such methods are run outside of the GLib main loop, and their reply is
+    sent when they are done, so that other clients are served meanwhile.
+    """
+    method.deferred = True  # pyright: ignore[reportFunctionMemberAccess]
+    return method
+
+
+def fallback[T](value: T) -> Callable[[Callable[[Any], T]], Callable[[Any], T]]:
+    """Make a property getter give up if core is too slow to answer.
+
+    If a core call made with :attr:`Interface.core_timeout` times out, the
+    getter returns the value it returned last, or ``value`` if it hasn't
+    returned anything yet. This way, a stuck backend can't hang the clients.
+    """
+
+    def decorator(getter: Callable[[Any], T]) -> Callable[[Any], T]:
+        name = getter.__name__
+
+        @functools.wraps(getter)
+        def wrapper(self: Interface) -> T:
+            try:
+                result = getter(self)
+            except pykka.Timeout:
+                self.on_core_timeout(name)
+                return self.last_values.get(name, value)
+            self.last_values[name] = result
+            return result
+
+        wrapper.fallback = value  # pyright: ignore[reportFunctionMemberAccess]
+        return wrapper
+
+    return decorator
+
+
+def get_all(
+    futures: Iterable[pykka.Future[Any]],
+    *,
+    timeout: float | None = None,
+) -> list[Any]:
+    """Wait for the results of several futures, for ``timeout`` seconds in all.
+
+    Unlike :func:`pykka.get_all`, which waits up to ``timeout`` for each of
+    the futures, this raises :exc:`pykka.Timeout` once ``timeout`` seconds
+    have passed since the call.
+    """
+    if timeout is None:
+        return [future.get() for future in futures]
+    deadline = time.monotonic() + timeout
+    return [
+        future.get(timeout=max(deadline - time.monotonic(), 0)) for future in futures
+    ]
+
+
+@functools.cache
+def get_dbus_members(cls: type[Interface]) -> tuple[frozenset[str], frozenset[str]]:
+    """Get the names of the D-Bus methods and properties of an interface."""
+    node = ET.fromstring((cls.__doc__ or "").strip())  # noqa: S314
+    methods = frozenset(e.attrib["name"] for e in node.iter("method"))
+    properties = frozenset(
+        e.attrib["name"]
+        for e in node.iter("property")
+        if "read" in e.attrib.get("access", "read")
+    )
+    return methods, properties
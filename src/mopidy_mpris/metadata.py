@@ -0,0 +1,244 @@
+"""Conversion of tracks in the tracklist to MPRIS metadata.
+
+https://www.freedesktop.org/wiki/Specifications/mpris-spec/metadata/
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+import pykka
+from gi.repository.GLib import (  # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+    Variant,
+)
+from mopidy.types import TracklistId
+
+from mopidy_mpris.breaker import CircuitBreaker
+from mopidy_mpris.cache import LRUCache
+from mopidy_mpris.stats import Stats
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+    from mopidy.models import Image, TlTrack
+    from mopidy.types import Uri
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataResolver:
+    """Builds MPRIS metadata for batches of tracks.
+
+    The album art of all tracks in a batch is looked up with a single core
+    call per URI scheme, and the result is remembered in :attr:`art_cache`.
+
+    Each URI scheme has a circuit breaker in :attr:`art_breakers`. If a
+    backend's image lookups keep failing or being slow, its tracks go without
+    album art for a while, so that it doesn't slow down every track change.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        core: CoreProxy,
+        *,
+        stats: Stats | None = None,
+    ) -> None:
+        self.core = core
+        self.stats = stats or Stats()
+        self.art_cache: LRUCache[Uri, Uri | None] = LRUCache(
+            maxsize=config["mpris"]["art_cache_size"],  # pyright: ignore[reportGeneralTypeIssues]
+            ttl=config["mpris"]["art_cache_ttl"],  # pyright: ignore[reportGeneralTypeIssues]
+        )
+        self.art_breakers: dict[str, CircuitBreaker] = {}
+        self._breaker_failures: int = config["mpris"]["art_breaker_failures"]  # pyright: ignore[reportGeneralTypeIssues]
+        self._breaker_cooldown: int = config["mpris"]["art_breaker_cooldown"]  # pyright: ignore[reportGeneralTypeIssues]
+        self._slow_lookup = (
+            config["mpris"]["art_breaker_slow_ms"] / 1000  # pyright: ignore[reportGeneralTypeIssues]
+        )
+
+    def resolve(
+        self,
+        tl_tracks: Sequence[TlTrack],
+        *,
+        stream_titles: Mapping[TracklistId, str | None] | None = None,
+        timeout: float | None = None,
+    ) -> list[dict[str, Variant]]:
+        """Get the metadata of each of the given tracks, in the same order."""
+        stream_titles = stream_titles or {}
+        art_urls = self.get_art_urls(
+            (tl_track.track.uri for tl_track in tl_tracks if tl_track.track.uri),
+            timeout=timeout,
+        )
+        return [
+            get_metadata(
+                tl_track,
+                stream_title=stream_titles.get(tl_track.tlid),
+                art_url=art_urls.get(tl_track.track.uri)
+                if tl_track.track.uri
+                else None,
+            )
+            for tl_track in tl_tracks
+        ]
+
+    def get_art_urls(
+        self,
+        uris: Iterable[Uri],
+        *,
+        timeout: float | None = None,
+    ) -> dict[Uri, Uri | None]:
+        """Get the album art URL of each of the given track URIs.
+
+        URIs whose art lookup failed or timed out, or was skipped because the
+        scheme's breaker is open, are left out. They aren't cached, so that
+        their art is looked up again the next time.
+        """
+        art_urls: dict[Uri, Uri | None] = {}
+        uncached_uris = []
+        for uri in dict.fromkeys(uris):
+            try:
+                art_urls[uri] = self.art_cache[uri]
+            except KeyError:
+                uncached_uris.append(uri)
+        if not uncached_uris:
+            return art_urls
+
+        uris_by_scheme: dict[str, list[Uri]] = {}
+        for uri in uncached_uris:
+            uris_by_scheme.setdefault(uri.split(":", 1)[0], []).append(uri)
+        futures = {
+            scheme: self.core.library.get_images(scheme_uris)
+            for scheme, scheme_uris in uris_by_scheme.items()
+            if self._get_breaker(scheme).allow()
+        }
+
+        for scheme, images in self._get_images(futures, timeout=timeout).items():
+            if images is None:
+                continue
+            for uri in uris_by_scheme[scheme]:
+                art_url = get_art_url(images.get(uri, []))
+                self.art_cache[uri] = art_url
+                art_urls[uri] = art_url
+        return art_urls
+
+    def _get_images(
+        self,
+        futures: dict[str, pykka.Future[dict[Uri, tuple[Image, ...]]]],
+        *,
+        timeout: float | None,
+    ) -> dict[str, dict[Uri, tuple[Image, ...]] | None]:
+        # Every lookup is waited for, within ``timeout`` seconds in all, so
+        # that each scheme's breaker learns how its lookup went. The images
+        # of a failed lookup are None.
+        results = {}
+        # A lookup that times out before it had this much time of its own
+        # wasn't reached in time, as core was still busy with the ones
+        # before it. That isn't held against its scheme.
+        fair_share = (
+            self._slow_lookup if timeout is None else min(self._slow_lookup, timeout)
+        )
+        # Core handles the lookups one after the other, so each one took from
+        # when the one before it was done.
+        started_at = time.monotonic()
+        deadline = None if timeout is None else started_at + timeout
+        for scheme, future in futures.items():
+            breaker = self.art_breakers[scheme]
+            remaining = (
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+            try:
+                images = future.get(timeout=remaining)
+            except pykka.Timeout:
+                images = None
+                if time.monotonic() - started_at < fair_share:
+                    breaker.release()
+                else:
+                    self.stats.record_timeout("MetadataResolver.get_images")
+                    self._record_failure(scheme)
+            except Exception:
+                logger.debug(
+                    "Album art lookup for %s URIs failed", scheme, exc_info=True
+                )
+                images = None
+                self._record_failure(scheme)
+            else:
+                if time.monotonic() - started_at > self._slow_lookup:
+                    self._record_failure(scheme)
+                else:
+                    breaker.record_success()
+            results[scheme] = images
+            started_at = time.monotonic()
+        return results
+
+    def _get_breaker(self, scheme: str) -> CircuitBreaker:
+        breaker = self.art_breakers.get(scheme)
+        if breaker is None:
+            breaker = self.art_breakers[scheme] = CircuitBreaker(
+                max_failures=self._breaker_failures,
+                cooldown=self._breaker_cooldown,
+            )
+        return breaker
+
+    def _record_failure(self, scheme: str) -> None:
+        if self.art_breakers[scheme].record_failure():
+            logger.warning(
+                "Album art lookups for %s URIs keep failing or being slow; "
+                "skipping them for %d seconds",
+                scheme,
+                self._breaker_cooldown,
+            )
+
+
+def get_metadata(
+    tl_track: TlTrack,
+    *,
+    stream_title: str | None = None,
+    art_url: Uri | None = None,
+) -> dict[str, Variant]:
+    track_id = get_track_id(tl_track.tlid)
+    res = {"mpris:trackid": Variant("o", track_id)}
+    track = tl_track.track
+    if track.length:
+        res["mpris:length"] = Variant("x", track.length * 1000)
+    if track.uri:
+        res["xesam:url"] = Variant("s", track.uri)
+    if stream_title or track.name:
+        res["xesam:title"] = Variant("s", stream_title or track.name)
+    if track.artists:
+        artists = list(track.artists)
+        artists.sort(key=lambda a: a.name or "")
+        res["xesam:artist"] = Variant("as", [a.name for a in artists if a.name])
+    if track.album and track.album.name:
+        res["xesam:album"] = Variant("s", track.album.name)
+    if track.album and track.album.artists:
+        artists = list(track.album.artists)
+        artists.sort(key=lambda a: a.name or "")
+        res["xesam:albumArtist"] = Variant("as", [a.name for a in artists if a.name])
+    if art_url:
+        res["mpris:artUrl"] = Variant("s", art_url)
+    if track.disc_no:
+        res["xesam:discNumber"] = Variant("i", track.disc_no)
+    if track.track_no:
+        res["xesam:trackNumber"] = Variant("i", track.track_no)
+    return res
+
+
+def get_art_url(images: Iterable[Image]) -> Uri | None:
+    # Use the largest image, or the first one if no sizes are known.
+    largest_image = max(images, key=lambda i: i.width or 0, default=None)
+    return largest_image.uri if largest_image else None
+
+
+def get_track_id(tlid: TracklistId) -> str:
+    return f"/com/mopidy/track/{tlid}"
+
+
+def get_track_tlid(track_id: str) -> TracklistId:
+    if not track_id.startswith("/com/mopidy/track/"):
+        msg = f"Cannot extract track ID from {track_id!r}"
+        raise ValueError(msg)
+    return TracklistId(int(track_id.split("/")[-1]))
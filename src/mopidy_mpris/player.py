@@ -5,17 +5,32 @@ https://specifications.freedesktop.org/mpris/latest/Player_Interface.html
 
 # ruff: noqa: N802
 
+from __future__ import annotations
+
 import logging
-from typing import Literal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Literal, override
 
-from gi.repository.GLib import (  # pyright: ignore[reportMissingImports, reportMissingModuleSource]
-    Variant,
-)
-from mopidy.models import Track
+import pykka
 from mopidy.types import DurationMs, Percentage, PlaybackState, TracklistId, Uri
 from pydbus.generic import signal
 
-from mopidy_mpris.interface import Interface
+from mopidy_mpris.interface import Interface, deferred, fallback
+from mopidy_mpris.metadata import MetadataResolver, get_metadata
+from mopidy_mpris.seek import SeekScheduler
+from mopidy_mpris.state import PlayerState
+from mopidy_mpris.volume import VolumeWriter
+
+if TYPE_CHECKING:
+    from gi.repository.GLib import (  # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+        Variant,
+    )
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+    from mopidy.models import TlTrack
+
+    from mopidy_mpris.stats import Stats
 
 logger = logging.getLogger(__name__)
 
@@ -67,89 +82,152 @@ class Player(Interface):
     # To override from tests.
     _CanControl = True
 
+    def __init__(
+        self,
+        config: Config,
+        core: CoreProxy,
+        resolver: MetadataResolver | None = None,
+        *,
+        stats: Stats | None = None,
+    ) -> None:
+        super().__init__(config, core, stats=stats)
+        self.state = PlayerState(
+            position_refresh_interval=(
+                config["mpris"]["position_refresh_ms"] / 1000  # pyright: ignore[reportGeneralTypeIssues]
+            )
+        )
+        self.resolver = resolver or MetadataResolver(config, core, stats=self.stats)
+        self.seek_scheduler = SeekScheduler(core)
+        self._fire_and_forget: bool = config["mpris"]["transport_fire_and_forget"]  # pyright: ignore[reportGeneralTypeIssues]
+        # Waits for the transport commands we don't wait for ourselves.
+        self._command_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="MprisTransport",
+        )
+        self.volume_writer = VolumeWriter(
+            core,
+            min_interval=(
+                config["mpris"]["volume_min_interval_ms"] / 1000  # pyright: ignore[reportGeneralTypeIssues]
+            ),
+        )
+        # The metadata only changes with the current track or stream title.
+        # The generation is bumped on invalidation, so that a lookup that
+        # started before can't memoize outdated metadata.
+        self._metadata: (
+            tuple[tuple[TracklistId, str | None], dict[str, Variant]] | None
+        ) = None
+        self._metadata_generation = 0
+        self._metadata_lock = threading.Lock()
+
+    @deferred
     def Next(self) -> None:
         logger.debug("%s.Next called", self.INTERFACE)
-        if not self.CanGoNext:
+        # The command runs outside of the GLib main loop, so it waits for
+        # core for as long as it takes, instead of being dropped when core is
+        # slower than core_timeout_ms.
+        if not self._can_go_next():
             logger.debug("%s.Next not allowed", self.INTERFACE)
             return
-        self.core.playback.next().get()
+        self._run_command("Next", self.core.playback.next())
 
+    @deferred
     def Previous(self) -> None:
         logger.debug("%s.Previous called", self.INTERFACE)
-        if not self.CanGoPrevious:
+        if not self._can_go_previous():
             logger.debug("%s.Previous not allowed", self.INTERFACE)
             return
-        self.core.playback.previous().get()
+        self._run_command("Previous", self.core.playback.previous())
 
+    @deferred
     def Pause(self) -> None:
         logger.debug("%s.Pause called", self.INTERFACE)
         if not self.CanPause:
             logger.debug("%s.Pause not allowed", self.INTERFACE)
             return
-        self.core.playback.pause().get()
+        self._run_command("Pause", self.core.playback.pause())
 
+    @deferred
     def PlayPause(self) -> None:
         logger.debug("%s.PlayPause called", self.INTERFACE)
         if not self.CanPause:
             logger.debug("%s.PlayPause not allowed", self.INTERFACE)
             return
+        # Ask core, and not the state mirror, which is only updated when the
+        # frontend has handled the events of the previous command. Core
+        # handles its messages in order, so this sees the outcome of any
+        # command we sent before, e.g. from a double-clicked play button.
         state = self.core.playback.get_state().get()
         if state == PlaybackState.PLAYING:
-            self.core.playback.pause().get()
+            self._run_command("PlayPause", self.core.playback.pause())
         elif state == PlaybackState.PAUSED:
-            self.core.playback.resume().get()
+            self._run_command("PlayPause", self.core.playback.resume())
         elif state == PlaybackState.STOPPED:
-            self.core.playback.play().get()
+            self._run_command("PlayPause", self.core.playback.play())
 
+    @deferred
     def Stop(self) -> None:
         logger.debug("%s.Stop called", self.INTERFACE)
         if not self.CanControl:
             logger.debug("%s.Stop not allowed", self.INTERFACE)
             return
-        self.core.playback.stop().get()
+        self._run_command("Stop", self.core.playback.stop())
 
+    @deferred
     def Play(self) -> None:
         logger.debug("%s.Play called", self.INTERFACE)
-        if not self.CanPlay:
+        if not self._can_play():
             logger.debug("%s.Play not allowed", self.INTERFACE)
             return
+        # Ask core, and not the state mirror, just like PlayPause does.
         state = self.core.playback.get_state().get()
         if state == PlaybackState.PAUSED:
-            self.core.playback.resume().get()
+            self._run_command("Play", self.core.playback.resume())
         else:
-            self.core.playback.play().get()
+            self._run_command("Play", self.core.playback.play())
+
+    def _get_playback_state(self, timeout: float | None = None) -> PlaybackState:
+        state = self.state.playback_state
+        if state is None:
+            state = self.core.playback.get_state().get(timeout=timeout)
+        return state
+
+    def _run_command(self, name: str, future: pykka.Future[Any]) -> None:
+        if not self._fire_and_forget:
+            future.get()
+            return
+        # Reply to the client as soon as core has the command. Clients learn
+        # about the outcome from the PropertiesChanged signals.
+        self._command_executor.submit(self._wait_for_command, name, future)
+
+    def shutdown(self) -> None:
+        """Stop waiting for the transport commands that were sent to core."""
+        self._command_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _wait_for_command(self, name: str, future: pykka.Future[Any]) -> None:
+        try:
+            future.get()
+        except Exception:
+            logger.exception("%s.%s failed", self.INTERFACE, name)
 
     def Seek(self, offset: int) -> None:
         logger.debug("%s.Seek called", self.INTERFACE)
         if not self.CanSeek:
             logger.debug("%s.Seek not allowed", self.INTERFACE)
             return
-        offset_ms = offset // 1000
-        current_position = self.core.playback.get_time_position().get()
-        new_position = current_position + offset_ms
-        new_position = DurationMs(max(new_position, 0))
-        self.core.playback.seek(new_position).get()
+        # Seeks are run one at a time, and merged while a seek is running.
+        self.seek_scheduler.seek_by(offset)
 
     def SetPosition(self, track_id: str, position: int) -> None:
         logger.debug("%s.SetPosition called", self.INTERFACE)
         if not self.CanSeek:
             logger.debug("%s.SetPosition not allowed", self.INTERFACE)
             return
-        position_ms = DurationMs(position // 1000)
-        current_tl_track = self.core.playback.get_current_tl_track().get()
-        if current_tl_track is None:
-            return
-        if track_id != get_track_id(current_tl_track.tlid):
-            return
-        if position_ms < 0:
-            return
-        if (
-            current_tl_track.track.length is None
-            or current_tl_track.track.length < position_ms
-        ):
+        if position < 0:
             return
-        self.core.playback.seek(position_ms).get()
+        # The track ID and the track length are checked when the seek runs.
+        self.seek_scheduler.seek_to(track_id, position)
 
+    @deferred
     def OpenUri(self, uri: str) -> None:
         logger.debug("%s.OpenUri called", self.INTERFACE)
         if not self.CanControl:
@@ -169,29 +247,24 @@ class Player(Interface):
     Seeked = signal()
 
     @property
+    @fallback("Stopped")
     def PlaybackStatus(self) -> Literal["Playing", "Paused", "Stopped"]:
         self.log_trace("Getting %s.PlaybackStatus", self.INTERFACE)
-        state = self.core.playback.get_state().get()
-        match state:
-            case PlaybackState.PLAYING:
-                return "Playing"
-            case PlaybackState.PAUSED:
-                return "Paused"
-            case PlaybackState.STOPPED:
-                return "Stopped"
+        return _get_playback_status(self._get_playback_state(timeout=self.core_timeout))
 
     @property
+    @fallback("None")
     def LoopStatus(self) -> Literal["None", "Track", "Playlist"]:
         self.log_trace("Getting %s.LoopStatus", self.INTERFACE)
-        repeat = self.core.tracklist.get_repeat().get()
-        single = self.core.tracklist.get_single().get()
-        match (repeat, single):
-            case (False, _):
-                return "None"
-            case (True, True):
-                return "Track"
-            case (True, False):
-                return "Playlist"
+        repeat = self.state.repeat
+        single = self.state.single
+        if repeat is None or single is None:
+            repeat, single = self.get_all(
+                self.core.tracklist.get_repeat(),
+                self.core.tracklist.get_single(),
+                timeout=self.core_timeout,
+            )
+        return _get_loop_status(repeat, single)
 
     @LoopStatus.setter
     def LoopStatus(self, value: Literal["None", "Track", "Playlist"]) -> None:
@@ -227,9 +300,12 @@ class Player(Interface):
             self.Pause()
 
     @property
+    @fallback(False)  # noqa: FBT003
     def Shuffle(self) -> bool:
         self.log_trace("Getting %s.Shuffle", self.INTERFACE)
-        return self.core.tracklist.get_random().get()
+        if self.state.random is not None:
+            return self.state.random
+        return self.core.tracklist.get_random().get(timeout=self.core_timeout)
 
     @Shuffle.setter
     def Shuffle(self, value: bool) -> None:
@@ -240,61 +316,73 @@ class Player(Interface):
         self.core.tracklist.set_random(bool(value))
 
     @property
-    def Metadata(self) -> dict[str, Variant]:  # noqa: C901
+    @fallback({})
+    def Metadata(self) -> dict[str, Variant]:
         self.log_trace("Getting %s.Metadata", self.INTERFACE)
-        current_tl_track = self.core.playback.get_current_tl_track().get()
-        stream_title = self.core.playback.get_stream_title().get()
+        memo = self._metadata
+        if memo is not None and self.state.playback_state in (
+            PlaybackState.PLAYING,
+            PlaybackState.PAUSED,
+        ):
+            # While playing or paused, core emits an event for every change
+            # of the current track or stream title, and the frontend
+            # invalidates the memo on those events. When stopped, core can
+            # change the current track without an event, so we ask core.
+            return memo[1]
+        generation = self._metadata_generation
+        current_tl_track, stream_title = self.get_all(
+            self.core.playback.get_current_tl_track(),
+            self.core.playback.get_stream_title(),
+            timeout=self.core_timeout,
+        )
+        return self._get_metadata(current_tl_track, stream_title, generation)
+
+    def _get_metadata(
+        self,
+        current_tl_track: TlTrack | None,
+        stream_title: str | None,
+        generation: int,
+    ) -> dict[str, Variant]:
         if current_tl_track is None:
             return {}
-        track_id = get_track_id(current_tl_track.tlid)
-        res = {"mpris:trackid": Variant("o", track_id)}
-        track = current_tl_track.track
-        if track.length:
-            res["mpris:length"] = Variant("x", track.length * 1000)
-        if track.uri:
-            res["xesam:url"] = Variant("s", track.uri)
-        if stream_title or track.name:
-            res["xesam:title"] = Variant("s", stream_title or track.name)
-        if track.artists:
-            artists = list(track.artists)
-            artists.sort(key=lambda a: a.name or "")
-            res["xesam:artist"] = Variant("as", [a.name for a in artists if a.name])
-        if track.album and track.album.name:
-            res["xesam:album"] = Variant("s", track.album.name)
-        if track.album and track.album.artists:
-            artists = list(track.album.artists)
-            artists.sort(key=lambda a: a.name or "")
-            res["xesam:albumArtist"] = Variant(
-                "as", [a.name for a in artists if a.name]
-            )
-        art_url = self._get_art_url(track)
-        if art_url:
-            res["mpris:artUrl"] = Variant("s", art_url)
-        if track.disc_no:
-            res["xesam:discNumber"] = Variant("i", track.disc_no)
-        if track.track_no:
-            res["xesam:trackNumber"] = Variant("i", track.track_no)
+        key = (current_tl_track.tlid, stream_title)
+        memo = self._metadata
+        if memo is not None and memo[0] == key:
+            return memo[1]
+        uri = current_tl_track.track.uri
+        art_urls = self.resolver.get_art_urls(
+            [uri] if uri else [], timeout=self.core_timeout
+        )
+        res = get_metadata(
+            current_tl_track,
+            stream_title=stream_title,
+            art_url=art_urls.get(uri) if uri else None,
+        )
+        if uri and uri not in art_urls:
+            # Rather go without album art than without metadata. This isn't
+            # memoized, so that we look for the art again on the next read.
+            return res
+        with self._metadata_lock:
+            if self._metadata_generation == generation:
+                self._metadata = (key, res)
         return res
 
-    def _get_art_url(self, track: Track) -> Uri | None:
-        if track.uri is None:
-            return None
-        images = self.core.library.get_images([track.uri]).get()
-        if images[track.uri]:
-            largest_image = sorted(
-                images[track.uri], key=lambda i: i.width or 0, reverse=True
-            )[0]
-            return largest_image.uri
-        return None
+    def invalidate_metadata(self) -> None:
+        """Forget the memoized metadata of the current track."""
+        with self._metadata_lock:
+            self._metadata_generation += 1
+            self._metadata = None
 
     @property
+    @fallback(0.0)
     def Volume(self) -> float:
         self.log_trace("Getting %s.Volume", self.INTERFACE)
-        mute = self.core.mixer.get_mute().get()
-        volume = self.core.mixer.get_volume().get()
-        if volume is None or mute is True:
-            return 0
-        return volume / 100.0
+        mute, volume = self.get_all(
+            self.core.mixer.get_mute(),
+            self.core.mixer.get_volume(),
+            timeout=self.core_timeout,
+        )
+        return _get_volume(mute, volume)
 
     @Volume.setter
     def Volume(self, value: float | None) -> None:
@@ -305,43 +393,77 @@ class Player(Interface):
         if value is None:
             return
         percentage = Percentage(max(0, min(100, round(value * 100))))
-        self.core.mixer.set_volume(percentage)
-        if percentage > 0:
-            self.core.mixer.set_mute(False)
+        self.volume_writer.set(percentage)
 
     @property
+    @fallback(0)
     def Position(self) -> int:
         self.log_trace("Getting %s.Position", self.INTERFACE)
-        return self.core.playback.get_time_position().get() * 1000
+        position = self.state.position.get()
+        if position is None:
+            position = self.core.playback.get_time_position().get(
+                timeout=self.core_timeout
+            )
+            self._anchor_position(position)
+        return position * 1000
+
+    def _anchor_position(self, position: DurationMs) -> None:
+        # Clients poll the position to drive their progress bars. Extrapolate
+        # from what core told us, until it is time to ask again.
+        self.state.position.set(
+            position,
+            running=self.state.playback_state == PlaybackState.PLAYING,
+        )
 
     MinimumRate: float = 1.0
     MaximumRate: float = 1.0
 
     @property
+    @fallback(False)  # noqa: FBT003
     def CanGoNext(self) -> bool:
         self.log_trace("Getting %s.CanGoNext", self.INTERFACE)
+        return self._can_go_next(timeout=self.core_timeout)
+
+    def _can_go_next(self, timeout: float | None = None) -> bool:
         if not self.CanControl:
             return False
-        current_tlid = self.core.playback.get_current_tlid().get()
-        next_tlid = self.core.tracklist.get_next_tlid().get()
+        current_tlid, next_tlid = self.get_all(
+            self.core.playback.get_current_tlid(),
+            self.core.tracklist.get_next_tlid(),
+            timeout=timeout,
+        )
         return next_tlid != current_tlid
 
     @property
+    @fallback(False)  # noqa: FBT003
     def CanGoPrevious(self) -> bool:
         self.log_trace("Getting %s.CanGoPrevious", self.INTERFACE)
+        return self._can_go_previous(timeout=self.core_timeout)
+
+    def _can_go_previous(self, timeout: float | None = None) -> bool:
         if not self.CanControl:
             return False
-        current_tlid = self.core.playback.get_current_tlid().get()
-        previous_tlid = self.core.tracklist.get_previous_tlid().get()
+        current_tlid, previous_tlid = self.get_all(
+            self.core.playback.get_current_tlid(),
+            self.core.tracklist.get_previous_tlid(),
+            timeout=timeout,
+        )
         return previous_tlid != current_tlid
 
     @property
+    @fallback(False)  # noqa: FBT003
     def CanPlay(self) -> bool:
         self.log_trace("Getting %s.CanPlay", self.INTERFACE)
+        return self._can_play(timeout=self.core_timeout)
+
+    def _can_play(self, timeout: float | None = None) -> bool:
         if not self.CanControl:
             return False
-        current_tlid = self.core.playback.get_current_tlid().get()
-        next_tlid = self.core.tracklist.get_next_tlid().get()
+        current_tlid, next_tlid = self.get_all(
+            self.core.playback.get_current_tlid(),
+            self.core.tracklist.get_next_tlid(),
+            timeout=timeout,
+        )
         return current_tlid is not None or next_tlid is not None
 
     @property
@@ -367,13 +489,106 @@ class Player(Interface):
         # NOTE This could be a setting for the end user to change.
         return self._CanControl
 
-
-def get_track_id(tlid: TracklistId) -> str:
-    return f"/com/mopidy/track/{tlid}"
-
-
-def get_track_tlid(track_id: str) -> TracklistId:
-    if not track_id.startswith("/com/mopidy/track/"):
-        msg = f"Cannot extract track ID from {track_id!r}"
-        raise ValueError(msg)
-    return TracklistId(int(track_id.split("/")[-1]))
+    @override
+    def get_all_properties(self) -> dict[str, Any]:
+        # Fetch everything that isn't mirrored with a single pipelined round
+        # trip, instead of calling every getter, which would ask core for the
+        # current track three times over.
+        self.log_trace("Getting all %s properties", self.INTERFACE)
+        playback = self.core.playback
+        tracklist = self.core.tracklist
+        futures: dict[str, pykka.Future[Any]] = {
+            "current_tl_track": playback.get_current_tl_track(),
+            "stream_title": playback.get_stream_title(),
+            "mute": self.core.mixer.get_mute(),
+            "volume": self.core.mixer.get_volume(),
+        }
+        position = self.state.position.get()
+        if position is None:
+            futures["time_position"] = playback.get_time_position()
+        if self.state.playback_state is None:
+            futures["playback_state"] = playback.get_state()
+        if self.state.repeat is None or self.state.single is None:
+            futures["repeat"] = tracklist.get_repeat()
+            futures["single"] = tracklist.get_single()
+        if self.state.random is None:
+            futures["random"] = tracklist.get_random()
+        if self.CanControl:
+            futures["next_tlid"] = tracklist.get_next_tlid()
+            futures["previous_tlid"] = tracklist.get_previous_tlid()
+        metadata_generation = self._metadata_generation
+        try:
+            results = self.get_all(*futures.values(), timeout=self.core_timeout)
+        except pykka.Timeout:
+            self.on_core_timeout("GetAll")
+            return self.get_last_known_properties()
+        values = dict(zip(futures, results, strict=True))
+
+        def value(name: str) -> Any:  # noqa: ANN401
+            if name in values:
+                return values[name]
+            return getattr(self.state, name)
+
+        if position is None:
+            position = values["time_position"]
+            self._anchor_position(position)
+
+        current_tl_track = values["current_tl_track"]
+        current_tlid = current_tl_track.tlid if current_tl_track else None
+        can_control = self.CanControl
+        result = {
+            "PlaybackStatus": _get_playback_status(value("playback_state")),
+            "LoopStatus": _get_loop_status(value("repeat"), value("single")),
+            "Rate": self.Rate,
+            "Shuffle": value("random"),
+            "Metadata": self._get_metadata(
+                current_tl_track, values["stream_title"], metadata_generation
+            ),
+            "Volume": _get_volume(values["mute"], values["volume"]),
+            "Position": position * 1000,
+            "MinimumRate": self.MinimumRate,
+            "MaximumRate": self.MaximumRate,
+            "CanGoNext": can_control and values["next_tlid"] != current_tlid,
+            "CanGoPrevious": can_control and values["previous_tlid"] != current_tlid,
+            "CanPlay": can_control
+            and (current_tlid is not None or values["next_tlid"] is not None),
+            "CanPause": self.CanPause,
+            "CanSeek": self.CanSeek,
+            "CanControl": can_control,
+        }
+        self.last_values.update(result)
+        return result
+
+
+def _get_playback_status(
+    state: PlaybackState,
+) -> Literal["Playing", "Paused", "Stopped"]:
+    match state:
+        case PlaybackState.PLAYING:
+            return "Playing"
+        case PlaybackState.PAUSED:
+            return "Paused"
+        case PlaybackState.STOPPED:
+            return "Stopped"
+
+
+def _get_loop_status(
+    repeat: bool,  # noqa: FBT001
+    single: bool,  # noqa: FBT001
+) -> Literal["None", "Track", "Playlist"]:
+    match (repeat, single):
+        case (False, _):
+            return "None"
+        case (True, True):
+            return "Track"
+        case (True, False):
+            return "Playlist"
+
+
+def _get_volume(
+    mute: bool | None,  # noqa: FBT001
+    volume: Percentage | None,
+) -> float:
+    if volume is None or mute is True:
+        return 0
+    return volume / 100.0
@@ -5,13 +5,26 @@ https://specifications.freedesktop.org/mpris/latest/Playlists_Interface.html
 
 # ruff: noqa: N802
 
+from __future__ import annotations
+
 import base64
 import logging
+import threading
+from typing import TYPE_CHECKING
 
 from mopidy.types import Uri
 from pydbus.generic import signal
 
-from mopidy_mpris.interface import Interface
+from mopidy_mpris.interface import Interface, deferred, fallback
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+    from mopidy.models import Ref
+
+    from mopidy_mpris.stats import Stats
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +55,17 @@ class Playlists(Interface):
 
     INTERFACE = "org.mpris.MediaPlayer2.Playlists"
 
+    def __init__(
+        self,
+        config: Config,
+        core: CoreProxy,
+        *,
+        stats: Stats | None = None,
+    ) -> None:
+        super().__init__(config, core, stats=stats)
+        self.index = PlaylistIndex()
+
+    @deferred
     def ActivatePlaylist(self, playlist_id: str) -> None:
         logger.debug("%s.ActivatePlaylist(%r) called", self.INTERFACE, playlist_id)
         playlist_uri = get_playlist_uri(playlist_id)
@@ -50,6 +74,7 @@ class Playlists(Interface):
             tl_tracks = self.core.tracklist.add(playlist.tracks).get()
             self.core.playback.play(tlid=tl_tracks[0].tlid).get()
 
+    @deferred
     def GetPlaylists(
         self,
         index: int,
@@ -65,21 +90,17 @@ class Playlists(Interface):
             order,
             reverse,
         )
-        playlists = self.core.playlists.as_list().get()
-        if order == "Alphabetical":
-            playlists.sort(key=lambda p: p.name or "", reverse=reverse)
-        elif order == "User" and reverse:
-            playlists.reverse()
+        playlists = self._get_index().get(order, reverse=reverse)
         slice_end = index + max_count
-        playlists = playlists[index:slice_end]
-        return [(get_playlist_id(p.uri), p.name or "", "") for p in playlists]
+        return playlists[index:slice_end]
 
     PlaylistChanged = signal()
 
     @property
+    @fallback(0)
     def PlaylistCount(self) -> int:
         self.log_trace("Getting %s.PlaylistCount", self.INTERFACE)
-        return len(self.core.playlists.as_list().get())
+        return len(self._get_index(timeout=self.core_timeout))
 
     @property
     def Orderings(self) -> list[str]:
@@ -96,6 +117,82 @@ class Playlists(Interface):
         playlist = ("/", "None", "")
         return (playlist_is_valid, playlist)
 
+    def _get_index(self, timeout: float | None = None) -> PlaylistIndex:
+        if not self.index.loaded:
+            self.index.load(self.core.playlists.as_list().get(timeout=timeout))
+        return self.index
+
+
+class PlaylistIndex:
+    """The playlists in each of the orders exposed through MPRIS.
+
+    The index is loaded from core on first use. After that, the frontend keeps
+    it up to date from core events, so that paging through and counting the
+    playlists does not require fetching all of them from core.
+
+    The index is read from D-Bus threads while the frontend updates it. It is
+    never changed in place. Updates build a new index and swap it in with a
+    single assignment, so readers don't need a lock.
+    """
+
+    def __init__(self) -> None:
+        # Playlist names by URI, in the order core lists them, and the
+        # playlists in each exposed order. Replaced as a whole, so that
+        # readers always see names and orders that belong together.
+        self._index: (
+            tuple[dict[Uri, str], dict[tuple[str, bool], list[tuple[str, str, str]]]]
+            | None
+        ) = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def __len__(self) -> int:
+        index = self._index
+        return len(index[0]) if index else 0
+
+    def load(self, refs: Iterable[Ref]) -> None:
+        with self._lock:
+            self._set({ref.uri: ref.name or "" for ref in refs})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = None
+
+    def update(self, uri: Uri, name: str) -> None:
+        with self._lock:
+            if self._index is None:
+                return
+            self._set({**self._index[0], uri: name})
+
+    def remove(self, uri: Uri) -> None:
+        with self._lock:
+            if self._index is None or uri not in self._index[0]:
+                return
+            names = dict(self._index[0])
+            del names[uri]
+            self._set(names)
+
+    def get(self, order: str, *, reverse: bool) -> list[tuple[str, str, str]]:
+        if order not in ("Alphabetical", "User"):
+            order, reverse = "User", False
+        index = self._index
+        if index is None:
+            return []
+        return index[1].get((order, reverse), [])
+
+    def _set(self, names: dict[Uri, str]) -> None:
+        playlists = [(get_playlist_id(uri), name, "") for uri, name in names.items()]
+        orders = {
+            ("User", False): playlists,
+            ("User", True): playlists[::-1],
+            ("Alphabetical", False): sorted(playlists, key=lambda p: p[1]),
+            ("Alphabetical", True): sorted(playlists, key=lambda p: p[1], reverse=True),
+        }
+        self._index = (names, orders)
+
 
 def get_playlist_id(playlist_uri: Uri) -> str:
     # Only A-Za-z0-9_ is allowed, which is 63 chars, so we can't use
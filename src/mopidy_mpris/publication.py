@@ -0,0 +1,168 @@
+"""Publishing of the MPRIS objects on D-Bus.
+
+This is :meth:`pydbus.bus.Bus.publish`, except that the bus name is left to
+:class:`~mopidy_mpris.server.Server`, and that the objects are wrapped in our
+own :class:`ObjectWrapper`. This lets the interfaces answer
+``org.freedesktop.DBus.Properties.GetAll`` in one go, and runs the methods
+marked with :func:`~mopidy_mpris.interface.deferred` outside of the GLib main
+loop.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from gi.repository import Gio, GLib  # pyright: ignore[reportMissingModuleSource]
+from pydbus.exitable import ExitableWithAliases
+from pydbus.registration import ObjectRegistration
+from pydbus.registration import ObjectWrapper as PydbusObjectWrapper
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pydbus.bus import Bus
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectWrapper(PydbusObjectWrapper):
+    def __init__(
+        self,
+        obj: Any,  # noqa: ANN401
+        interfaces: list[Gio.DBusInterfaceInfo],
+        dispatcher: Dispatcher,
+    ) -> None:
+        super().__init__(obj, interfaces)
+        self.dispatcher = dispatcher
+
+    def call_method(  # noqa: PLR0913, PLR0917
+        self,
+        connection: Gio.DBusConnection,
+        sender: str,
+        object_path: str,
+        interface_name: str,
+        method_name: str,
+        parameters: tuple[Any, ...],
+        invocation: Gio.DBusMethodInvocation,
+    ) -> None:
+        outargs = self.outargs.get(f"{interface_name}.{method_name}")
+        method = (
+            getattr(self.object, method_name, None) if outargs is not None else None
+        )
+        if outargs is None or not getattr(method, "deferred", False):
+            super().call_method(
+                connection,
+                sender,
+                object_path,
+                interface_name,
+                method_name,
+                parameters,
+                invocation,
+            )
+            return
+
+        # Leave the main loop free to serve other clients while we wait for
+        # core, and reply when the method is done.
+        def call() -> None:
+            assert method
+            try:
+                result = method(*parameters)
+            except Exception as e:
+                logger.exception(
+                    "Exception while handling %s.%s()", interface_name, method_name
+                )
+                invocation.return_dbus_error(f"unknown.{type(e).__name__}", str(e))
+                return
+            signature = f"({''.join(outargs)})"
+            if len(outargs) == 0:
+                invocation.return_value(None)
+            elif len(outargs) == 1:
+                invocation.return_value(GLib.Variant(signature, (result,)))
+            else:
+                invocation.return_value(GLib.Variant(signature, result))
+
+        self.dispatcher.submit(sender, call)
+
+    def GetAll(self, interface_name: str) -> dict[str, GLib.Variant]:  # noqa: N802
+        # pydbus calls every property getter one by one, which repeats the
+        # same core calls many times over. Objects that know better can
+        # build all the values from a single snapshot of the core state.
+        get_all_properties = getattr(self.object, "get_all_properties", None)
+        if get_all_properties is None:
+            return super().GetAll(interface_name)
+        values = get_all_properties()
+        result = {}
+        for name, type_ in self.readable_properties.items():
+            ns, local = name.rsplit(".", 1)
+            if ns == interface_name:
+                result[local] = GLib.Variant(type_, values[local])
+        return result
+
+
+class Dispatcher:
+    """Runs deferred method calls on worker threads.
+
+    Calls from the same sender run one at a time, in the order they were made,
+    so that e.g. two quick ``Next`` calls from ``playerctl`` are not
+    reordered. Calls from different senders run in parallel.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="MprisDispatcher",
+        )
+        self._lock = threading.Lock()
+        self._queues: dict[str, deque[Callable[[], None]]] = {}
+
+    def submit(self, sender: str, func: Callable[[], None]) -> None:
+        with self._lock:
+            queue = self._queues.get(sender)
+            if queue is not None:
+                # A worker is already running calls for this sender.
+                queue.append(func)
+                return
+            self._queues[sender] = deque([func])
+        self._executor.submit(self._run, sender)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, sender: str) -> None:
+        while True:
+            with self._lock:
+                queue = self._queues[sender]
+                if not queue:
+                    del self._queues[sender]
+                    return
+                func = queue.popleft()
+            func()
+
+
+class Publication(ExitableWithAliases("unpublish")):
+    __slots__ = ()
+
+    def __init__(self, bus: Bus, *objects: tuple[str, Any, str]) -> None:
+        dispatcher = Dispatcher()
+        self._at_exit(dispatcher.shutdown)
+        for path, obj, node_xml in objects:
+            self._at_exit(
+                _register_object(bus, path, obj, node_xml, dispatcher).__exit__
+            )
+
+
+def _register_object(
+    bus: Bus,
+    path: str,
+    obj: Any,  # noqa: ANN401
+    node_xml: str,
+    dispatcher: Dispatcher,
+) -> ObjectRegistration:
+    node_info = Gio.DBusNodeInfo.new_for_xml(node_xml)
+    interfaces = node_info.interfaces
+    wrapper = ObjectWrapper(obj, interfaces, dispatcher)
+    return ObjectRegistration(bus, path, interfaces, wrapper, own_wrapper=True)
@@ -5,9 +5,18 @@ https://specifications.freedesktop.org/mpris/latest/Media_Player.html
 
 # ruff: noqa: N802
 
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
+
+from mopidy_mpris.interface import Interface, fallback
 
-from mopidy_mpris.interface import Interface
+if TYPE_CHECKING:
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+
+    from mopidy_mpris.stats import Stats
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +42,18 @@ class Root(Interface):
 
     INTERFACE = "org.mpris.MediaPlayer2"
 
+    def __init__(
+        self,
+        config: Config,
+        core: CoreProxy,
+        *,
+        stats: Stats | None = None,
+    ) -> None:
+        super().__init__(config, core, stats=stats)
+        # The URI schemes come from the backends, which are fixed for as long
+        # as Mopidy runs, so we only need to ask core once.
+        self._uri_schemes: list[str] | None = None
+
     def Raise(self) -> None:
         logger.debug("%s.Raise called", self.INTERFACE)
         # Do nothing, as we do not have a GUI
@@ -54,7 +75,7 @@ class Root(Interface):
 
     CanSetFullscreen = False
     CanRaise = False
-    HasTrackList = False  # NOTE Change if adding optional track list support
+    HasTrackList = True
     Identity = "Mopidy"
 
     @property
@@ -67,9 +88,17 @@ class Root(Interface):
         return ""
 
     @property
+    @fallback([])
     def SupportedUriSchemes(self) -> list[str]:
         self.log_trace("Getting %s.SupportedUriSchemes", self.INTERFACE)
-        return [str(uri_scheme) for uri_scheme in self.core.get_uri_schemes().get()]
+        if self._uri_schemes is None:
+            self._uri_schemes = [
+                str(uri_scheme)
+                for uri_scheme in self.core.get_uri_schemes().get(
+                    timeout=self.core_timeout
+                )
+            ]
+        return self._uri_schemes
 
     @property
     def SupportedMimeTypes(self) -> list[str]:
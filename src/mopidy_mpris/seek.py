@@ -0,0 +1,112 @@
+"""Scheduling of seeks requested by clients."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING, NamedTuple
+
+from mopidy.types import DurationMs
+
+from mopidy_mpris.metadata import get_track_id
+
+if TYPE_CHECKING:
+    from mopidy.core import CoreProxy
+
+logger = logging.getLogger(__name__)
+
+
+class SeekRequest(NamedTuple):
+    # Track and position to seek to, from SetPosition. Without a track, the
+    # offset is relative to the position playback is at.
+    track_id: str | None
+    position: int | None
+    # Offset to add, in microseconds, from Seek.
+    offset: int
+
+
+class SeekScheduler:
+    """Runs the seeks requested by clients one at a time.
+
+    A client scrubbing through a track asks for many seeks a second, and each
+    of them is expensive, especially on network streams. Requests that
+    arrive while a seek is running are merged into one pending request: a
+    ``SetPosition`` replaces everything before it, and the offsets of
+    ``Seek`` requests are added up. The pending request is run when the
+    running seek is done.
+    """
+
+    def __init__(self, core: CoreProxy) -> None:
+        self.core = core
+        self._lock = threading.Lock()
+        self._pending: SeekRequest | None = None
+        self._thread: threading.Thread | None = None
+
+    def seek_by(self, offset: int) -> None:
+        """Seek ``offset`` microseconds from where playback is."""
+        with self._lock:
+            pending = self._pending
+            if pending is None:
+                self._pending = SeekRequest(None, None, offset)
+            else:
+                self._pending = pending._replace(offset=pending.offset + offset)
+            self._start()
+
+    def seek_to(self, track_id: str, position: int) -> None:
+        """Seek to ``position`` microseconds, if ``track_id`` is playing."""
+        with self._lock:
+            self._pending = SeekRequest(track_id, position, 0)
+            self._start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait until all pending seeks are done."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name="MprisSeekScheduler",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                request = self._pending
+                self._pending = None
+                if request is None:
+                    self._thread = None
+                    return
+            try:
+                self._seek(request)
+            except Exception:
+                logger.exception("Seeking failed")
+
+    def _seek(self, request: SeekRequest) -> None:
+        position = None
+        if request.track_id is not None:
+            position = self._get_set_position(request.track_id, request.position)
+            if position is None and request.offset == 0:
+                return
+        if position is None:
+            position = self.core.playback.get_time_position().get() * 1000
+        target = DurationMs(max(position + request.offset, 0) // 1000)
+        self.core.playback.seek(target).get()
+
+    def _get_set_position(self, track_id: str, position: int | None) -> int | None:
+        # The checks of SetPosition, done once for all merged requests.
+        current_tl_track = self.core.playback.get_current_tl_track().get()
+        if current_tl_track is None:
+            return None
+        if track_id != get_track_id(current_tl_track.tlid):
+            return None
+        if position is None or position < 0:
+            return None
+        length = current_tl_track.track.length
+        if length is None or length < position // 1000:
+            return None
+        return position
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, cast
 
-import pydbus
+from gi.repository import Gio, GLib  # pyright: ignore[reportMissingModuleSource]
 
+from mopidy_mpris.debug import Debug
+from mopidy_mpris.metadata import MetadataResolver
 from mopidy_mpris.player import Player
 from mopidy_mpris.playlists import Playlists
+from mopidy_mpris.publication import Publication
 from mopidy_mpris.root import Root
+from mopidy_mpris.stats import CountingCore, InstrumentedInterface, Stats
+from mopidy_mpris.tracklist import TrackList
 
 if TYPE_CHECKING:
     from mopidy.config import Config
@@ -15,34 +21,211 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+BUS_NAME = "org.mpris.MediaPlayer2.mopidy"
+
+# Delay before trying to connect to the bus again, in seconds. It doubles
+# after each failed attempt, up to the maximum.
+RECONNECT_DELAY_MIN = 1
+RECONNECT_DELAY_MAX = 60
+
 
 class Server:
-    def __init__(self, config: Config, core: CoreProxy) -> None:
+    def __init__(
+        self,
+        config: Config,
+        core: CoreProxy,
+        stats: Stats | None = None,
+    ) -> None:
         self.config = config
         self.core = core
+        self.stats = stats or Stats()
+
+        # The interfaces talk to core through a wrapper that counts the calls.
+        counted_core = cast("CoreProxy", CountingCore(core, self.stats))
+
+        # Shared, so that the player and tracklist use the same art cache.
+        resolver = MetadataResolver(config, counted_core, stats=self.stats)
 
-        self.root = Root(config, core)
-        self.player = Player(config, core)
-        self.playlists = Playlists(config, core)
+        self.root = Root(config, counted_core, stats=self.stats)
+        self.player = Player(config, counted_core, resolver, stats=self.stats)
+        self.playlists = Playlists(config, counted_core, stats=self.stats)
+        self.tracklist = TrackList(config, counted_core, resolver, stats=self.stats)
+        self.debug = Debug(
+            config,
+            counted_core,
+            self.stats,
+            caches={"art": resolver.art_cache},
+        )
 
-        self._publication_token = None
+        self._publication_token: Publication | None = None
+        self._lock = threading.RLock()
+        self._published = False
+        self._cancellable: Gio.Cancellable | None = None
+        self._connection: Gio.DBusConnection | None = None
+        self._closed_handler_id: int | None = None
+        self._name_owner_id: int | None = None
+        self._reconnect_source_id: int | None = None
+        self._reconnect_delay = RECONNECT_DELAY_MIN
+        self.ready = threading.Event()
 
     def publish(self) -> None:
-        bus_type = self.config["mpris"]["bus_type"]  # pyright: ignore[reportGeneralTypeIssues]
-        logger.debug("Connecting to D-Bus %s bus...", bus_type)
+        """Connect to D-Bus and publish the MPRIS objects.
 
-        bus = pydbus.SystemBus() if bus_type == "system" else pydbus.SessionBus()
+        This only starts connecting. The GLib main loop makes the connection
+        and acquires the bus name in the background, so that Mopidy's startup
+        doesn't wait for the bus. :attr:`ready` is set once clients can find
+        us on the bus.
 
-        logger.info("MPRIS server connected to D-Bus %s bus", bus_type)
+        If the bus isn't available, or the connection is lost later, we keep
+        trying to connect, with an increasing delay between the attempts.
+        """
+        with self._lock:
+            self._published = True
+            self._connect()
 
-        self._publication_token = bus.publish(
-            "org.mpris.MediaPlayer2.mopidy",
-            ("/org/mpris/MediaPlayer2", self.root),
-            ("/org/mpris/MediaPlayer2", self.player),
-            ("/org/mpris/MediaPlayer2", self.playlists),
+    def unpublish(self) -> None:
+        with self._lock:
+            self._published = False
+            if self._reconnect_source_id is not None:
+                GLib.source_remove(self._reconnect_source_id)
+                self._reconnect_source_id = None
+            if self._cancellable is not None:
+                self._cancellable.cancel()
+                self._cancellable = None
+            self._disconnect()
+
+    def _connect(self) -> None:
+        bus_type = self.config["mpris"]["bus_type"]  # pyright: ignore[reportGeneralTypeIssues]
+        logger.debug("Connecting to D-Bus %s bus...", bus_type)
+        self._cancellable = Gio.Cancellable()
+        Gio.bus_get(
+            Gio.BusType.SYSTEM if bus_type == "system" else Gio.BusType.SESSION,
+            self._cancellable,
+            self._on_bus_get,
         )
 
-    def unpublish(self) -> None:
+    def _disconnect(self) -> None:
+        self.ready.clear()
+        if self._name_owner_id is not None:
+            Gio.bus_unown_name(self._name_owner_id)
+            self._name_owner_id = None
         if self._publication_token:
             self._publication_token.unpublish()
             self._publication_token = None
+        if self._connection is not None:
+            if self._closed_handler_id is not None:
+                self._connection.disconnect(self._closed_handler_id)
+                self._closed_handler_id = None
+            self._connection = None
+
+    def _schedule_reconnect(self) -> None:
+        delay = self._reconnect_delay
+        self._reconnect_delay = min(delay * 2, RECONNECT_DELAY_MAX)
+        logger.info("MPRIS frontend will reconnect to D-Bus in %d seconds", delay)
+        self._reconnect_source_id = GLib.timeout_add_seconds(delay, self._on_reconnect)
+
+    def _on_reconnect(self) -> bool:
+        with self._lock:
+            self._reconnect_source_id = None
+            if self._published:
+                self._connect()
+        return GLib.SOURCE_REMOVE
+
+    def _on_bus_get(self, _source: object, result: Gio.AsyncResult) -> None:
+        bus_type = self.config["mpris"]["bus_type"]  # pyright: ignore[reportGeneralTypeIssues]
+        try:
+            connection = Gio.bus_get_finish(result)
+        except GLib.Error as e:
+            if e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                return
+            logger.warning("MPRIS frontend failed to connect to D-Bus (%s)", e)
+            with self._lock:
+                self._cancellable = None
+                if self._published:
+                    self._schedule_reconnect()
+            return
+
+        with self._lock:
+            self._cancellable = None
+            if not self._published:
+                return
+            logger.info("MPRIS server connected to D-Bus %s bus", bus_type)
+            self._reconnect_delay = RECONNECT_DELAY_MIN
+            self._publish(connection)
+
+    def _publish(self, connection: Gio.DBusConnection) -> None:
+        # The shared bus connections make the process exit when they are
+        # closed. We want to reconnect instead.
+        connection.set_exit_on_close(False)
+        self._connection = connection
+        self._closed_handler_id = connection.connect(
+            "closed", self._on_connection_closed
+        )
+
+        # The interfaces are wrapped so that the debug interface can report
+        # on every call that comes in over D-Bus. They are created only once,
+        # so the state they hold is kept when we reconnect.
+        objects = [
+            (
+                "/org/mpris/MediaPlayer2",
+                InstrumentedInterface(interface, self.stats),
+                type(interface).__doc__ or "",
+            )
+            for interface in [
+                self.root,
+                self.player,
+                self.playlists,
+                self.tracklist,
+            ]
+        ]
+        objects.append(
+            ("/org/mpris/MediaPlayer2", self.debug, type(self.debug).__doc__ or "")
+        )
+
+        self._publication_token = Publication(
+            connection.pydbus,  # pyright: ignore[reportAttributeAccessIssue]
+            *objects,
+        )
+
+        # Request the name only after registering all the objects. If
+        # another process owns the name, the bus queues us and we get the
+        # name when the other process releases it.
+        self._name_owner_id = Gio.bus_own_name_on_connection(
+            connection,
+            BUS_NAME,
+            Gio.BusNameOwnerFlags.ALLOW_REPLACEMENT,
+            self._on_name_acquired,
+            self._on_name_lost,
+        )
+
+    def _on_name_acquired(self, _connection: Gio.DBusConnection, name: str) -> None:
+        logger.debug("Acquired D-Bus name %s", name)
+        self.ready.set()
+
+    def _on_name_lost(self, connection: Gio.DBusConnection, name: str) -> None:
+        self.ready.clear()
+        if connection.is_closed():
+            # We reconnect when we are told that the connection is closed.
+            return
+        logger.warning(
+            "MPRIS frontend does not own D-Bus name %s; "
+            "waiting for the current owner to release it",
+            name,
+        )
+
+    def _on_connection_closed(
+        self,
+        connection: Gio.DBusConnection,
+        _remote_peer_vanished: bool,  # noqa: FBT001
+        error: GLib.Error | None,
+    ) -> None:
+        with self._lock:
+            if connection is not self._connection:
+                return
+            logger.warning(
+                "MPRIS frontend lost its connection to D-Bus (%s)",
+                error.message if error else "closed",
+            )
+            self._disconnect()
+            if self._published:
+                self._schedule_reconnect()
@@ -0,0 +1,154 @@
+"""Mirror of the core state that is exposed through MPRIS properties."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from mopidy.types import DurationMs
+
+from mopidy_mpris.interface import get_all
+
+if TYPE_CHECKING:
+    from mopidy.core import CoreProxy
+    from mopidy.types import PlaybackState
+
+
+class PlayerState:
+    """Last known playback state and tracklist options.
+
+    The frontend keeps this up to date from core events, so that property
+    getters can answer without a round trip to the core actor. A value of
+    :class:`None` means that the value is unknown, and that the getters must
+    ask core.
+    """
+
+    def __init__(self, position_refresh_interval: float = 0) -> None:
+        self.playback_state: PlaybackState | None = None
+        self.repeat: bool | None = None
+        self.single: bool | None = None
+        self.random: bool | None = None
+        self.position = PositionClock(position_refresh_interval)
+
+    def refresh(self, core: CoreProxy, timeout: float | None = None) -> None:
+        """Fetch all mirrored values from core.
+
+        If core doesn't answer within ``timeout`` seconds,
+        :exc:`pykka.Timeout` is raised, and the values are left unchanged.
+        """
+        futures = [
+            core.playback.get_state(),
+            core.tracklist.get_repeat(),
+            core.tracklist.get_single(),
+            core.tracklist.get_random(),
+        ]
+        (
+            self.playback_state,
+            self.repeat,
+            self.single,
+            self.random,
+        ) = get_all(futures, timeout=timeout)
+
+    def refresh_options(self, core: CoreProxy) -> None:
+        """Fetch the tracklist options from core."""
+        futures = [
+            core.tracklist.get_repeat(),
+            core.tracklist.get_single(),
+            core.tracklist.get_random(),
+        ]
+        self.repeat, self.single, self.random = get_all(futures)
+
+    def clear(self) -> None:
+        """Forget all mirrored values."""
+        self.playback_state = None
+        self.repeat = None
+        self.single = None
+        self.random = None
+        self.position.clear()
+
+
+class PositionClock:
+    """Extrapolation of the playback position from the last known position.
+
+    While playing, the position advances with the monotonic clock from the
+    moment it was last known. The anchor is set from core events and from
+    core itself, and is only trusted for ``refresh_interval`` seconds, after
+    which :meth:`get` returns :class:`None` so that the caller asks core
+    again. An interval of zero disables the extrapolation.
+
+    If the length of the current track is known, the position is not
+    extrapolated past it, e.g. while a stalled stream still looks like it is
+    playing.
+    """
+
+    def __init__(self, refresh_interval: float) -> None:
+        self.refresh_interval = refresh_interval
+        # Position, monotonic time it was known at, and if it is advancing.
+        # Replaced as a whole, so that readers in other threads always see a
+        # consistent anchor.
+        self._anchor: tuple[DurationMs, float, bool] | None = None
+        self._lock = threading.Lock()
+        # Length of the current track, if known.
+        self.length: DurationMs | None = None
+
+    @property
+    def anchor(self) -> tuple[DurationMs, float, bool] | None:
+        return self._anchor
+
+    def set(self, position: DurationMs, *, running: bool) -> None:
+        with self._lock:
+            self._anchor = (position, time.monotonic(), running)
+
+    def replace(
+        self,
+        anchor: tuple[DurationMs, float, bool],
+        position: DurationMs,
+        *,
+        running: bool,
+    ) -> bool:
+        """Set the position, unless the anchor has changed from ``anchor``.
+
+        Returns :class:`True` if the position was set. This is for callers
+        that ask core for the position on another thread than the one that
+        handles the events, so that a position from before a seek or pause
+        doesn't overwrite the one from the event.
+        """
+        with self._lock:
+            if self._anchor is not anchor:
+                return False
+            self._anchor = (position, time.monotonic(), running)
+            return True
+
+    def get(self) -> DurationMs | None:
+        anchor = self._anchor
+        if anchor is None:
+            return None
+        if time.monotonic() - anchor[1] >= self.refresh_interval:
+            return None
+        return _extrapolate(anchor, self.length)
+
+    def extrapolate(self) -> DurationMs | None:
+        """Where we expect playback to be, no matter how old the anchor is."""
+        anchor = self._anchor
+        if anchor is None:
+            return None
+        return _extrapolate(anchor, self.length)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._anchor = None
+        self.length = None
+
+
+def _extrapolate(
+    anchor: tuple[DurationMs, float, bool],
+    length: DurationMs | None,
+) -> DurationMs:
+    position, anchored_at, running = anchor
+    if not running:
+        return position
+    position = DurationMs(position + int((time.monotonic() - anchored_at) * 1000))
+    if length is not None and position > length:
+        return length
+    return position
@@ -0,0 +1,164 @@
+"""Counters for the diagnostics interface."""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from mopidy_mpris.interface import Interface
+
+# Upper bounds of the latency histogram buckets, in microseconds. The last
+# bucket counts everything slower than the last bound.
+LATENCY_BUCKETS_US = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 100000)
+
+
+class Stats:
+    """Counters that are cheap to update on every call.
+
+    Calls and their latency are recorded per D-Bus method and property, core
+    calls per core method, signals by outcome, and core timeouts per D-Bus
+    property, or per lookup for album art.
+    """
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.latencies: dict[str, list[int]] = {}
+        self.core_calls: Counter[str] = Counter()
+        self.signals: Counter[str] = Counter()
+        self.timeouts: Counter[str] = Counter()
+        self.lock = threading.Lock()
+
+    def record_call(self, name: str, seconds: float) -> None:
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_US, seconds * 1_000_000)
+        with self.lock:
+            self.calls[name] += 1
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = [0] * (len(LATENCY_BUCKETS_US) + 1)
+            histogram[bucket] += 1
+
+    def record_core_call(self, name: str) -> None:
+        with self.lock:
+            self.core_calls[name] += 1
+
+    def record_signal(self, outcome: str) -> None:
+        with self.lock:
+            self.signals[outcome] += 1
+
+    def record_timeout(self, name: str) -> None:
+        with self.lock:
+            self.timeouts[name] += 1
+
+    def reset(self) -> None:
+        # Clear in place, as the counters may be shared with their writers.
+        with self.lock:
+            self.calls.clear()
+            self.latencies.clear()
+            self.core_calls.clear()
+            self.signals.clear()
+            self.timeouts.clear()
+
+
+class InstrumentedInterface:
+    """Wrapper around an interface that records calls to its D-Bus members.
+
+    pydbus looks up methods and properties with :func:`getattr` and
+    :func:`setattr`, so publishing this wrapper instead of the interface
+    itself is enough to see every call that comes in over D-Bus. Everything
+    else, like the signals, is passed through.
+    """
+
+    def __init__(self, interface: Interface, stats: Stats) -> None:
+        from mopidy_mpris.interface import get_dbus_members  # noqa: PLC0415
+
+        methods, properties = get_dbus_members(type(interface))
+        prefix = type(interface).__name__
+        vars(self).update(
+            _interface=interface,
+            _stats=stats,
+            _prefix=prefix,
+            _methods=methods,
+            _properties=properties,
+        )
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        interface = self._interface
+        if name in self._properties:
+            start = time.perf_counter()
+            try:
+                return getattr(interface, name)
+            finally:
+                self._stats.record_call(
+                    f"{self._prefix}.{name}", time.perf_counter() - start
+                )
+        if name in self._methods:
+            return self._wrap_method(name, getattr(interface, name))
+        return getattr(interface, name)
+
+    def get_all_properties(self) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            return self._interface.get_all_properties()
+        finally:
+            self._stats.record_call(
+                f"{self._prefix}.GetAll", time.perf_counter() - start
+            )
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        start = time.perf_counter()
+        try:
+            setattr(self._interface, name, value)
+        finally:
+            self._stats.record_call(
+                f"{self._prefix}.{name}=", time.perf_counter() - start
+            )
+
+    def _wrap_method(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        key = f"{self._prefix}.{name}"
+
+        # functools.wraps keeps the signature, which pydbus inspects.
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._stats.record_call(key, time.perf_counter() - start)
+
+        return wrapper
+
+
+class CountingCore:
+    """Wrapper around the core actor proxy that counts the calls made to it.
+
+    Calls are counted by their path, e.g. ``playback.get_state``. The
+    wrappers are created on first use and then kept, so that counting only
+    adds a plain attribute lookup and a counter update to each call.
+    """
+
+    def __init__(self, proxy: Any, stats: Stats, path: str = "") -> None:  # noqa: ANN401
+        self._proxy = proxy
+        self._stats = stats
+        self._path = path
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        attr = getattr(self._proxy, name)
+        path = f"{self._path}{name}"
+        if callable(attr):
+            stats = self._stats
+
+            def result(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+                stats.record_core_call(path)
+                return attr(*args, **kwargs)
+
+        else:
+            result = CountingCore(attr, self._stats, f"{path}.")
+        setattr(self, name, result)
+        return result
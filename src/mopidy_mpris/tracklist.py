@@ -0,0 +1,299 @@
+"""Implementation of org.mpris.MediaPlayer2.TrackList interface.
+
+https://specifications.freedesktop.org/mpris/latest/Track_List_Interface.html
+"""
+
+# ruff: noqa: N802
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import pykka
+from mopidy.types import TracklistId, Uri
+from pydbus.generic import signal
+
+from mopidy_mpris.interface import Interface, deferred, fallback
+from mopidy_mpris.metadata import (
+    MetadataResolver,
+    get_track_id,
+    get_track_tlid,
+)
+
+if TYPE_CHECKING:
+    from gi.repository.GLib import (  # pyright: ignore[reportMissingImports, reportMissingModuleSource]
+        Variant,
+    )
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+    from mopidy.models import TlTrack
+
+    from mopidy_mpris.stats import Stats
+
+logger = logging.getLogger(__name__)
+
+NO_TRACK = "/org/mpris/MediaPlayer2/TrackList/NoTrack"
+
+
+class TrackList(Interface):
+    """
+    <node>
+      <interface name="org.mpris.MediaPlayer2.TrackList">
+        <method name="GetTracksMetadata">
+          <arg name="TrackIds" type="ao" direction="in"/>
+          <arg name="Metadata" type="aa{sv}" direction="out"/>
+        </method>
+        <method name="AddTrack">
+          <arg name="Uri" type="s" direction="in"/>
+          <arg name="AfterTrack" type="o" direction="in"/>
+          <arg name="SetAsCurrent" type="b" direction="in"/>
+        </method>
+        <method name="RemoveTrack">
+          <arg name="TrackId" type="o" direction="in"/>
+        </method>
+        <method name="GoTo">
+          <arg name="TrackId" type="o" direction="in"/>
+        </method>
+        <signal name="TrackListReplaced">
+          <arg name="Tracks" type="ao"/>
+          <arg name="CurrentTrack" type="o"/>
+        </signal>
+        <signal name="TrackAdded">
+          <arg name="Metadata" type="a{sv}"/>
+          <arg name="AfterTrack" type="o"/>
+        </signal>
+        <signal name="TrackRemoved">
+          <arg name="TrackId" type="o"/>
+        </signal>
+        <signal name="TrackMetadataChanged">
+          <arg name="TrackId" type="o"/>
+          <arg name="Metadata" type="a{sv}"/>
+        </signal>
+        <property name="Tracks" type="ao" access="read">
+          <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+            value="invalidates"/>
+        </property>
+        <property name="CanEditTracks" type="b" access="read"/>
+      </interface>
+      <interface name="org.mopidy.Mpris.TrackList">
+        <method name="GetMetadataByTlids">
+          <arg name="Tlids" type="au" direction="in"/>
+          <arg name="Metadata" type="aa{sv}" direction="out"/>
+        </method>
+      </interface>
+    </node>
+    """
+
+    INTERFACE = "org.mpris.MediaPlayer2.TrackList"
+    MOPIDY_INTERFACE = "org.mopidy.Mpris.TrackList"
+
+    def __init__(
+        self,
+        config: Config,
+        core: CoreProxy,
+        resolver: MetadataResolver | None = None,
+        *,
+        stats: Stats | None = None,
+    ) -> None:
+        super().__init__(config, core, stats=stats)
+        self.resolver = resolver or MetadataResolver(config, core, stats=self.stats)
+        # Number of tracks before and after the current track that we expose.
+        # Mopidy's tracklist can be huge, and MPRIS clients only need to see
+        # the tracks around the current one.
+        self._window_size: int = config["mpris"]["tracklist_window"]  # pyright: ignore[reportGeneralTypeIssues]
+        self._tl_tracks: list[TlTrack] | None = None
+        self._current_tlid: TracklistId | None = None
+
+    @deferred
+    def GetTracksMetadata(self, track_ids: list[str]) -> list[dict[str, Variant]]:
+        logger.debug("%s.GetTracksMetadata called", self.INTERFACE)
+        return self._get_metadata_by_tlids("GetTracksMetadata", _get_tlids(track_ids))
+
+    @deferred
+    def AddTrack(self, uri: str, after_track: str, set_as_current: bool) -> None:  # noqa: FBT001
+        logger.debug("%s.AddTrack called", self.INTERFACE)
+        if not self.CanEditTracks:
+            logger.debug("%s.AddTrack not allowed", self.INTERFACE)
+            return
+        if after_track == NO_TRACK:
+            position = 0
+        else:
+            index = self._get_index(after_track)
+            if index is None:
+                return
+            position = index + 1
+        tl_tracks = self.core.tracklist.add(uris=[Uri(uri)], at_position=position).get()
+        if not tl_tracks:
+            logger.debug('Track with URI "%s" not found in library.', uri)
+            return
+        if set_as_current:
+            self.core.playback.play(tlid=tl_tracks[0].tlid).get()
+
+    @deferred
+    def RemoveTrack(self, track_id: str) -> None:
+        logger.debug("%s.RemoveTrack called", self.INTERFACE)
+        if not self.CanEditTracks:
+            logger.debug("%s.RemoveTrack not allowed", self.INTERFACE)
+            return
+        tlids = _get_tlids([track_id])
+        if tlids:
+            self.core.tracklist.remove({"tlid": tlids}).get()
+
+    @deferred
+    def GoTo(self, track_id: str) -> None:
+        logger.debug("%s.GoTo called", self.INTERFACE)
+        if self._get_index(track_id) is None:
+            return
+        self.core.playback.play(tlid=get_track_tlid(track_id)).get()
+
+    @deferred
+    def GetMetadataByTlids(self, tlids: list[int]) -> list[dict[str, Variant]]:
+        # Mopidy specific: Lets clients that already know the tracklist IDs,
+        # e.g. to render the upcoming tracks, get all their metadata at once.
+        logger.debug("%s.GetMetadataByTlids called", self.MOPIDY_INTERFACE)
+        return self._get_metadata_by_tlids(
+            "GetMetadataByTlids", [TracklistId(tlid) for tlid in tlids]
+        )
+
+    TrackListReplaced = signal()
+    TrackAdded = signal()
+    TrackRemoved = signal()
+    TrackMetadataChanged = signal()
+
+    @property
+    @fallback([])
+    def Tracks(self) -> list[str]:
+        self.log_trace("Getting %s.Tracks", self.INTERFACE)
+        if self._tl_tracks is None:
+            self._load_window(timeout=self.core_timeout)
+        assert self._tl_tracks is not None
+        return [get_track_id(tl_track.tlid) for tl_track in self._tl_tracks]
+
+    CanEditTracks = True
+
+    def refresh(self) -> None:
+        """Update the exposed tracks, and signal how they changed."""
+        old_tl_tracks = self._tl_tracks
+        try:
+            self._load_window(timeout=self.core_timeout)
+        except pykka.Timeout:
+            # Keep the tracks we have. The next refresh signals the changes.
+            self.on_core_timeout("Tracks")
+            return
+        if old_tl_tracks is None:
+            # Nobody has seen the tracks yet, so there is nothing to signal.
+            return
+        assert self._tl_tracks is not None
+        self._emit_changes(old_tl_tracks, self._tl_tracks)
+
+    def emit_track_metadata_changed(self, metadata: dict[str, Variant]) -> None:
+        """Signal new metadata for a track, e.g. when the stream title changes."""
+        if "mpris:trackid" not in metadata or self._tl_tracks is None:
+            return
+        track_id = metadata["mpris:trackid"].unpack()
+        if track_id not in {get_track_id(t.tlid) for t in self._tl_tracks}:
+            return
+        self.TrackMetadataChanged(track_id, metadata)  # pyright: ignore[reportCallIssue]
+        self.stats.record_signal("track_metadata_changed")
+
+    def _load_window(self, timeout: float | None = None) -> None:
+        current_tlid, current_index = self.get_all(
+            self.core.playback.get_current_tlid(),
+            self.core.tracklist.index(),
+            timeout=timeout,
+        )
+        center = current_index or 0
+        start = max(0, center - self._window_size)
+        end = center + self._window_size + 1
+        self._tl_tracks = self.core.tracklist.slice(start, end).get(timeout=timeout)
+        self._current_tlid = current_tlid
+
+    def _emit_changes(self, old: list[TlTrack], new: list[TlTrack]) -> None:
+        old_tlids = [tl_track.tlid for tl_track in old]
+        new_tlids = [tl_track.tlid for tl_track in new]
+        if old_tlids == new_tlids:
+            return
+
+        removed = set(old_tlids) - set(new_tlids)
+        added = set(new_tlids) - set(old_tlids)
+        kept_in_old_order = [tlid for tlid in old_tlids if tlid not in removed]
+        kept_in_new_order = [tlid for tlid in new_tlids if tlid not in added]
+
+        # Tracks that moved cannot be described with added and removed
+        # signals, and if most tracks changed, a single signal is cheaper.
+        if (
+            kept_in_old_order != kept_in_new_order
+            or len(removed) + len(added) > len(new_tlids) // 2
+        ):
+            self.TrackListReplaced(  # pyright: ignore[reportCallIssue]
+                [get_track_id(tlid) for tlid in new_tlids],
+                get_track_id(self._current_tlid) if self._current_tlid else NO_TRACK,
+            )
+            self.stats.record_signal("track_list_replaced")
+            self._invalidate_tracks()
+            return
+
+        for tlid in old_tlids:
+            if tlid in removed:
+                self.TrackRemoved(get_track_id(tlid))  # pyright: ignore[reportCallIssue]
+                self.stats.record_signal("track_removed")
+
+        added_tl_tracks = [tl_track for tl_track in new if tl_track.tlid in added]
+        added_metadata = self.resolver.resolve(
+            added_tl_tracks, timeout=self.core_timeout
+        )
+        metadata = dict(
+            zip(
+                [tl_track.tlid for tl_track in added_tl_tracks],
+                added_metadata,
+                strict=True,
+            )
+        )
+        for i, tlid in enumerate(new_tlids):
+            if tlid in added:
+                after_track = get_track_id(new_tlids[i - 1]) if i > 0 else NO_TRACK
+                self.TrackAdded(metadata[tlid], after_track)  # pyright: ignore[reportCallIssue]
+                self.stats.record_signal("track_added")
+        self._invalidate_tracks()
+
+    def _invalidate_tracks(self) -> None:
+        # Tracks is annotated to emit PropertiesChanged without its value,
+        # so that clients with a property cache know to get it again.
+        self.PropertiesChanged(self.INTERFACE, {}, ["Tracks"])  # pyright: ignore[reportCallIssue]
+        self.stats.record_signal("tracks_invalidated")
+
+    def _get_metadata_by_tlids(
+        self, name: str, tlids: list[TracklistId]
+    ) -> list[dict[str, Variant]]:
+        try:
+            tl_tracks = self.core.tracklist.filter({"tlid": tlids}).get(
+                timeout=self.core_timeout
+            )
+        except pykka.Timeout:
+            # Without the tracks there is nothing to reply with, so the
+            # client gets an error instead of waiting for a stuck core.
+            self.on_core_timeout(name)
+            raise
+        tl_tracks_by_tlid = {tl_track.tlid: tl_track for tl_track in tl_tracks}
+        found = [tl_tracks_by_tlid[tlid] for tlid in tlids if tlid in tl_tracks_by_tlid]
+        return self.resolver.resolve(found, timeout=self.core_timeout)
+
+    def _get_index(self, track_id: str) -> int | None:
+        tlids = _get_tlids([track_id])
+        if not tlids:
+            return None
+        index = self.core.tracklist.index(tlid=tlids[0]).get()
+        if index is None:
+            logger.debug("Track %s is not in the tracklist", track_id)
+        return index
+
+
+def _get_tlids(track_ids: list[str]) -> list[TracklistId]:
+    tlids = []
+    for track_id in track_ids:
+        try:
+            tlids.append(get_track_tlid(track_id))
+        except ValueError:
+            logger.debug("Ignoring unknown track ID %r", track_id)
+    return tlids
@@ -0,0 +1,78 @@
+"""Coalescing of volume changes from clients."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pykka
+
+if TYPE_CHECKING:
+    from mopidy.core import CoreProxy
+    from mopidy.types import Percentage
+
+logger = logging.getLogger(__name__)
+
+
+class VolumeWriter:
+    """Applies volume changes to the mixer, skipping the outdated ones.
+
+    A client dragging a volume slider sets the volume many times a second.
+    The first change is passed to the mixer at once. Changes that arrive
+    while the mixer is busy, or within ``min_interval`` seconds of the last
+    change, only replace the pending volume, which is applied when the mixer
+    is done. The last volume set is thus always applied.
+    """
+
+    def __init__(self, core: CoreProxy, min_interval: float) -> None:
+        self.core = core
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._pending: Percentage | None = None
+        self._thread: threading.Thread | None = None
+
+    def set(self, volume: Percentage) -> None:
+        with self._lock:
+            if self._thread is not None:
+                self._pending = volume
+                return
+            futures = self._apply(volume)
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(futures,),
+                name="MprisVolumeWriter",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait until all pending changes have been applied."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _apply(self, volume: Percentage) -> list[pykka.Future[bool]]:
+        futures = [self.core.mixer.set_volume(volume)]
+        if volume > 0:
+            futures.append(self.core.mixer.set_mute(False))
+        return futures
+
+    def _run(self, futures: list[pykka.Future[bool]]) -> None:
+        while True:
+            applied_at = time.monotonic()
+            try:
+                pykka.get_all(futures)
+            except Exception:
+                logger.exception("Setting volume failed")
+            delay = applied_at + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with self._lock:
+                volume = self._pending
+                self._pending = None
+                if volume is None:
+                    self._thread = None
+                    return
+                futures = self._apply(volume)
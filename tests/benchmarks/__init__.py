@@ -0,0 +1,80 @@
+"""Benchmarks for Mopidy-MPRIS.
+
+The benchmarks are named ``bench_*.py`` so that a plain ``pytest`` run does
+not collect them. Run them by passing the files to pytest explicitly, e.g.::
+
+    pytest tests/benchmarks/bench_interfaces.py -s
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from mopidy_mpris.stats import Stats
+
+
+@dataclass
+class Measurement:
+    iterations: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    core_calls_per_op: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def measure(
+    func: Callable[[], object],
+    *,
+    iterations: int,
+    stats: Stats | None = None,
+    setup: Callable[[], object] | None = None,
+) -> Measurement:
+    """Call ``func`` repeatedly and summarize its latency.
+
+    If ``setup`` is given, it is called before each call to ``func``, and
+    isn't included in the latency.
+
+    If ``stats`` is given, the number of core actor calls counted in it, e.g.
+    by a :class:`~mopidy_mpris.stats.CountingCore`, is reported per
+    operation.
+    """
+    if stats is not None:
+        stats.core_calls.clear()
+    samples = []
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples)
+    if stats is not None:
+        result.core_calls_per_op = stats.core_calls.total() / iterations
+    return result
+
+
+def summarize(samples: list[float], elapsed: float | None = None) -> Measurement:
+    """Summarize latency samples, given in seconds.
+
+    ``elapsed`` is the wall clock time the samples were collected over. It
+    defaults to the sum of the samples, which is right when the operations
+    ran back to back.
+    """
+    if elapsed is None:
+        elapsed = sum(samples)
+    percentiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return Measurement(
+        iterations=len(samples),
+        ops_per_sec=len(samples) / elapsed,
+        p50_us=percentiles[49] * 1_000_000,
+        p99_us=percentiles[98] * 1_000_000,
+    )
@@ -0,0 +1,217 @@
+"""Throughput and tail latency of the MPRIS server under concurrent D-Bus load.
+
+A private ``dbus-daemon`` is started on a socket in a temporary directory,
+and :class:`~mopidy_mpris.server.Server` is published on it with a core actor
+using the dummy backend. Client processes then talk to it through the real
+pydbus and D-Bus path, each playing one of these roles:
+
+- ``poll``: a shell prompt or status bar polling ``Position`` at 60 Hz.
+- ``playerctl``: bursts of ``playerctl`` commands, each doing a ``GetAll`` on
+  the player interface followed by a method call.
+- ``volume``: a volume slider being dragged, setting ``Volume`` at 30 Hz.
+
+The benchmark is repeated for an increasing number of clients, so that we can
+see how many clients one Mopidy can serve before latency degrades. The number
+of clients and the duration of each run can be changed with the
+``BENCHMARK_CLIENTS`` and ``BENCHMARK_DURATION`` environment variables.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import pydbus
+import pytest
+from gi.repository import GLib  # pyright: ignore[reportMissingModuleSource]
+from mopidy.core import Core
+from mopidy.models import Track
+
+from mopidy_mpris.server import Server
+from tests import dummy_audio, dummy_backend, dummy_mixer
+from tests.benchmarks import summarize
+from tests.conftest import make_config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from pathlib import Path
+
+BUS_NAME = "org.mpris.MediaPlayer2.mopidy"
+OBJECT_PATH = "/org/mpris/MediaPlayer2"
+PLAYER_IFACE = "org.mpris.MediaPlayer2.Player"
+
+CLIENTS = [int(n) for n in os.environ.get("BENCHMARK_CLIENTS", "1,4,16").split(",")]
+DURATION = float(os.environ.get("BENCHMARK_DURATION", "5"))
+ROLES = ["poll", "playerctl", "volume"]
+DBUS_DAEMON = shutil.which("dbus-daemon")
+
+pytestmark = pytest.mark.skipif(
+    DBUS_DAEMON is None,
+    reason="dbus-daemon not found",
+)
+
+type Samples = list[tuple[str, float]]
+
+
+@pytest.fixture(scope="module")
+def bus_address(tmp_path_factory: pytest.TempPathFactory) -> Generator[str]:
+    assert DBUS_DAEMON
+    socket: Path = tmp_path_factory.mktemp("dbus") / "bus"
+    process = subprocess.Popen(  # noqa: S603
+        [
+            DBUS_DAEMON,
+            "--session",
+            "--nofork",
+            "--print-address",
+            f"--address=unix:path={socket}",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout
+    address = process.stdout.readline().strip()
+    yield address
+    process.terminate()
+    process.wait()
+
+
+@pytest.fixture(scope="module")
+def server(bus_address: str) -> Generator[Server]:
+    # Turn the timing features on with their defaults, as in a real setup.
+    config = make_config()
+    config["mpris"].update(
+        position_refresh_ms=5000,
+        position_drift_check_ms=2000,
+        seeked_min_interval_ms=100,
+        volume_min_interval_ms=50,
+        core_timeout_ms=1000,
+    )
+    audio = dummy_audio.create_proxy()
+    backend = dummy_backend.create_proxy(audio=audio)
+    mixer = dummy_mixer.create_proxy()
+    core = Core.start(
+        config=config,
+        backends=[backend],
+        mixer=mixer,
+        audio=audio,
+    ).proxy()
+    core.tracklist.add([Track(uri=f"dummy:track-{i}") for i in range(500)]).get()
+    core.playback.play().get()
+
+    # The session bus connection is a per-process singleton, created on first
+    # use from the address in the environment.
+    old_address = os.environ.get("DBUS_SESSION_BUS_ADDRESS")
+    os.environ["DBUS_SESSION_BUS_ADDRESS"] = bus_address
+    result = Server(config, core)
+    result.publish()
+
+    # In Mopidy, the GLib main loop runs in the main thread.
+    loop = GLib.MainLoop()
+    thread = threading.Thread(target=loop.run, daemon=True)
+    thread.start()
+    assert result.ready.wait(timeout=10)
+
+    yield result
+
+    result.unpublish()
+    loop.quit()
+    thread.join()
+    if old_address is None:
+        del os.environ["DBUS_SESSION_BUS_ADDRESS"]
+    else:
+        os.environ["DBUS_SESSION_BUS_ADDRESS"] = old_address
+    for actor in [core, mixer, backend, audio]:
+        actor.stop()
+
+
+def poll(player, properties, samples: Samples, until: float) -> None:
+    interval = 1 / 60
+    next_at = time.monotonic()
+    while next_at < until:
+        timed(
+            samples, "Get(Position)", lambda: properties.Get(PLAYER_IFACE, "Position")
+        )
+        next_at += interval
+        time.sleep(max(0, next_at - time.monotonic()))
+
+
+def playerctl(player, properties, samples: Samples, until: float) -> None:
+    commands = ["PlayPause", "Next", "Previous", "PlayPause"]
+    while time.monotonic() < until:
+        for command in commands:
+            timed(samples, "GetAll(Player)", lambda: properties.GetAll(PLAYER_IFACE))
+            timed(samples, command, getattr(player, command))
+        time.sleep(0.5)
+
+
+def volume(player, properties, samples: Samples, until: float) -> None:
+    interval = 1 / 30
+    while time.monotonic() < until:
+        for step in range(21):
+            value = GLib.Variant("d", step / 20)
+            timed(
+                samples,
+                "Set(Volume)",
+                lambda: properties.Set(PLAYER_IFACE, "Volume", value),  # noqa: B023
+            )
+            time.sleep(interval)
+        timed(samples, "Get(Volume)", lambda: properties.Get(PLAYER_IFACE, "Volume"))
+        time.sleep(0.2)
+
+
+def timed(samples: Samples, name: str, func: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    func()
+    samples.append((name, time.perf_counter() - start))
+
+
+def run_client(address: str, role: str, start_at: float, duration: float) -> Samples:
+    bus = pydbus.connect(address)
+    mpris = bus.get(BUS_NAME, OBJECT_PATH)
+    player = mpris[PLAYER_IFACE]
+    properties = mpris["org.freedesktop.DBus.Properties"]
+
+    # Start all clients at the same time, after they have connected.
+    time.sleep(max(0, start_at - time.time()))
+    samples: Samples = []
+    {"poll": poll, "playerctl": playerctl, "volume": volume}[role](
+        player, properties, samples, time.monotonic() + duration
+    )
+    return samples
+
+
+@pytest.mark.parametrize("clients", CLIENTS)
+def test_concurrent_clients(capsys, bus_address, server, clients):
+    start_at = time.time() + 2 + clients * 0.1
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=clients, mp_context=context) as executor:
+        futures = [
+            executor.submit(
+                run_client, bus_address, ROLES[i % len(ROLES)], start_at, DURATION
+            )
+            for i in range(clients)
+        ]
+        results = [future.result() for future in futures]
+
+    samples_by_name = defaultdict(list)
+    for samples in results:
+        for name, latency in samples:
+            samples_by_name[name].append(latency)
+
+    with capsys.disabled():
+        print(f"\n{clients} clients")  # noqa: T201
+        for name, samples in sorted(samples_by_name.items()):
+            if len(samples) < 2:
+                continue
+            result = summarize(samples, elapsed=DURATION)
+            print(  # noqa: T201
+                f"  {name:<16} {result.ops_per_sec:8.1f} ops/s"
+                f"  p50 {result.p50_us:9.1f} us  p99 {result.p99_us:9.1f} us"
+            )
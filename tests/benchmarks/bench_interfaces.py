@@ -0,0 +1,217 @@
+"""Throughput and latency of every MPRIS property and method.
+
+The interfaces are called directly, without D-Bus, against a real core actor
+with the dummy backend. For each operation we report operations per second,
+p50 and p99 latency, and the number of core actor calls per operation.
+
+The results are also written as JSON to the file named by the
+``BENCHMARK_JSON`` environment variable, ``benchmark.json`` by default, so
+that runs can be compared.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+
+import pytest
+from mopidy.models import Track
+
+from mopidy_mpris.metadata import MetadataResolver, get_track_id
+from mopidy_mpris.player import Player
+from mopidy_mpris.playlists import Playlists
+from mopidy_mpris.root import Root
+from mopidy_mpris.stats import CountingCore, Stats
+from mopidy_mpris.tracklist import TrackList
+from tests.benchmarks import Measurement, measure
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+    from mopidy.backend import BackendProxy
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+
+ITERATIONS = int(os.environ.get("BENCHMARK_ITERATIONS", "500"))
+TRACKS = 2 * ITERATIONS
+
+
+class Interfaces(NamedTuple):
+    stats: Stats
+    root: Root
+    player: Player
+    playlists: Playlists
+    tracklist: TrackList
+    tlids: list[int]
+
+
+@pytest.fixture(scope="session")
+def results() -> Generator[dict[str, Measurement]]:
+    results: dict[str, Measurement] = {}
+    yield results
+    if not results:
+        return
+    path = Path(os.environ.get("BENCHMARK_JSON", "benchmark.json"))
+    path.write_text(
+        json.dumps(
+            {name: m.as_dict() for name, m in sorted(results.items())},
+            indent=2,
+        )
+    )
+
+
+@pytest.fixture
+def interfaces(config: Config, core: CoreProxy, backend: BackendProxy) -> Interfaces:
+    tracks = [
+        Track(uri=f"dummy:track-{i}", name=f"Track {i}", length=180_000)
+        for i in range(TRACKS)
+    ]
+    backend.library.dummy_library = tracks
+    backend.library.dummy_get_images_result = {}
+    tl_tracks = core.tracklist.add(tracks).get()
+    core.playback.play(tlid=tl_tracks[0].tlid).get()
+
+    for name in ["foo", "bar", "baz"]:
+        playlist = core.playlists.create(name).get()
+        assert playlist
+        core.playlists.save(playlist.replace(tracks=[tracks[0]])).get()
+
+    stats = Stats()
+    proxy = cast("CoreProxy", CountingCore(core, stats))
+    resolver = MetadataResolver(config, proxy)
+    return Interfaces(
+        stats=stats,
+        root=Root(config, proxy),
+        player=Player(config, proxy, resolver),
+        playlists=Playlists(config, proxy),
+        tracklist=TrackList(config, proxy, resolver),
+        tlids=[tl_track.tlid for tl_track in tl_tracks],
+    )
+
+
+def getter(interface: str, name: str) -> Callable[[Interfaces], Callable[[], Any]]:
+    return lambda i: lambda: getattr(getattr(i, interface), name)
+
+
+def setter(
+    interface: str, name: str, value: object
+) -> Callable[[Interfaces], Callable[[], Any]]:
+    return lambda i: lambda: setattr(getattr(i, interface), name, value)
+
+
+def method(
+    interface: str, name: str, *args: object
+) -> Callable[[Interfaces], Callable[[], Any]]:
+    return lambda i: lambda: getattr(getattr(i, interface), name)(*args)
+
+
+def remove_track(i: Interfaces) -> Callable[[], Any]:
+    # Remove a different track on every call, but never the current one.
+    track_ids = iter([get_track_id(tlid) for tlid in reversed(i.tlids[1:])])
+    return lambda: i.tracklist.RemoveTrack(next(track_ids))
+
+
+OPERATIONS = {
+    # org.mpris.MediaPlayer2
+    "Root.Raise": method("root", "Raise"),
+    "Root.Quit": method("root", "Quit"),
+    "Root.CanQuit": getter("root", "CanQuit"),
+    "Root.Fullscreen": getter("root", "Fullscreen"),
+    "Root.Fullscreen=": setter("root", "Fullscreen", False),
+    "Root.CanSetFullscreen": getter("root", "CanSetFullscreen"),
+    "Root.CanRaise": getter("root", "CanRaise"),
+    "Root.HasTrackList": getter("root", "HasTrackList"),
+    "Root.Identity": getter("root", "Identity"),
+    "Root.DesktopEntry": getter("root", "DesktopEntry"),
+    "Root.SupportedUriSchemes": getter("root", "SupportedUriSchemes"),
+    "Root.SupportedMimeTypes": getter("root", "SupportedMimeTypes"),
+    "Root.GetAll": method("root", "get_all_properties"),
+    # org.mpris.MediaPlayer2.Player
+    "Player.Next": method("player", "Next"),
+    "Player.Previous": method("player", "Previous"),
+    "Player.Pause": method("player", "Pause"),
+    "Player.PlayPause": method("player", "PlayPause"),
+    "Player.Stop": method("player", "Stop"),
+    "Player.Play": method("player", "Play"),
+    # Seeks run in the background, so wait for them to be done.
+    "Player.Seek": lambda i: (
+        lambda: (
+            i.player.Seek(0),
+            i.player.seek_scheduler.join(),
+        )
+    ),
+    "Player.SetPosition": lambda i: (
+        lambda: (
+            i.player.SetPosition(get_track_id(i.tlids[0]), 0),
+            i.player.seek_scheduler.join(),
+        )
+    ),
+    "Player.OpenUri": method("player", "OpenUri", "dummy:track-0"),
+    "Player.PlaybackStatus": getter("player", "PlaybackStatus"),
+    "Player.LoopStatus": getter("player", "LoopStatus"),
+    "Player.LoopStatus=": setter("player", "LoopStatus", "Playlist"),
+    "Player.Rate": getter("player", "Rate"),
+    "Player.Rate=": setter("player", "Rate", 1.0),
+    "Player.Shuffle": getter("player", "Shuffle"),
+    "Player.Shuffle=": setter("player", "Shuffle", False),
+    "Player.Metadata": getter("player", "Metadata"),
+    "Player.Volume": getter("player", "Volume"),
+    "Player.Volume=": setter("player", "Volume", 0.5),
+    "Player.Position": getter("player", "Position"),
+    "Player.MinimumRate": getter("player", "MinimumRate"),
+    "Player.MaximumRate": getter("player", "MaximumRate"),
+    "Player.CanGoNext": getter("player", "CanGoNext"),
+    "Player.CanGoPrevious": getter("player", "CanGoPrevious"),
+    "Player.CanPlay": getter("player", "CanPlay"),
+    "Player.CanPause": getter("player", "CanPause"),
+    "Player.CanSeek": getter("player", "CanSeek"),
+    "Player.CanControl": getter("player", "CanControl"),
+    "Player.GetAll": method("player", "get_all_properties"),
+    # org.mpris.MediaPlayer2.Playlists
+    "Playlists.ActivatePlaylist": lambda i: (
+        lambda: i.playlists.ActivatePlaylist(
+            i.playlists.GetPlaylists(0, 1, "User", False)[0][0]
+        )
+    ),
+    "Playlists.GetPlaylists": method(
+        "playlists", "GetPlaylists", 0, 100, "Alphabetical", False
+    ),
+    "Playlists.PlaylistCount": getter("playlists", "PlaylistCount"),
+    "Playlists.Orderings": getter("playlists", "Orderings"),
+    "Playlists.ActivePlaylist": getter("playlists", "ActivePlaylist"),
+    "Playlists.GetAll": method("playlists", "get_all_properties"),
+    # org.mpris.MediaPlayer2.TrackList
+    "TrackList.GetTracksMetadata": lambda i: (
+        lambda: i.tracklist.GetTracksMetadata(
+            [get_track_id(tlid) for tlid in i.tlids[:10]]
+        )
+    ),
+    "TrackList.AddTrack": lambda i: (
+        lambda: i.tracklist.AddTrack("dummy:track-0", get_track_id(i.tlids[0]), False)
+    ),
+    "TrackList.RemoveTrack": remove_track,
+    "TrackList.GoTo": lambda i: lambda: i.tracklist.GoTo(get_track_id(i.tlids[0])),
+    "TrackList.Tracks": getter("tracklist", "Tracks"),
+    "TrackList.CanEditTracks": getter("tracklist", "CanEditTracks"),
+    # org.mopidy.Mpris.TrackList
+    "TrackList.GetMetadataByTlids": lambda i: (
+        lambda: i.tracklist.GetMetadataByTlids(i.tlids[:10])
+    ),
+}
+
+
+@pytest.mark.parametrize("name", OPERATIONS)
+def test_operation(capsys, results, interfaces, name):
+    func = OPERATIONS[name](interfaces)
+
+    result = measure(func, iterations=ITERATIONS, stats=interfaces.stats)
+
+    results[name] = result
+    with capsys.disabled():
+        print(  # noqa: T201
+            f"\n{name:<34} {result.ops_per_sec:9.0f} ops/s"
+            f"  p50 {result.p50_us:8.1f} us  p99 {result.p99_us:8.1f} us"
+            f"  {result.core_calls_per_op:5.2f} core calls/op"
+        )
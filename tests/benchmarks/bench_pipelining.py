@@ -0,0 +1,78 @@
+"""Latency of serial versus pipelined core calls in the Player getters."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from mopidy.models import Track
+
+from mopidy_mpris.player import Player
+from tests.benchmarks import measure
+
+if TYPE_CHECKING:
+    from mopidy.core import CoreProxy
+
+ITERATIONS = 1000
+
+
+def serial_metadata(core: CoreProxy) -> None:
+    tl_track = core.playback.get_current_tl_track().get()
+    core.playback.get_stream_title().get()
+    core.library.get_images([tl_track.track.uri]).get()
+
+
+def serial_can_go_next(core: CoreProxy) -> bool:
+    current_tlid = core.playback.get_current_tlid().get()
+    next_tlid = core.tracklist.get_next_tlid().get()
+    return next_tlid != current_tlid
+
+
+def serial_can_go_previous(core: CoreProxy) -> bool:
+    current_tlid = core.playback.get_current_tlid().get()
+    previous_tlid = core.tracklist.get_previous_tlid().get()
+    return previous_tlid != current_tlid
+
+
+def serial_can_play(core: CoreProxy) -> bool:
+    current_tlid = core.playback.get_current_tlid().get()
+    next_tlid = core.tracklist.get_next_tlid().get()
+    return current_tlid is not None or next_tlid is not None
+
+
+@pytest.fixture
+def player(config, core: CoreProxy) -> Player:
+    core.tracklist.add([Track(uri="dummy:a"), Track(uri="dummy:b")])
+    core.playback.play().get()
+    return Player(config, core)
+
+
+@pytest.mark.parametrize(
+    ("name", "serial"),
+    [
+        ("Metadata", serial_metadata),
+        ("CanGoNext", serial_can_go_next),
+        ("CanGoPrevious", serial_can_go_previous),
+        ("CanPlay", serial_can_play),
+    ],
+)
+def test_pipelined_getter_latency(capsys, core, player, name, serial):
+    def forget_metadata() -> None:
+        # Without this, the getter would serve Metadata from its memo and
+        # the art cache, and skip the core calls the serial version makes.
+        player.invalidate_metadata()
+        player.resolver.art_cache.clear()
+
+    before = measure(
+        lambda: serial(core), iterations=ITERATIONS, setup=forget_metadata
+    ).p50_us
+    after = measure(
+        lambda: getattr(player, name), iterations=ITERATIONS, setup=forget_metadata
+    ).p50_us
+
+    with capsys.disabled():
+        print(  # noqa: T201
+            f"\n{name:<14} serial {before:8.1f} us"
+            f"  pipelined {after:8.1f} us"
+            f"  speedup {before / after:4.2f}x"
+        )
@@ -0,0 +1,93 @@
+"""Cost of Mopidy-MPRIS on Mopidy's startup.
+
+Mopidy imports every extension and validates its environment before it
+starts, and then waits for each frontend's ``on_start`` to finish. This
+reports:
+
+- the time spent importing ``mopidy_mpris`` and the frontend, as measured by
+  ``python -X importtime`` in a fresh interpreter, together with the slowest
+  modules it pulls in, and
+- the time from starting the frontend actor until it answers a call, which is
+  when Mopidy can move on to start the next frontend.
+
+The benchmarks fail if D-Bus is imported before the frontend starts, or if
+starting the frontend takes longer than ``BENCHMARK_START_BUDGET_MS``, 100 ms
+by default.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+
+from mopidy_mpris.frontend import MprisFrontend
+from tests.benchmarks import summarize
+
+ITERATIONS = 20
+START_BUDGET_MS = float(os.environ.get("BENCHMARK_START_BUDGET_MS", "100"))
+
+# Modules that must only be imported when the frontend starts.
+DEFERRED_MODULES = ["pydbus", "mopidy_mpris.server"]
+
+IMPORT_CODE = """
+from mopidy_mpris import Extension
+Extension().validate_environment()
+import mopidy_mpris.frontend
+"""
+
+
+def import_times() -> dict[str, int]:
+    """Cumulative import time of each module, in microseconds."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", IMPORT_CODE],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative_us)
+    return times
+
+
+def test_import_time(capsys):
+    runs = [import_times() for _ in range(ITERATIONS)]
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+
+    with capsys.disabled():
+        for name in ["mopidy_mpris", "mopidy_mpris.frontend"]:
+            result = summarize([run[name] / 1_000_000 for run in runs])
+            print(  # noqa: T201
+                f"\nimport {name:<24}"
+                f"  p50 {result.p50_us:9.1f} us  p99 {result.p99_us:9.1f} us"
+            )
+        print("slowest imports:")  # noqa: T201
+        for module, cumulative_us in slowest[:10]:
+            print(f"  {module:<40} {cumulative_us:9d} us")  # noqa: T201
+
+    for module in DEFERRED_MODULES:
+        assert module not in runs[-1], f"{module} is imported before startup"
+
+
+def test_frontend_start_time(capsys, config, core):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        actor_ref = MprisFrontend.start(config, core)
+        actor_ref.proxy().mpris.get()
+        samples.append(time.perf_counter() - start)
+        actor_ref.stop()
+
+    result = summarize(samples)
+    with capsys.disabled():
+        print(  # noqa: T201
+            f"\nstart MprisFrontend{'':<12}"
+            f"  p50 {result.p50_us:9.1f} us  p99 {result.p99_us:9.1f} us"
+        )
+    assert result.p99_us <= START_BUDGET_MS * 1000
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import pytest
 from mopidy.core import Core
@@ -16,13 +16,38 @@ if TYPE_CHECKING:
     from mopidy.mixer import MixerProxy
 
 
-@pytest.fixture
-def config():
+def make_config() -> dict[str, Any]:
+    """Get a config for the tests, with the timing features turned off.
+
+    A new dict is returned on each call, so that tests can change it.
+    """
     return {
         "core": {"max_tracklist_length": 10000},
+        "mpris": {
+            "bus_type": "session",
+            "signal_coalesce_ms": 0,
+            "art_cache_size": 256,
+            "art_cache_ttl": None,
+            "tracklist_window": 50,
+            "position_refresh_ms": 0,
+            "position_drift_check_ms": 0,
+            "position_drift_threshold_ms": 1000,
+            "seeked_min_interval_ms": 0,
+            "volume_min_interval_ms": 0,
+            "transport_fire_and_forget": False,
+            "core_timeout_ms": 0,
+            "art_breaker_failures": 3,
+            "art_breaker_slow_ms": 500,
+            "art_breaker_cooldown": 60,
+        },
     }
 
 
+@pytest.fixture
+def config():
+    return make_config()
+
+
 @pytest.fixture
 def audio() -> Generator[AudioProxy]:
     actor = cast("AudioProxy", dummy_audio.create_proxy())
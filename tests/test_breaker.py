@@ -0,0 +1,93 @@
+import pytest
+
+from mopidy_mpris import breaker
+from mopidy_mpris.breaker import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_allows_calls_until_failures_add_up(clock):
+    circuit = CircuitBreaker(max_failures=2, cooldown=60)
+
+    assert circuit.record_failure() is False
+    assert circuit.allow()
+    assert circuit.record_failure() is True
+
+    assert circuit.is_open
+    assert not circuit.allow()
+
+
+def test_success_resets_failures(clock):
+    circuit = CircuitBreaker(max_failures=2, cooldown=60)
+
+    circuit.record_failure()
+    circuit.record_success()
+    circuit.record_failure()
+
+    assert not circuit.is_open
+    assert circuit.allow()
+
+
+def test_allows_one_probe_after_cooldown(clock):
+    circuit = CircuitBreaker(max_failures=1, cooldown=60)
+    circuit.record_failure()
+
+    clock[0] += 30
+    assert not circuit.allow()
+
+    clock[0] += 30
+    assert circuit.allow()
+    assert not circuit.allow()
+
+
+def test_successful_probe_closes_breaker(clock):
+    circuit = CircuitBreaker(max_failures=1, cooldown=60)
+    circuit.record_failure()
+    clock[0] += 60
+    circuit.allow()
+
+    circuit.record_success()
+
+    assert not circuit.is_open
+    assert circuit.allow()
+
+
+def test_failed_probe_restarts_cooldown(clock):
+    circuit = CircuitBreaker(max_failures=1, cooldown=60)
+    circuit.record_failure()
+    clock[0] += 60
+    circuit.allow()
+
+    assert circuit.record_failure() is False
+
+    clock[0] += 30
+    assert not circuit.allow()
+    clock[0] += 30
+    assert circuit.allow()
+
+
+def test_zero_max_failures_disables_breaker(clock):
+    circuit = CircuitBreaker(max_failures=0, cooldown=60)
+
+    for _ in range(10):
+        assert circuit.record_failure() is False
+
+    assert circuit.allow()
+
+
+def test_released_probe_lets_the_next_one_through(clock):
+    circuit = CircuitBreaker(max_failures=1, cooldown=60)
+    circuit.record_failure()
+    clock[0] += 60
+    assert circuit.allow()
+    assert not circuit.allow()
+
+    circuit.release()
+
+    assert circuit.is_open
+    assert circuit.allow()
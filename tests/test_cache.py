@@ -0,0 +1,87 @@
+import pytest
+
+from mopidy_mpris import cache
+from mopidy_mpris.cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_missing_key_raises_key_error():
+    lru = LRUCache(maxsize=2)
+
+    with pytest.raises(KeyError):
+        lru["a"]
+
+    assert lru.misses == 1
+
+
+def test_get_stored_key_returns_value():
+    lru = LRUCache(maxsize=2)
+    lru["a"] = 1
+
+    assert lru["a"] == 1
+    assert lru.hits == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    lru = LRUCache(maxsize=2)
+    lru["a"] = 1
+    lru["b"] = 2
+    assert lru["a"] == 1
+
+    lru["c"] = 3
+
+    assert len(lru) == 2
+    assert lru["a"] == 1
+    assert lru["c"] == 3
+    with pytest.raises(KeyError):
+        lru["b"]
+
+
+def test_zero_maxsize_disables_cache():
+    lru = LRUCache(maxsize=0)
+
+    lru["a"] = 1
+
+    assert len(lru) == 0
+
+
+def test_expired_entry_is_missing(clock):
+    lru = LRUCache(maxsize=2, ttl=10)
+    lru["a"] = 1
+
+    clock[0] += 5
+    assert lru["a"] == 1
+
+    clock[0] += 10
+    with pytest.raises(KeyError):
+        lru["a"]
+    assert len(lru) == 0
+
+
+def test_clear_removes_all_entries():
+    lru = LRUCache(maxsize=2)
+    lru["a"] = 1
+
+    lru.clear()
+
+    assert len(lru) == 0
+
+
+def test_reset_counters_keeps_entries():
+    lru = LRUCache(maxsize=2)
+    lru["a"] = 1
+    lru["a"]
+    with pytest.raises(KeyError):
+        lru["b"]
+    assert lru.hit_rate == 0.5
+
+    lru.reset_counters()
+
+    assert (lru.hits, lru.misses, lru.hit_rate) == (0, 0, 0.0)
+    assert lru["a"] == 1
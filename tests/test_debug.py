@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from mopidy_mpris.cache import LRUCache
+from mopidy_mpris.debug import Debug
+from mopidy_mpris.stats import LATENCY_BUCKETS_US, Stats
+
+if TYPE_CHECKING:
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+
+
+@pytest.fixture
+def stats() -> Stats:
+    return Stats()
+
+
+@pytest.fixture
+def art_cache() -> LRUCache:
+    return LRUCache(maxsize=10)
+
+
+@pytest.fixture
+def debug(config: Config, core: CoreProxy, stats: Stats, art_cache: LRUCache) -> Debug:
+    return Debug(config, core, stats, caches={"art": art_cache})
+
+
+def test_calls_returns_calls_per_member(debug: Debug, stats: Stats):
+    stats.record_call("Player.Position", 0.001)
+
+    assert debug.Calls == {"Player.Position": 1}
+
+
+def test_latencies_has_one_bucket_more_than_latency_buckets(debug: Debug, stats: Stats):
+    stats.record_call("Player.Position", 0.001)
+
+    assert debug.LatencyBuckets == list(LATENCY_BUCKETS_US)
+    assert len(debug.Latencies["Player.Position"]) == len(debug.LatencyBuckets) + 1
+
+
+def test_core_calls_returns_calls_per_core_method(debug: Debug, stats: Stats):
+    stats.record_core_call("playback.get_state")
+
+    assert debug.CoreCalls == {"playback.get_state": 1}
+
+
+def test_signals_returns_signal_outcomes(debug: Debug, stats: Stats):
+    stats.record_signal("signals_emitted")
+    stats.record_signal("signals_suppressed")
+
+    assert debug.Signals == {"signals_emitted": 1, "signals_suppressed": 1}
+
+
+def test_timeouts_returns_timeouts_per_member(debug: Debug, stats: Stats):
+    stats.record_timeout("Player.Volume")
+
+    assert debug.Timeouts == {"Player.Volume": 1}
+
+
+def test_cache_hit_rates(debug: Debug, art_cache: LRUCache):
+    art_cache["a"] = None
+    art_cache["a"]
+    with pytest.raises(KeyError):
+        art_cache["b"]
+
+    assert debug.CacheHitRates == {"art": 0.5}
+
+
+def test_cache_hit_rate_is_zero_without_lookups(debug: Debug):
+    assert debug.CacheHitRates == {"art": 0.0}
+
+
+def test_reset_clears_all_counters(debug: Debug, stats: Stats, art_cache: LRUCache):
+    stats.record_call("Player.Position", 0.001)
+    stats.record_core_call("playback.get_state")
+    stats.record_signal("signals_emitted")
+    art_cache["a"] = None
+    art_cache["a"]
+
+    debug.Reset()
+
+    assert debug.Calls == {}
+    assert debug.Latencies == {}
+    assert debug.CoreCalls == {}
+    assert debug.Signals == {}
+    assert art_cache.hits == 0
+    assert art_cache.misses == 0
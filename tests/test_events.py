@@ -1,24 +1,54 @@
 from unittest import mock
 
 import pytest
-from mopidy.models import Playlist, TlTrack, Track
+from mopidy.models import Playlist, Ref, TlTrack, Track
 from mopidy.types import PlaybackState, TracklistId
 
-from mopidy_mpris import player, playlists, root, server
+from mopidy_mpris import player, playlists, root, server, tracklist
+from mopidy_mpris.cache import LRUCache
 from mopidy_mpris.frontend import MprisFrontend
+from mopidy_mpris.metadata import MetadataResolver
+from mopidy_mpris.state import PlayerState
 
 
 @pytest.fixture
-def frontend() -> MprisFrontend:
+def signal_coalesce_ms():
+    return 0
+
+
+@pytest.fixture
+def seeked_min_interval_ms():
+    return 0
+
+
+@pytest.fixture
+def frontend_config(signal_coalesce_ms, seeked_min_interval_ms):
+    return {
+        "mpris": {
+            "signal_coalesce_ms": signal_coalesce_ms,
+            "position_drift_check_ms": 0,
+            "position_drift_threshold_ms": 1000,
+            "seeked_min_interval_ms": seeked_min_interval_ms,
+        }
+    }
+
+
+@pytest.fixture
+def frontend(frontend_config) -> MprisFrontend:
     # As a plain class, not an actor:
-    result = MprisFrontend(config=None, core=None)
+    result = MprisFrontend(config=frontend_config, core=mock.Mock())
     result.mpris = mock.Mock(spec=server.Server)
     result.mpris.root = mock.Mock(spec=root.Root)
     result.mpris.root.INTERFACE = root.Root.INTERFACE
     result.mpris.player = mock.Mock(spec=player.Player)
     result.mpris.player.INTERFACE = player.Player.INTERFACE
+    result.mpris.player.state = PlayerState(position_refresh_interval=60)
+    result.mpris.player.resolver = mock.Mock(spec=MetadataResolver)
+    result.mpris.player.resolver.art_cache = LRUCache(maxsize=10)
     result.mpris.playlists = mock.Mock(spec=playlists.Playlists)
     result.mpris.playlists.INTERFACE = playlists.Playlists.INTERFACE
+    result.mpris.playlists.index = playlists.PlaylistIndex()
+    result.mpris.tracklist = mock.Mock(spec=tracklist.TrackList)
     return result
 
 
@@ -35,6 +65,15 @@ def test_track_playback_paused_event_changes_playback_status(frontend: MprisFron
     )
 
 
+def test_track_playback_paused_event_updates_state_mirror(frontend: MprisFrontend):
+    frontend.track_playback_paused(
+        tl_track=TlTrack(tlid=TracklistId(1), track=Track()),
+        time_position=0,
+    )
+
+    assert frontend.mpris.player.state.playback_state == PlaybackState.PAUSED
+
+
 def test_track_playback_resumed_event_changes_playback_status(frontend: MprisFrontend):
     frontend.mpris.player.PlaybackStatus = "Playing"
 
@@ -65,6 +104,42 @@ def test_track_playback_started_changes_playback_status_and_metadata(
     )
 
 
+def test_track_playback_started_invalidates_metadata(frontend: MprisFrontend):
+    frontend.track_playback_started(
+        tl_track=TlTrack(tlid=TracklistId(1), track=Track())
+    )
+
+    frontend.mpris.player.invalidate_metadata.assert_called_once_with()
+
+
+def test_track_playback_started_sets_track_length(frontend: MprisFrontend):
+    frontend.track_playback_started(
+        tl_track=TlTrack(tlid=TracklistId(1), track=Track(length=40000))
+    )
+
+    assert frontend.mpris.player.state.position.length == 40000
+
+
+def test_track_playback_started_refreshes_tracklist(frontend: MprisFrontend):
+    frontend.track_playback_started(
+        tl_track=TlTrack(tlid=TracklistId(1), track=Track())
+    )
+
+    frontend.mpris.tracklist.refresh.assert_called_once_with()
+
+
+def test_tracklist_changed_refreshes_tracklist(frontend: MprisFrontend):
+    frontend.tracklist_changed()
+
+    frontend.mpris.tracklist.refresh.assert_called_once_with()
+
+
+def test_tracklist_changed_invalidates_metadata(frontend: MprisFrontend):
+    frontend.tracklist_changed()
+
+    frontend.mpris.player.invalidate_metadata.assert_called_once_with()
+
+
 def test_track_playback_ended_changes_playback_status_and_metadata(
     frontend: MprisFrontend,
 ):
@@ -98,6 +173,18 @@ def test_playback_state_changed_changes_playback_status_and_metadata(
     )
 
 
+def test_playback_state_changed_invalidates_metadata(frontend: MprisFrontend):
+    frontend.playback_state_changed(PlaybackState.PLAYING, PlaybackState.STOPPED)
+
+    frontend.mpris.player.invalidate_metadata.assert_called_once_with()
+
+
+def test_playback_state_changed_updates_state_mirror(frontend: MprisFrontend):
+    frontend.playback_state_changed(PlaybackState.STOPPED, PlaybackState.PLAYING)
+
+    assert frontend.mpris.player.state.playback_state == PlaybackState.PLAYING
+
+
 def test_playlists_loaded_event_changes_playlist_count(frontend: MprisFrontend):
     frontend.mpris.playlists.PlaylistCount = 17
 
@@ -108,6 +195,23 @@ def test_playlists_loaded_event_changes_playlist_count(frontend: MprisFrontend):
     )
 
 
+def test_playlists_loaded_event_clears_art_cache(frontend: MprisFrontend):
+    art_cache = frontend.mpris.player.resolver.art_cache
+    art_cache["dummy:a"] = "http://example.com/a.jpg"
+
+    frontend.playlists_loaded()
+
+    assert len(art_cache) == 0
+
+
+def test_playlists_loaded_event_clears_playlist_index(frontend: MprisFrontend):
+    frontend.mpris.playlists.index.load([Ref.playlist(uri="dummy:foo", name="foo")])
+
+    frontend.playlists_loaded()
+
+    assert not frontend.mpris.playlists.index.loaded
+
+
 def test_playlist_changed_event_causes_mpris_playlist_changed_event(
     frontend: MprisFrontend,
 ):
@@ -120,6 +224,30 @@ def test_playlist_changed_event_causes_mpris_playlist_changed_event(
     )
 
 
+def test_playlist_changed_event_updates_playlist_index(frontend: MprisFrontend):
+    index = frontend.mpris.playlists.index
+    index.load([Ref.playlist(uri="dummy:foo", name="foo")])
+
+    frontend.playlist_changed(playlist=Playlist(uri="dummy:foo", name="bar"))
+    frontend.playlist_changed(playlist=Playlist(uri="dummy:baz", name="baz"))
+
+    assert index.get("User", reverse=False) == [
+        ("/com/mopidy/playlist/MR2W23LZHJTG63Y_", "bar", ""),
+        ("/com/mopidy/playlist/MR2W23LZHJRGC6Q_", "baz", ""),
+    ]
+
+
+def test_playlist_deleted_event_removes_playlist_from_index(
+    frontend: MprisFrontend,
+):
+    index = frontend.mpris.playlists.index
+    index.load([Ref.playlist(uri="dummy:foo", name="foo")])
+
+    frontend.playlist_deleted("dummy:foo")
+
+    assert len(index) == 0
+
+
 def test_playlist_deleted_event_changes_playlist_count(frontend: MprisFrontend):
     frontend.mpris.playlists.PlaylistCount = 17
 
@@ -150,6 +278,20 @@ def test_options_changed_event_changes_loopstatus_and_shuffle(frontend: MprisFro
     )
 
 
+def test_options_changed_event_refreshes_state_mirror(frontend: MprisFrontend):
+    tracklist = frontend.core.tracklist
+    tracklist.get_repeat.return_value.get.return_value = True
+    tracklist.get_single.return_value.get.return_value = False
+    tracklist.get_random.return_value.get.return_value = True
+
+    frontend.options_changed()
+
+    state = frontend.mpris.player.state
+    assert state.repeat is True
+    assert state.single is False
+    assert state.random is True
+
+
 def test_volume_changed_event_changes_volume(frontend: MprisFrontend):
     frontend.mpris.player.Volume = 1.0
 
@@ -176,6 +318,186 @@ def test_seeked_event_causes_mpris_seeked_event(frontend: MprisFrontend):
     frontend.mpris.player.Seeked.assert_called_with(31000000)
 
 
+@pytest.mark.parametrize("seeked_min_interval_ms", [60000])
+def test_scrubbing_emits_first_and_last_seeked(frontend: MprisFrontend):
+    positions = range(1000, 51000, 1000)
+
+    for position in positions:
+        frontend.seeked(time_position=position)
+    frontend._flush_seeked()
+
+    assert frontend.mpris.player.Seeked.call_args_list == [
+        mock.call(1000000),
+        mock.call(50000000),
+    ]
+    assert frontend.stats.signals["seeked_dropped"] == len(positions) - 2
+
+
+@pytest.mark.parametrize("seeked_min_interval_ms", [60000])
+def test_seeked_is_rate_limited_after_flush(frontend: MprisFrontend):
+    frontend.seeked(time_position=1000)
+    frontend.seeked(time_position=2000)
+    frontend._flush_seeked()
+
+    frontend.seeked(time_position=3000)
+
+    assert frontend.mpris.player.Seeked.call_count == 2
+    assert frontend._seeked_pending == 3000000
+
+
+@pytest.mark.parametrize("seeked_min_interval_ms", [1])
+def test_last_seeked_is_emitted_when_interval_ends(frontend: MprisFrontend):
+    for position in range(1000, 21000, 1000):
+        frontend.seeked(time_position=position)
+    # The last position is pending, unless the interval ended in between.
+    timer = frontend._seeked_timer
+    if timer is not None:
+        timer.join(timeout=5)
+
+    assert frontend.mpris.player.Seeked.call_args == mock.call(20000000)
+
+
+def test_seeked_is_not_rate_limited_if_interval_is_zero(frontend: MprisFrontend):
+    for position in range(1000, 21000, 1000):
+        frontend.seeked(time_position=position)
+
+    assert frontend.mpris.player.Seeked.call_count == 20
+
+
+def test_seeked_event_anchors_position(frontend: MprisFrontend):
+    frontend.mpris.player.state.playback_state = PlaybackState.PAUSED
+
+    frontend.seeked(time_position=31000)
+
+    assert frontend.mpris.player.state.position.get() == 31000
+
+
+def test_track_playback_paused_event_anchors_position(frontend: MprisFrontend):
+    frontend.track_playback_paused(
+        tl_track=TlTrack(tlid=TracklistId(1), track=Track()),
+        time_position=12000,
+    )
+
+    assert frontend.mpris.player.state.position.get() == 12000
+
+
+def test_track_playback_resumed_event_anchors_position(frontend: MprisFrontend):
+    frontend.track_playback_resumed(
+        tl_track=TlTrack(tlid=TracklistId(1), track=Track()),
+        time_position=12000,
+    )
+
+    assert frontend.mpris.player.state.position.get() >= 12000
+
+
+def test_track_playback_started_event_anchors_position(frontend: MprisFrontend):
+    frontend.mpris.player.state.position.set(12000, running=False)
+
+    frontend.track_playback_started(
+        tl_track=TlTrack(tlid=TracklistId(1), track=Track()),
+    )
+
+    assert frontend.mpris.player.state.position.get() < 12000
+
+
+def test_playback_stopped_forgets_position(frontend: MprisFrontend):
+    frontend.mpris.player.state.position.set(12000, running=True)
+
+    frontend.playback_state_changed(PlaybackState.PLAYING, PlaybackState.STOPPED)
+
+    assert frontend.mpris.player.state.position.get() is None
+
+
+@pytest.fixture
+def drifting(frontend: MprisFrontend, monkeypatch):
+    monkeypatch.setattr("mopidy_mpris.state.time.monotonic", lambda: 100.0)
+    frontend.mpris.player.state.playback_state = PlaybackState.PLAYING
+    frontend.mpris.player.state.position.set(10000, running=True)
+    monkeypatch.setattr("mopidy_mpris.state.time.monotonic", lambda: 105.0)
+
+    # We expect playback to be at 15000 ms by now.
+    def set_time_position(position):
+        frontend.core.playback.get_time_position.return_value.get.return_value = (
+            position
+        )
+
+    return set_time_position
+
+
+def test_drift_check_emits_seeked_when_position_drifts(
+    frontend: MprisFrontend, drifting
+):
+    drifting(12000)
+
+    frontend._check_position_drift()
+
+    frontend.mpris.player.Seeked.assert_called_once_with(12000000)
+    assert frontend.stats.signals["seeked_for_drift"] == 1
+
+
+def test_drift_check_reanchors_position(frontend: MprisFrontend, drifting):
+    drifting(12000)
+
+    frontend._check_position_drift()
+
+    assert frontend.mpris.player.state.position.get() == 12000
+
+
+def test_drift_check_ignores_drift_below_threshold(frontend: MprisFrontend, drifting):
+    drifting(15500)
+
+    frontend._check_position_drift()
+
+    frontend.mpris.player.Seeked.assert_not_called()
+
+
+def test_drift_check_does_nothing_when_not_playing(frontend: MprisFrontend, drifting):
+    drifting(12000)
+    frontend.mpris.player.state.playback_state = PlaybackState.PAUSED
+
+    frontend._check_position_drift()
+
+    frontend.core.playback.get_time_position.assert_not_called()
+    frontend.mpris.player.Seeked.assert_not_called()
+
+
+def test_drift_check_keeps_position_from_pause_handled_meanwhile(
+    frontend: MprisFrontend, drifting
+):
+    def pause_while_asking_core(timeout=None):
+        frontend.track_playback_paused(
+            tl_track=TlTrack(tlid=TracklistId(1), track=Track()),
+            time_position=15000,
+        )
+        return 12000
+
+    get = frontend.core.playback.get_time_position.return_value.get
+    get.side_effect = pause_while_asking_core
+
+    frontend._check_position_drift()
+
+    assert frontend.mpris.player.state.position.anchor == (15000, 105.0, False)
+    frontend.mpris.player.Seeked.assert_not_called()
+
+
+def test_drift_check_keeps_position_from_seek_handled_meanwhile(
+    frontend: MprisFrontend, drifting
+):
+    def seek_while_asking_core(timeout=None):
+        frontend.seeked(time_position=30000)
+        frontend.mpris.player.Seeked.reset_mock()
+        return 12000
+
+    get = frontend.core.playback.get_time_position.return_value.get
+    get.side_effect = seek_while_asking_core
+
+    frontend._check_position_drift()
+
+    assert frontend.mpris.player.state.position.get() == 30000
+    frontend.mpris.player.Seeked.assert_not_called()
+    assert frontend.stats.signals["seeked_for_drift"] == 0
+
+
 def test_stream_title_changed_changes_metadata(frontend: MprisFrontend):
     frontend.mpris.player.Metadata = "..."
 
@@ -184,3 +506,115 @@ def test_stream_title_changed_changes_metadata(frontend: MprisFrontend):
     frontend.mpris.player.PropertiesChanged.assert_called_with(
         player.Player.INTERFACE, {"Metadata": "..."}, []
     )
+    frontend.mpris.player.invalidate_metadata.assert_called_once_with()
+    frontend.mpris.tracklist.emit_track_metadata_changed.assert_called_once_with("...")
+
+
+@pytest.mark.parametrize("signal_coalesce_ms", [60000])
+def test_stream_title_changed_is_coalesced_with_track_metadata_changed(
+    frontend: MprisFrontend,
+):
+    frontend.mpris.player.Metadata = "..."
+
+    frontend.stream_title_changed("a new title")
+
+    frontend.mpris.tracklist.emit_track_metadata_changed.assert_not_called()
+
+    frontend._flush_properties_changed()
+
+    frontend.mpris.player.PropertiesChanged.assert_called_once_with(
+        player.Player.INTERFACE, {"Metadata": "..."}, []
+    )
+    frontend.mpris.tracklist.emit_track_metadata_changed.assert_called_once_with("...")
+
+
+def test_track_change_does_not_emit_track_metadata_changed(frontend: MprisFrontend):
+    frontend.mpris.player.Metadata = "..."
+
+    frontend.track_playback_started(
+        tl_track=TlTrack(tlid=TracklistId(1), track=Track())
+    )
+
+    frontend.mpris.tracklist.emit_track_metadata_changed.assert_not_called()
+
+
+@pytest.mark.parametrize("signal_coalesce_ms", [60000])
+def test_track_change_events_are_coalesced_into_one_signal(frontend: MprisFrontend):
+    tl_track = TlTrack(tlid=TracklistId(1), track=Track())
+    frontend.mpris.player.Metadata = "..."
+    frontend.mpris.player.PlaybackStatus = "Playing"
+
+    frontend.track_playback_ended(tl_track=tl_track, time_position=0)
+    frontend.playback_state_changed(PlaybackState.STOPPED, PlaybackState.PLAYING)
+    frontend.track_playback_started(tl_track=tl_track)
+    frontend.volume_changed(volume=100)
+
+    frontend.mpris.player.PropertiesChanged.assert_not_called()
+
+    frontend._flush_properties_changed()
+
+    frontend.mpris.player.PropertiesChanged.assert_called_once_with(
+        player.Player.INTERFACE,
+        {"PlaybackStatus": "Playing", "Metadata": "...", "Volume": mock.ANY},
+        [],
+    )
+
+
+@pytest.mark.parametrize("signal_coalesce_ms", [60000])
+def test_coalesced_signals_are_emitted_per_interface(frontend: MprisFrontend):
+    frontend.mpris.player.Volume = 1.0
+    frontend.mpris.playlists.PlaylistCount = 17
+
+    frontend.volume_changed(volume=100)
+    frontend.playlists_loaded()
+    frontend._flush_properties_changed()
+
+    frontend.mpris.player.PropertiesChanged.assert_called_once_with(
+        player.Player.INTERFACE, {"Volume": 1.0}, []
+    )
+    frontend.mpris.playlists.PropertiesChanged.assert_called_once_with(
+        playlists.Playlists.INTERFACE, {"PlaylistCount": 17}, []
+    )
+
+
+@pytest.mark.parametrize("signal_coalesce_ms", [1])
+def test_coalesced_signals_are_emitted_when_window_ends(frontend: MprisFrontend):
+    frontend.mpris.player.Volume = 1.0
+
+    frontend.volume_changed(volume=100)
+    timer = frontend._flush_timer
+    assert timer is not None
+    timer.join(timeout=5)
+
+    frontend.mpris.player.PropertiesChanged.assert_called_once_with(
+        player.Player.INTERFACE, {"Volume": 1.0}, []
+    )
+
+
+def test_unchanged_properties_are_not_emitted_again(frontend: MprisFrontend):
+    frontend.mpris.player.CanGoPrevious = False
+    frontend.mpris.player.CanGoNext = True
+    frontend.mpris.player.LoopStatus = "None"
+    frontend.mpris.player.Shuffle = False
+    frontend.options_changed()
+    frontend.mpris.player.PropertiesChanged.reset_mock()
+
+    frontend.mpris.player.Shuffle = True
+    frontend.options_changed()
+
+    frontend.mpris.player.PropertiesChanged.assert_called_once_with(
+        player.Player.INTERFACE, {"Shuffle": True}, []
+    )
+    assert frontend.stats.signals["properties_suppressed"] == 3
+
+
+def test_signal_is_skipped_if_no_properties_changed(frontend: MprisFrontend):
+    frontend.mpris.player.Volume = 0.5
+    frontend.volume_changed(volume=50)
+    frontend.mpris.player.PropertiesChanged.reset_mock()
+
+    frontend.mute_changed(False)
+
+    frontend.mpris.player.PropertiesChanged.assert_not_called()
+    assert frontend.stats.signals["signals_emitted"] == 1
+    assert frontend.stats.signals["signals_suppressed"] == 1
@@ -1,5 +1,10 @@
+import subprocess
+import sys
 from unittest import mock
 
+import pytest
+from mopidy import exceptions
+
 from mopidy_mpris import Extension
 from mopidy_mpris import frontend as frontend_lib
 
@@ -12,6 +17,19 @@ def test_get_default_config():
     assert "[mpris]" in config
     assert "enabled = true" in config
     assert "bus_type = session" in config
+    assert "signal_coalesce_ms = 25" in config
+    assert "art_cache_size = 256" in config
+    assert "tracklist_window = 50" in config
+    assert "position_refresh_ms = 5000" in config
+    assert "position_drift_check_ms = 2000" in config
+    assert "position_drift_threshold_ms = 1000" in config
+    assert "seeked_min_interval_ms = 100" in config
+    assert "volume_min_interval_ms = 50" in config
+    assert "transport_fire_and_forget = false" in config
+    assert "core_timeout_ms = 1000" in config
+    assert "art_breaker_failures = 3" in config
+    assert "art_breaker_slow_ms = 500" in config
+    assert "art_breaker_cooldown = 60" in config
 
 
 def test_get_config_schema():
@@ -21,6 +39,20 @@ def test_get_config_schema():
 
     assert "desktop_file" in schema
     assert "bus_type" in schema
+    assert "signal_coalesce_ms" in schema
+    assert "art_cache_size" in schema
+    assert "art_cache_ttl" in schema
+    assert "tracklist_window" in schema
+    assert "position_refresh_ms" in schema
+    assert "position_drift_check_ms" in schema
+    assert "position_drift_threshold_ms" in schema
+    assert "seeked_min_interval_ms" in schema
+    assert "volume_min_interval_ms" in schema
+    assert "transport_fire_and_forget" in schema
+    assert "core_timeout_ms" in schema
+    assert "art_breaker_failures" in schema
+    assert "art_breaker_slow_ms" in schema
+    assert "art_breaker_cooldown" in schema
 
 
 def test_get_frontend_classes():
@@ -30,3 +62,32 @@ def test_get_frontend_classes():
     ext.setup(registry)
 
     registry.add.assert_called_once_with("frontend", frontend_lib.MprisFrontend)
+
+
+def test_validate_environment_fails_without_pydbus(monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    ext = Extension()
+
+    with pytest.raises(exceptions.ExtensionError):
+        ext.validate_environment()
+
+
+def test_loading_the_frontend_does_not_import_pydbus():
+    # Mopidy loads all extensions and frontends on startup. The D-Bus
+    # libraries should only be loaded when the frontend starts.
+    code = (
+        "import sys;"
+        "from mopidy_mpris import Extension;"
+        "Extension().validate_environment();"
+        "import mopidy_mpris.frontend;"
+        "print('pydbus' in sys.modules)"
+    )
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    assert result.stdout.strip() == "False"
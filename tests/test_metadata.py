@@ -0,0 +1,203 @@
+from unittest import mock
+
+import pykka
+import pytest
+from gi.repository import GLib  # pyright: ignore[reportMissingModuleSource]
+from mopidy.models import Image, TlTrack, Track
+from mopidy.types import TracklistId
+
+from mopidy_mpris import breaker
+from mopidy_mpris.metadata import (
+    MetadataResolver,
+    get_art_url,
+    get_track_id,
+    get_track_tlid,
+)
+
+
+@pytest.fixture
+def core():
+    result = mock.Mock()
+    result.library.get_images.return_value.get.return_value = {
+        "dummy:a": [Image(uri="http://example.com/a.jpg")],
+        "dummy:b": [],
+    }
+    return result
+
+
+@pytest.fixture
+def resolver(config, core) -> MetadataResolver:
+    return MetadataResolver(config, core)
+
+
+@pytest.fixture
+def tl_tracks() -> list[TlTrack]:
+    return [
+        TlTrack(tlid=TracklistId(1), track=Track(uri="dummy:a", name="a")),
+        TlTrack(tlid=TracklistId(2), track=Track(uri="dummy:b", name="b")),
+        TlTrack(tlid=TracklistId(3), track=Track(uri="dummy:a", name="a")),
+    ]
+
+
+def test_resolve_looks_up_art_for_all_tracks_at_once(core, resolver, tl_tracks):
+    result = resolver.resolve(tl_tracks)
+
+    core.library.get_images.assert_called_once_with(["dummy:a", "dummy:b"])
+    assert [m["mpris:trackid"] for m in result] == [
+        GLib.Variant("o", "/com/mopidy/track/1"),
+        GLib.Variant("o", "/com/mopidy/track/2"),
+        GLib.Variant("o", "/com/mopidy/track/3"),
+    ]
+    assert result[0]["mpris:artUrl"] == GLib.Variant("s", "http://example.com/a.jpg")
+    assert "mpris:artUrl" not in result[1]
+
+
+def test_resolve_uses_cached_art(core, resolver, tl_tracks):
+    resolver.resolve(tl_tracks[:1])
+    core.library.get_images.reset_mock()
+
+    resolver.resolve(tl_tracks)
+
+    core.library.get_images.assert_called_once_with(["dummy:b"])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def failing_core(core):
+    def get_images(uris):
+        future = mock.Mock()
+        if uris[0].startswith(("slow:", "broken:")):
+            future.get.side_effect = RuntimeError
+        else:
+            future.get.return_value = {"dummy:a": []}
+        return future
+
+    core.library.get_images.side_effect = get_images
+    return core
+
+
+def test_failing_lookup_leaves_out_art(failing_core, resolver):
+    result = resolver.get_art_urls(["slow:a", "dummy:a"])
+
+    assert result == {"dummy:a": None}
+    assert "slow:a" not in resolver.art_cache
+    assert resolver.art_breakers["dummy"].is_open is False
+
+
+def test_timed_out_lookup_leaves_out_art(core, resolver):
+    core.library.get_images.return_value = pykka.ThreadingFuture()
+
+    result = resolver.get_art_urls(["dummy:a"], timeout=0.01)
+
+    assert result == {}
+    assert "dummy:a" not in resolver.art_cache
+    assert resolver.stats.timeouts == {"MetadataResolver.get_images": 1}
+
+
+def test_stuck_scheme_does_not_trip_the_breakers_of_others(core, resolver):
+    # Core is stuck on the first lookup, so it never gets to the second.
+    core.library.get_images.side_effect = lambda uris: pykka.ThreadingFuture()
+    resolver.art_breakers["dummy"] = breaker.CircuitBreaker(max_failures=1, cooldown=0)
+    resolver.art_breakers["dummy"].record_failure()
+
+    for _ in range(3):
+        assert resolver.get_art_urls(["stuck:a", "dummy:a"], timeout=0.01) == {}
+
+    assert resolver.art_breakers["stuck"].is_open
+    assert resolver.stats.timeouts == {"MetadataResolver.get_images": 3}
+    # The probe of the scheme that wasn't reached was given up, not stuck.
+    assert resolver.art_breakers["dummy"].allow()
+    assert core.library.get_images.call_args_list.count(mock.call(["dummy:a"])) == 3
+
+
+def test_failing_scheme_is_skipped(clock, failing_core, resolver):
+    for _ in range(3):
+        resolver.get_art_urls(["slow:a"])
+    failing_core.library.get_images.reset_mock()
+
+    result = resolver.get_art_urls(["slow:a", "dummy:a"])
+
+    failing_core.library.get_images.assert_called_once_with(["dummy:a"])
+    assert result == {"dummy:a": None}
+    assert "slow:a" not in resolver.art_cache
+
+
+def test_failing_scheme_is_probed_after_cooldown(clock, failing_core, resolver):
+    for _ in range(3):
+        resolver.get_art_urls(["slow:a"])
+    failing_core.library.get_images.reset_mock()
+
+    clock[0] += 60
+    resolver.get_art_urls(["slow:a"])
+
+    failing_core.library.get_images.assert_called_once_with(["slow:a"])
+
+
+def test_schemes_failing_together_are_all_probed_after_cooldown(
+    clock, failing_core, resolver
+):
+    for _ in range(3):
+        resolver.get_art_urls(["slow:a", "broken:a"])
+    assert resolver.art_breakers["slow"].is_open
+    assert resolver.art_breakers["broken"].is_open
+
+    for _ in range(2):
+        failing_core.library.get_images.reset_mock()
+        clock[0] += 60
+
+        assert resolver.get_art_urls(["slow:a", "broken:a"]) == {}
+
+        failing_core.library.get_images.assert_has_calls(
+            [mock.call(["slow:a"]), mock.call(["broken:a"])]
+        )
+
+
+def test_slow_lookups_count_as_failures(clock, core, resolver):
+    def get(timeout=None):
+        clock[0] += 1
+        return {}
+
+    core.library.get_images.return_value.get.side_effect = get
+    for i in range(3):
+        resolver.get_art_urls([f"dummy:{i}"])
+    core.library.get_images.reset_mock()
+
+    resolver.get_art_urls(["dummy:x"])
+
+    core.library.get_images.assert_not_called()
+
+
+def test_resolve_with_stream_title(resolver, tl_tracks):
+    result = resolver.resolve(tl_tracks, stream_titles={TracklistId(2): "Stream"})
+
+    assert result[0]["xesam:title"] == GLib.Variant("s", "a")
+    assert result[1]["xesam:title"] == GLib.Variant("s", "Stream")
+
+
+def test_get_art_url_prefers_largest_image():
+    images = [
+        Image(uri="http://example.com/small.jpg", width=100, height=100),
+        Image(uri="http://example.com/large.jpg", width=200, height=200),
+        Image(uri="http://example.com/unsized.jpg"),
+    ]
+
+    assert get_art_url(images) == "http://example.com/large.jpg"
+
+
+def test_get_art_url_without_images():
+    assert get_art_url([]) is None
+
+
+def test_track_id_roundtrip():
+    assert get_track_tlid(get_track_id(TracklistId(17))) == 17
+
+
+def test_get_track_tlid_fails_on_other_object_paths():
+    with pytest.raises(ValueError, match="Cannot extract track ID"):
+        get_track_tlid("/com/mopidy/playlist/foo")
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, cast
+from unittest import mock
 
+import pykka
 import pytest
 from gi.repository import GLib  # pyright: ignore[reportMissingModuleSource]
 from mopidy.models import Album, Artist, Image, Track
-from mopidy.types import PlaybackState
+from mopidy.types import DurationMs, PlaybackState
 
+from mopidy_mpris.interface import get_dbus_members
 from mopidy_mpris.player import Player
+from mopidy_mpris.stats import CountingCore, Stats
 
 if TYPE_CHECKING:
     from mopidy.core import CoreProxy
@@ -32,6 +39,13 @@ def test_get_playback_status(core: CoreProxy, player: Player, state, expected):
     assert player.PlaybackStatus == expected
 
 
+def test_get_playback_status_prefers_state_mirror(core: CoreProxy, player: Player):
+    core.playback.set_state(STOPPED)
+    player.state.playback_state = PAUSED
+
+    assert player.PlaybackStatus == "Paused"
+
+
 @pytest.mark.parametrize(
     ("repeat", "single", "expected"),
     [
@@ -48,6 +62,14 @@ def test_get_loop_status(core: CoreProxy, player: Player, repeat, single, expect
     assert player.LoopStatus == expected
 
 
+def test_get_loop_status_prefers_state_mirror(core: CoreProxy, player: Player):
+    core.tracklist.set_repeat(False)
+    player.state.repeat = True
+    player.state.single = True
+
+    assert player.LoopStatus == "Track"
+
+
 @pytest.mark.parametrize(
     ("status", "expected_repeat", "expected_single"),
     [("None", False, False), ("Track", True, True), ("Playlist", True, False)],
@@ -110,6 +132,35 @@ def test_get_shuffle(core: CoreProxy, player: Player, random):
     assert player.Shuffle is random
 
 
+def test_get_shuffle_prefers_state_mirror(core: CoreProxy, player: Player):
+    core.tracklist.set_random(False)
+    player.state.random = True
+
+    assert player.Shuffle is True
+
+
+def test_state_mirror_refresh_fetches_values_from_core(core: CoreProxy, player: Player):
+    core.playback.set_state(PAUSED)
+    core.tracklist.set_repeat(True)
+    core.tracklist.set_single(False)
+    core.tracklist.set_random(True)
+
+    player.state.refresh(core)
+
+    assert player.state.playback_state == PAUSED
+    assert player.state.repeat is True
+    assert player.state.single is False
+    assert player.state.random is True
+
+
+def test_state_mirror_refresh_gives_up_on_core_timeout(player: Player, stuck_core):
+    with pytest.raises(pykka.Timeout):
+        player.state.refresh(stuck_core, timeout=0.01)
+
+    assert player.state.playback_state is None
+    assert player.state.repeat is None
+
+
 @pytest.mark.parametrize("value", [True, False])
 def test_set_shuffle(core: CoreProxy, player: Player, value):
     core.tracklist.set_random(not value)
@@ -200,6 +251,103 @@ def test_get_metadata_use_library_image_as_art_url(
     assert result["mpris:artUrl"] == GLib.Variant("s", "http://example.com/large.jpg")
 
 
+def test_get_metadata_caches_art_url(backend, core: CoreProxy, player: Player):
+    backend.library.dummy_get_images_result = {
+        "dummy:a": [Image(uri="http://example.com/a.jpg")],
+    }
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+    assert player.Metadata["mpris:artUrl"] == GLib.Variant(
+        "s", "http://example.com/a.jpg"
+    )
+    backend.library.dummy_get_images_result = {}
+
+    result = player.Metadata
+
+    assert result["mpris:artUrl"] == GLib.Variant("s", "http://example.com/a.jpg")
+    assert player.resolver.art_cache.hits == 1
+    assert player.resolver.art_cache.misses == 1
+
+
+def test_get_metadata_caches_missing_art_url(backend, core: CoreProxy, player: Player):
+    backend.library.dummy_get_images_result = {"dummy:a": []}
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+    assert "mpris:artUrl" not in player.Metadata
+
+    assert "mpris:artUrl" not in player.Metadata
+    assert player.resolver.art_cache.hits == 1
+
+
+def test_get_metadata_is_memoized_for_current_track(
+    backend, core: CoreProxy, player: Player
+):
+    backend.library.dummy_get_images_result = {
+        "dummy:a": [Image(uri="http://example.com/a.jpg")],
+    }
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+    first = player.Metadata
+    player.resolver.art_cache.clear()
+
+    second = player.Metadata
+
+    assert second is first
+    assert player.resolver.art_cache.misses == 1
+
+
+def test_get_metadata_is_rebuilt_after_invalidation(
+    backend, core: CoreProxy, player: Player
+):
+    backend.library.dummy_get_images_result = {
+        "dummy:a": [Image(uri="http://example.com/a.jpg")],
+    }
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+    assert "mpris:artUrl" in player.Metadata
+    backend.library.dummy_get_images_result = {"dummy:a": []}
+    player.resolver.art_cache.clear()
+
+    player.invalidate_metadata()
+
+    assert "mpris:artUrl" not in player.Metadata
+
+
+def test_get_metadata_does_not_ask_core_again_while_playing(config, core: CoreProxy):
+    stats = Stats()
+    player = Player(config, cast("CoreProxy", CountingCore(core, stats)))
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+    player.state.playback_state = PLAYING
+
+    for _ in range(5):
+        assert player.Metadata["xesam:url"] == GLib.Variant("s", "dummy:a")
+
+    assert stats.core_calls["playback.get_current_tl_track"] == 1
+    assert stats.core_calls["library.get_images"] == 1
+
+    player.invalidate_metadata()
+
+    assert player.Metadata
+    assert stats.core_calls["playback.get_current_tl_track"] == 2
+
+
+def test_get_metadata_asks_core_on_every_read_when_stopped(config, core: CoreProxy):
+    stats = Stats()
+    player = Player(config, cast("CoreProxy", CountingCore(core, stats)))
+    core.tracklist.add([Track(uri="dummy:a"), Track(uri="dummy:b")])
+    core.playback.play().get()
+    core.playback.stop().get()
+    player.state.playback_state = STOPPED
+    assert player.Metadata["xesam:url"] == GLib.Variant("s", "dummy:a")
+
+    # Core changes the current track without any event while stopped.
+    core.playback.next().get()
+
+    assert player.Metadata["xesam:url"] == GLib.Variant("s", "dummy:b")
+    assert stats.core_calls["playback.get_current_tl_track"] == 2
+
+
 def test_get_metadata_has_disc_number_in_album(core: CoreProxy, player: Player):
     core.tracklist.add([Track(uri="dummy:a", disc_no=2)])
     core.playback.play().get()
@@ -312,6 +460,66 @@ def test_get_position_when_no_current_track_should_be_zero(player: Player):
     assert result_in_milliseconds == 0
 
 
+def test_get_position_is_extrapolated_until_refresh(config, core: CoreProxy):
+    config["mpris"]["position_refresh_ms"] = 60000
+    stats = Stats()
+    player = Player(config, cast("CoreProxy", CountingCore(core, stats)))
+    core.tracklist.add([Track(uri="dummy:a", length=40000)])
+    core.playback.play().get()
+    core.playback.seek(10000).get()
+    player.state.refresh(core)
+
+    first = player.Position
+    second = player.Position
+
+    assert first >= 10000 * 1000
+    assert second >= first
+    assert stats.core_calls["playback.get_time_position"] == 1
+
+
+def test_get_position_asks_core_every_time_if_refresh_is_zero(config, core: CoreProxy):
+    stats = Stats()
+    player = Player(config, cast("CoreProxy", CountingCore(core, stats)))
+
+    player.Position  # noqa: B018
+    player.Position  # noqa: B018
+
+    assert stats.core_calls["playback.get_time_position"] == 2
+
+
+def test_get_position_does_not_advance_when_not_playing(config, core: CoreProxy):
+    config["mpris"]["position_refresh_ms"] = 60000
+    player = Player(config, core)
+    player.state.position.set(DurationMs(10000), running=False)
+
+    assert player.Position == 10000 * 1000
+
+
+def test_get_position_advances_when_playing(config, core: CoreProxy, monkeypatch):
+    config["mpris"]["position_refresh_ms"] = 60000
+    player = Player(config, core)
+    monkeypatch.setattr("mopidy_mpris.state.time.monotonic", lambda: 100.0)
+    player.state.position.set(DurationMs(10000), running=True)
+
+    monkeypatch.setattr("mopidy_mpris.state.time.monotonic", lambda: 102.5)
+
+    assert player.Position == 12500 * 1000
+
+
+def test_get_position_does_not_advance_past_track_length(
+    config, core: CoreProxy, monkeypatch
+):
+    config["mpris"]["position_refresh_ms"] = 60000
+    player = Player(config, core)
+    monkeypatch.setattr("mopidy_mpris.state.time.monotonic", lambda: 100.0)
+    player.state.position.length = DurationMs(11000)
+    player.state.position.set(DurationMs(10000), running=True)
+
+    monkeypatch.setattr("mopidy_mpris.state.time.monotonic", lambda: 102.5)
+
+    assert player.Position == 11000 * 1000
+
+
 def test_get_minimum_rate_is_one_or_less(player: Player):
     assert player.MinimumRate <= 1.0
 
@@ -499,6 +707,115 @@ def test_next_when_stopped_skips_to_next_track_and_stay_stopped(
     assert core.playback.get_state().get() == STOPPED
 
 
+def test_next_with_fire_and_forget_skips_to_next_track(config, core: CoreProxy):
+    config["mpris"]["transport_fire_and_forget"] = True
+    player = Player(config, core)
+    core.tracklist.add([Track(uri="dummy:a"), Track(uri="dummy:b")])
+    core.playback.play().get()
+
+    player.Next()
+
+    # Core handles its messages in order, so this is after the skip.
+    assert core.playback.get_current_track().get().uri == "dummy:b"
+
+
+@pytest.fixture
+def slow_core():
+    # A core that answers, but only after core_timeout_ms.
+    def answer_later(value):
+        future = pykka.ThreadingFuture()
+        threading.Timer(0.05, future.set, [value]).start()
+        return future
+
+    core = mock.Mock()
+    core.playback.get_current_tlid.side_effect = lambda: answer_later(1)
+    core.tracklist.get_next_tlid.side_effect = lambda: answer_later(2)
+    core.tracklist.get_previous_tlid.side_effect = lambda: answer_later(0)
+    return core
+
+
+@pytest.mark.parametrize(
+    ("method", "command"),
+    [("Next", "next"), ("Previous", "previous"), ("Play", "play")],
+)
+def test_command_waits_for_slow_core(config, slow_core, method, command):
+    config["mpris"]["core_timeout_ms"] = 10
+    slow_core.playback.get_state.return_value.get.return_value = STOPPED
+    player = Player(config, slow_core)
+
+    getattr(player, method)()
+
+    getattr(slow_core.playback, command).assert_called_once_with()
+    assert player.stats.timeouts == {}
+
+
+def test_fire_and_forget_does_not_wait_for_core(config):
+    config["mpris"]["transport_fire_and_forget"] = True
+    core = mock.Mock()
+    future = pykka.ThreadingFuture()
+    core.playback.stop.return_value = future
+    player = Player(config, core)
+
+    player.Stop()
+
+    core.playback.stop.assert_called_once_with()
+    future.set(None)
+
+
+def test_fire_and_forget_logs_errors(config, caplog):
+    config["mpris"]["transport_fire_and_forget"] = True
+    core = mock.Mock()
+    future = pykka.ThreadingFuture()
+    try:
+        raise RuntimeError  # noqa: TRY301
+    except RuntimeError:
+        future.set_exception()
+    core.playback.stop.return_value = future
+    player = Player(config, core)
+
+    with caplog.at_level(logging.ERROR):
+        player.Stop()
+        player._command_executor.shutdown(wait=True)
+
+    assert "org.mpris.MediaPlayer2.Player.Stop failed" in caplog.text
+
+
+def test_play_pause_asks_core_instead_of_state_mirror(core: CoreProxy, player: Player):
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+    core.playback.pause().get()
+    # As if the frontend hasn't handled the pause event yet.
+    player.state.playback_state = PLAYING
+
+    player.PlayPause()
+
+    assert core.playback.get_state().get() == PLAYING
+
+
+def test_play_pause_twice_with_fire_and_forget_toggles_twice(config, core: CoreProxy):
+    config["mpris"]["transport_fire_and_forget"] = True
+    player = Player(config, core)
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+    player.state.playback_state = PLAYING
+
+    player.PlayPause()
+    assert core.playback.get_state().get() == PAUSED
+    player.PlayPause()
+
+    assert core.playback.get_state().get() == PLAYING
+    player.shutdown()
+
+
+def test_shutdown_stops_the_command_executor(config):
+    player = Player(config, mock.Mock())
+
+    player.shutdown()
+
+    with pytest.raises(RuntimeError):
+        player._command_executor.submit(print)
+
+
 def test_previous_is_ignored_if_can_go_previous_is_false(
     core: CoreProxy, player: Player
 ):
@@ -748,6 +1065,7 @@ def test_seek_is_ignored_if_can_seek_is_false(core: CoreProxy, player: Player):
     microseconds_to_seek = milliseconds_to_seek * 1000
 
     player.Seek(microseconds_to_seek)
+    player.seek_scheduler.join()
 
     after_seek = core.playback.get_time_position().get()
     assert before_seek <= after_seek
@@ -767,6 +1085,7 @@ def test_seek_seeks_given_microseconds_forward_in_the_current_track(
     microseconds_to_seek = milliseconds_to_seek * 1000
 
     player.Seek(microseconds_to_seek)
+    player.seek_scheduler.join()
 
     assert core.playback.get_state().get() == PLAYING
 
@@ -788,6 +1107,7 @@ def test_seek_seeks_given_microseconds_backward_if_negative(
     microseconds_to_seek = milliseconds_to_seek * 1000
 
     player.Seek(microseconds_to_seek)
+    player.seek_scheduler.join()
 
     assert core.playback.get_state().get() == PLAYING
 
@@ -810,6 +1130,7 @@ def test_seek_seeks_to_start_of_track_if_new_position_is_negative(
     microseconds_to_seek = milliseconds_to_seek * 1000
 
     player.Seek(microseconds_to_seek)
+    player.seek_scheduler.join()
 
     assert core.playback.get_state().get() == PLAYING
 
@@ -835,6 +1156,7 @@ def test_seek_skips_to_next_track_if_new_position_gt_track_length(
     microseconds_to_seek = milliseconds_to_seek * 1000
 
     player.Seek(microseconds_to_seek)
+    player.seek_scheduler.join()
 
     assert core.playback.get_state().get() == PLAYING
     assert core.playback.get_current_track().get().uri == "dummy:b"
@@ -858,6 +1180,7 @@ def test_set_position_is_ignored_if_can_seek_is_false(core: CoreProxy, player: P
     position_to_set_in_microsec = position_to_set_in_millisec * 1000
 
     player.SetPosition(track_id, position_to_set_in_microsec)
+    player.seek_scheduler.join()
 
     after_set_position = core.playback.get_time_position().get()
     assert before_set_position <= after_set_position
@@ -880,6 +1203,7 @@ def test_set_position_sets_the_current_track_position_in_microsecs(
     position_to_set_in_microsec = position_to_set_in_millisec * 1000
 
     player.SetPosition(track_id, position_to_set_in_microsec)
+    player.seek_scheduler.join()
 
     assert core.playback.get_state().get() == PLAYING
 
@@ -906,6 +1230,7 @@ def test_set_position_does_nothing_if_the_position_is_negative(
     position_to_set_in_microsec = position_to_set_in_millisec * 1000
 
     player.SetPosition(track_id, position_to_set_in_microsec)
+    player.seek_scheduler.join()
 
     after_set_position = core.playback.get_time_position().get()
     assert after_set_position >= before_set_position
@@ -932,6 +1257,7 @@ def test_set_position_does_nothing_if_position_is_gt_track_length(
     position_to_set_in_microsec = position_to_set_in_millisec * 1000
 
     player.SetPosition(track_id, position_to_set_in_microsec)
+    player.seek_scheduler.join()
 
     after_set_position = core.playback.get_time_position().get()
     assert after_set_position >= before_set_position
@@ -958,6 +1284,7 @@ def test_set_position_is_noop_if_track_id_isnt_current_track(
     position_to_set_in_microsec = position_to_set_in_millisec * 1000
 
     player.SetPosition(track_id, position_to_set_in_microsec)
+    player.seek_scheduler.join()
 
     after_set_position = core.playback.get_time_position().get()
     assert after_set_position >= before_set_position
@@ -1038,3 +1365,171 @@ def test_open_uri_starts_playback_of_new_track_if_playing(
 
     assert core.playback.get_state().get() == PLAYING
     assert core.playback.get_current_track().get().uri == "dummy:/test/uri"
+
+
+@pytest.mark.parametrize("can_control", [True, False])
+def test_get_all_properties_matches_getters(
+    core: CoreProxy, player: Player, can_control
+):
+    player._CanControl = can_control
+    core.tracklist.add([Track(uri="dummy:a"), Track(uri="dummy:b")])
+    core.playback.play().get()
+    core.tracklist.set_repeat(True)
+    core.mixer.set_volume(30)
+
+    properties = player.get_all_properties()
+
+    assert properties == {
+        name: getattr(player, name) for name in get_dbus_members(Player)[1]
+    }
+
+
+def test_get_all_properties_uses_one_call_per_value(config, core: CoreProxy):
+    stats = Stats()
+    player = Player(config, cast("CoreProxy", CountingCore(core, stats)))
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+
+    player.get_all_properties()
+
+    assert max(stats.core_calls.values()) == 1
+
+
+def test_get_all_properties_skips_values_in_state_mirror(config, core: CoreProxy):
+    stats = Stats()
+    player = Player(config, cast("CoreProxy", CountingCore(core, stats)))
+    player.state.refresh(core)
+
+    properties = player.get_all_properties()
+
+    assert properties["PlaybackStatus"] == "Stopped"
+    assert "playback.get_state" not in stats.core_calls
+    assert "tracklist.get_random" not in stats.core_calls
+
+
+def test_get_all_properties_uses_extrapolated_position(config, core: CoreProxy):
+    config["mpris"]["position_refresh_ms"] = 60000
+    stats = Stats()
+    player = Player(config, cast("CoreProxy", CountingCore(core, stats)))
+    player.state.position.set(DurationMs(10000), running=False)
+
+    properties = player.get_all_properties()
+
+    assert properties["Position"] == 10000 * 1000
+    assert "playback.get_time_position" not in stats.core_calls
+
+
+@pytest.fixture
+def stuck_core():
+    # A core whose answers never come.
+    core = mock.Mock()
+    core.configure_mock(
+        **{
+            f"{name}.return_value": pykka.ThreadingFuture()
+            for name in [
+                "playback.get_state",
+                "playback.get_current_tl_track",
+                "playback.get_stream_title",
+                "playback.get_time_position",
+                "playback.get_current_tlid",
+                "tracklist.get_repeat",
+                "tracklist.get_single",
+                "tracklist.get_random",
+                "tracklist.get_next_tlid",
+                "tracklist.get_previous_tlid",
+                "mixer.get_mute",
+                "mixer.get_volume",
+                "library.get_images",
+            ]
+        }
+    )
+    return core
+
+
+def test_get_all_waits_for_timeout_in_all(config, core: CoreProxy):
+    player = Player(config, core)
+    futures = [pykka.ThreadingFuture() for _ in range(5)]
+
+    started_at = time.monotonic()
+    with pytest.raises(pykka.Timeout):
+        player.get_all(*futures, timeout=0.05)
+
+    assert time.monotonic() - started_at < 0.2
+
+
+def test_getter_falls_back_to_last_value_on_core_timeout(
+    config, core: CoreProxy, stuck_core
+):
+    config["mpris"]["core_timeout_ms"] = 10
+    player = Player(config, core)
+    core.mixer.set_volume(30).get()
+    assert player.Volume == 0.3
+
+    player.core = stuck_core
+
+    assert player.Volume == 0.3
+    assert player.stats.timeouts == {"Player.Volume": 1}
+
+
+def test_getter_falls_back_to_default_on_core_timeout(config, stuck_core):
+    config["mpris"]["core_timeout_ms"] = 10
+    player = Player(config, stuck_core)
+
+    assert player.PlaybackStatus == "Stopped"
+    assert player.CanGoNext is False
+    assert player.Metadata == {}
+    assert player.stats.timeouts["Player.PlaybackStatus"] == 1
+
+
+def test_get_all_properties_falls_back_on_core_timeout(
+    config, core: CoreProxy, stuck_core
+):
+    config["mpris"]["core_timeout_ms"] = 10
+    player = Player(config, core)
+    core.tracklist.add([Track(uri="dummy:a")])
+    core.playback.play().get()
+    core.mixer.set_volume(30).get()
+    properties = player.get_all_properties()
+
+    player.core = stuck_core
+
+    assert player.get_all_properties() == properties
+    assert player.stats.timeouts == {"Player.GetAll": 1}
+
+
+def test_metadata_leaves_out_art_on_core_timeout(
+    config, core: CoreProxy, backend, stuck_core
+):
+    config["mpris"]["core_timeout_ms"] = 10
+    player = Player(config, core)
+    backend.library.dummy_get_images_result = {
+        "dummy:a": [Image(uri="http://example.com/a.jpg")],
+    }
+    core.tracklist.add([Track(uri="dummy:a", name="a")])
+    core.playback.play().get()
+
+    player.resolver.core = stuck_core
+
+    assert player.Metadata["xesam:title"] == GLib.Variant("s", "a")
+    assert "mpris:artUrl" not in player.Metadata
+    assert player.stats.timeouts["MetadataResolver.get_images"] == 2
+
+    player.resolver.core = core
+
+    assert "mpris:artUrl" in player.Metadata
+
+
+def test_metadata_leaves_out_art_on_failing_art_lookup(
+    config, core: CoreProxy, backend
+):
+    player = Player(config, core)
+    backend.library.dummy_get_images_result = {
+        "dummy:a": [Image(uri="http://example.com/a.jpg")],
+    }
+    core.tracklist.add([Track(uri="dummy:a", name="a")])
+    core.playback.play().get()
+    player.resolver.core = mock.Mock()
+    player.resolver.core.library.get_images.return_value.get.side_effect = RuntimeError
+
+    assert player.Metadata["xesam:title"] == GLib.Variant("s", "a")
+    assert "mpris:artUrl" not in player.get_all_properties()["Metadata"]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from unittest import mock
 
+import pykka
 import pytest
 from mopidy.models import Playlist, Track
 from mopidy.types import PlaybackState
@@ -128,6 +130,37 @@ def test_get_playlist_count_returns_number_of_playlists(playlists: Playlists):
     assert playlists.PlaylistCount == 3
 
 
+def test_get_playlists_with_unknown_order_uses_user_order(playlists: Playlists):
+    result = playlists.GetPlaylists(0, 100, "Modified", True)
+
+    assert [p[1] for p in result] == ["foo", "bar", "baz"]
+
+
+def test_playlists_are_served_from_index_after_first_use(
+    core: CoreProxy, playlists: Playlists
+):
+    assert playlists.PlaylistCount == 3
+    core.playlists.create("qux").get()
+
+    assert playlists.PlaylistCount == 3
+
+    playlists.index.update("dummy:qux", "qux")
+
+    assert playlists.PlaylistCount == 4
+    assert playlists.GetPlaylists(0, 100, "Alphabetical", False)[3][1] == "qux"
+
+
+def test_playlists_are_reloaded_after_index_is_cleared(
+    core: CoreProxy, playlists: Playlists
+):
+    assert playlists.PlaylistCount == 3
+    core.playlists.create("qux").get()
+
+    playlists.index.clear()
+
+    assert playlists.PlaylistCount == 4
+
+
 def test_get_orderings_includes_alpha_modified_and_user(playlists: Playlists):
     result = playlists.Orderings
 
@@ -148,3 +181,13 @@ def test_get_active_playlist_does_not_return_a_playlist(playlists: Playlists):
     assert playlist_id == "/"
     assert playlist_name == "None"
     assert playlist_icon_uri == ""
+
+
+def test_get_playlist_count_falls_back_to_zero_on_core_timeout(config: Config):
+    config["mpris"]["core_timeout_ms"] = 10
+    core = mock.Mock()
+    core.playlists.as_list.return_value = pykka.ThreadingFuture()
+    playlists = Playlists(config, core)
+
+    assert playlists.PlaylistCount == 0
+    assert playlists.stats.timeouts == {"Playlists.PlaylistCount": 1}
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+from gi.repository import Gio, GLib  # pyright: ignore[reportMissingModuleSource]
+
+from mopidy_mpris.playlists import Playlists
+from mopidy_mpris.publication import Dispatcher, ObjectWrapper
+from mopidy_mpris.root import Root
+
+if TYPE_CHECKING:
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+
+
+@pytest.fixture
+def root(config: Config, core: CoreProxy) -> Root:
+    return Root(config, core)
+
+
+@pytest.fixture
+def dispatcher():
+    result = Dispatcher()
+    yield result
+    result.shutdown()
+
+
+@pytest.fixture
+def wrapper(root: Root, dispatcher: Dispatcher) -> ObjectWrapper:
+    node_info = Gio.DBusNodeInfo.new_for_xml(Root.__doc__)
+    return ObjectWrapper(root, node_info.interfaces, dispatcher)
+
+
+@pytest.fixture
+def playlists_wrapper(
+    config: Config, core: CoreProxy, dispatcher: Dispatcher
+) -> ObjectWrapper:
+    playlists = Playlists(config, core)
+    node_info = Gio.DBusNodeInfo.new_for_xml(Playlists.__doc__)
+    return ObjectWrapper(playlists, node_info.interfaces, dispatcher)
+
+
+def call_method(wrapper: ObjectWrapper, interface_name, method_name, *args):
+    invocation = mock.Mock(spec=Gio.DBusMethodInvocation)
+    replied = threading.Event()
+    invocation.return_value.side_effect = lambda *_: replied.set()
+    invocation.return_dbus_error.side_effect = lambda *_: replied.set()
+    wrapper.call_method(
+        None,
+        ":1.1",
+        "/org/mpris/MediaPlayer2",
+        interface_name,
+        method_name,
+        args,
+        invocation,
+    )
+    assert replied.wait(timeout=5)
+    return invocation
+
+
+def test_get_all_uses_get_all_properties(root: Root, wrapper: ObjectWrapper):
+    with mock.patch.object(
+        root, "get_all_properties", wraps=root.get_all_properties
+    ) as get_all_properties:
+        result = wrapper.GetAll("org.mpris.MediaPlayer2")
+
+    get_all_properties.assert_called_once_with()
+    assert result["Identity"] == GLib.Variant("s", "Mopidy")
+    assert result["SupportedUriSchemes"] == GLib.Variant("as", ["dummy"])
+
+
+def test_get_all_only_includes_the_requested_interface(wrapper: ObjectWrapper):
+    assert wrapper.GetAll("org.mpris.MediaPlayer2.Player") == {}
+
+
+def test_deferred_method_replies_when_done(playlists_wrapper: ObjectWrapper):
+    invocation = call_method(
+        playlists_wrapper,
+        "org.mpris.MediaPlayer2.Playlists",
+        "GetPlaylists",
+        0,
+        100,
+        "User",
+        False,
+    )
+
+    invocation.return_value.assert_called_once_with(GLib.Variant("(a(oss))", ([],)))
+
+
+def test_deferred_method_replies_with_error_on_exception(
+    playlists_wrapper: ObjectWrapper,
+):
+    invocation = call_method(
+        playlists_wrapper,
+        "org.mpris.MediaPlayer2.Playlists",
+        "ActivatePlaylist",
+        "/not/a/playlist",
+    )
+
+    invocation.return_dbus_error.assert_called_once()
+    invocation.return_value.assert_not_called()
+
+
+def test_other_methods_reply_immediately(wrapper: ObjectWrapper):
+    invocation = mock.Mock(spec=Gio.DBusMethodInvocation)
+
+    wrapper.call_method(
+        None,
+        ":1.1",
+        "/org/mpris/MediaPlayer2",
+        "org.mpris.MediaPlayer2",
+        "Raise",
+        (),
+        invocation,
+    )
+
+    invocation.return_value.assert_called_once_with(None)
+
+
+def test_dispatcher_runs_calls_from_one_sender_in_order(dispatcher: Dispatcher):
+    calls = []
+    done = threading.Event()
+    first_started = threading.Event()
+    release_first = threading.Event()
+
+    def first():
+        first_started.set()
+        release_first.wait(timeout=5)
+        calls.append("first")
+
+    dispatcher.submit(":1.1", first)
+    dispatcher.submit(":1.1", lambda: calls.append("second"))
+    dispatcher.submit(":1.1", done.set)
+    assert first_started.wait(timeout=5)
+    release_first.set()
+
+    assert done.wait(timeout=5)
+    assert calls == ["first", "second"]
+
+
+def test_dispatcher_runs_calls_from_other_senders_in_parallel(
+    dispatcher: Dispatcher,
+):
+    release = threading.Event()
+    done = threading.Event()
+
+    dispatcher.submit(":1.1", lambda: release.wait(timeout=5))
+    dispatcher.submit(":1.2", done.set)
+
+    assert done.wait(timeout=5)
+    release.set()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from unittest import mock
 
+import pykka
 import pytest
 
 from mopidy_mpris.root import Root
@@ -46,8 +48,8 @@ def test_quit_does_nothing(root: Root):
     root.Quit()
 
 
-def test_has_track_list_returns_false(root: Root):
-    assert root.HasTrackList is False
+def test_has_track_list_returns_true(root: Root):
+    assert root.HasTrackList is True
 
 
 def test_identify_is_mopidy(root: Root):
@@ -62,6 +64,21 @@ def test_supported_uri_schemes_includes_backend_uri_schemes(root: Root):
     assert root.SupportedUriSchemes == ["dummy"]
 
 
+def test_supported_uri_schemes_are_only_fetched_once(root: Root):
+    assert root.SupportedUriSchemes == ["dummy"]
+    root.core = None  # pyright: ignore[reportAttributeAccessIssue]
+
+    assert root.SupportedUriSchemes == ["dummy"]
+
+
+def test_get_all_properties_includes_all_readable_properties(root: Root):
+    properties = root.get_all_properties()
+
+    assert "Fullscreen" in properties
+    assert properties["Identity"] == "Mopidy"
+    assert properties["SupportedUriSchemes"] == ["dummy"]
+
+
 def test_supported_mime_types_has_hardcoded_entries(root: Root):
     assert root.SupportedMimeTypes == [
         "audio/mpeg",
@@ -72,3 +89,13 @@ def test_supported_mime_types_has_hardcoded_entries(root: Root):
         "audio/l16;channels=2;rate=44100",
         "audio/l16;rate=44100;channels=2",
     ]
+
+
+def test_supported_uri_schemes_falls_back_to_empty_on_core_timeout(config: Config):
+    config["mpris"]["core_timeout_ms"] = 10
+    core = mock.Mock()
+    core.get_uri_schemes.return_value = pykka.ThreadingFuture()
+    root = Root(config, core)
+
+    assert root.SupportedUriSchemes == []
+    assert root.stats.timeouts == {"Root.SupportedUriSchemes": 1}
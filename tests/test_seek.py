@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, cast
+
+import pykka
+import pytest
+from mopidy.models import TlTrack, Track
+from mopidy.types import TracklistId
+
+from mopidy_mpris.metadata import get_track_id
+from mopidy_mpris.seek import SeekScheduler
+
+if TYPE_CHECKING:
+    from mopidy.core import CoreProxy
+
+
+def done(value):
+    future = pykka.ThreadingFuture()
+    future.set(value)
+    return future
+
+
+class SlowPlayback:
+    """Playback whose seeks only finish when they are released."""
+
+    def __init__(self) -> None:
+        self.tl_track = TlTrack(tlid=TracklistId(1), track=Track(length=60000))
+        self.position = 10000
+        self.seeks: list[int] = []
+        self.release = threading.Event()
+        self.seeking = threading.Event()
+
+    def get_current_tl_track(self):
+        return done(self.tl_track)
+
+    def get_time_position(self):
+        return done(self.position)
+
+    def seek(self, position):
+        self.seeks.append(position)
+        self.seeking.set()
+        future = pykka.ThreadingFuture()
+
+        def finish():
+            self.release.wait(5)
+            self.position = position
+            future.set(True)
+
+        threading.Thread(target=finish, daemon=True).start()
+        return future
+
+
+class SlowCore:
+    def __init__(self) -> None:
+        self.playback = SlowPlayback()
+
+
+@pytest.fixture
+def slow_core():
+    return SlowCore()
+
+
+@pytest.fixture
+def scheduler(slow_core):
+    return SeekScheduler(cast("CoreProxy", slow_core))
+
+
+def test_offsets_add_up_while_a_seek_is_running(slow_core, scheduler):
+    scheduler.seek_by(1000000)
+    assert slow_core.playback.seeking.wait(5)
+
+    for _ in range(3):
+        scheduler.seek_by(2000000)
+    slow_core.playback.release.set()
+    scheduler.join(timeout=5)
+
+    assert slow_core.playback.seeks == [11000, 17000]
+
+
+def test_set_position_replaces_pending_seeks(slow_core, scheduler):
+    track_id = get_track_id(slow_core.playback.tl_track.tlid)
+    scheduler.seek_by(1000000)
+    assert slow_core.playback.seeking.wait(5)
+
+    scheduler.seek_by(5000000)
+    scheduler.seek_to(track_id, 30000000)
+    scheduler.seek_by(1000000)
+    slow_core.playback.release.set()
+    scheduler.join(timeout=5)
+
+    assert slow_core.playback.seeks == [11000, 31000]
+
+
+def test_set_position_for_another_track_is_ignored(slow_core, scheduler):
+    slow_core.playback.release.set()
+
+    scheduler.seek_to("/com/mopidy/track/2", 30000000)
+    scheduler.join(timeout=5)
+
+    assert slow_core.playback.seeks == []
+
+
+def test_set_position_beyond_track_length_is_ignored(slow_core, scheduler):
+    track_id = get_track_id(slow_core.playback.tl_track.tlid)
+    slow_core.playback.release.set()
+
+    scheduler.seek_to(track_id, 90000000)
+    scheduler.join(timeout=5)
+
+    assert slow_core.playback.seeks == []
+
+
+def test_offset_after_ignored_set_position_is_relative(slow_core, scheduler):
+    scheduler.seek_by(1000000)
+    assert slow_core.playback.seeking.wait(5)
+
+    scheduler.seek_to("/com/mopidy/track/2", 30000000)
+    scheduler.seek_by(2000000)
+    slow_core.playback.release.set()
+    scheduler.join(timeout=5)
+
+    assert slow_core.playback.seeks == [11000, 13000]
+
+
+def test_scrubbing_ends_at_the_last_position(core: CoreProxy):
+    core.tracklist.add([Track(uri="dummy:a", length=60000)])
+    core.playback.play().get()
+    [tl_track] = core.tracklist.get_tl_tracks().get()
+    track_id = get_track_id(tl_track.tlid)
+    scheduler = SeekScheduler(core)
+
+    for position in range(1000, 41000, 1000):
+        scheduler.seek_to(track_id, position * 1000)
+    scheduler.join(timeout=5)
+
+    assert core.playback.get_time_position().get() >= 40000
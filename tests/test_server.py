@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+from gi.repository import Gio, GLib  # pyright: ignore[reportMissingModuleSource]
+
+from mopidy_mpris import server
+
+
+@pytest.fixture
+def gio(monkeypatch):
+    result = mock.Mock()
+    result.io_error_quark = Gio.io_error_quark
+    result.IOErrorEnum = Gio.IOErrorEnum
+    monkeypatch.setattr(server, "Gio", result)
+    return result
+
+
+@pytest.fixture
+def timeout_add_seconds(monkeypatch):
+    result = mock.Mock(side_effect=range(100, 200))
+    monkeypatch.setattr(server.GLib, "timeout_add_seconds", result)
+    monkeypatch.setattr(server.GLib, "source_remove", mock.Mock())
+    return result
+
+
+@pytest.fixture
+def publication(monkeypatch):
+    result = mock.Mock()
+    monkeypatch.setattr(server, "Publication", result)
+    return result
+
+
+@pytest.fixture
+def mpris(config, core, gio, timeout_add_seconds, publication):
+    return server.Server(config, core)
+
+
+def fail_to_connect(mpris, gio):
+    gio.bus_get_finish.side_effect = GLib.Error("No bus")
+    mpris._on_bus_get(None, mock.sentinel.result)
+
+
+def connect(mpris, gio):
+    connection = mock.Mock()
+    connection.is_closed.return_value = False
+    gio.bus_get_finish.side_effect = None
+    gio.bus_get_finish.return_value = connection
+    mpris._on_bus_get(None, mock.sentinel.result)
+    return connection
+
+
+def test_publish_does_not_wait_for_the_bus(mpris, gio):
+    mpris.publish()
+
+    gio.bus_get.assert_called_once()
+    assert not mpris.ready.is_set()
+
+
+def test_publishes_and_requests_name_when_connected(mpris, gio, publication):
+    mpris.publish()
+
+    connection = connect(mpris, gio)
+
+    publication.assert_called_once()
+    connection.set_exit_on_close.assert_called_once_with(False)
+    gio.bus_own_name_on_connection.assert_called_once()
+    assert gio.bus_own_name_on_connection.call_args.args[1] == server.BUS_NAME
+
+
+def test_ready_when_name_is_acquired(mpris, gio):
+    mpris.publish()
+    connection = connect(mpris, gio)
+
+    mpris._on_name_acquired(connection, server.BUS_NAME)
+
+    assert mpris.ready.is_set()
+
+
+def test_retries_with_increasing_delay_when_bus_is_unavailable(
+    mpris, gio, timeout_add_seconds
+):
+    mpris.publish()
+
+    for _ in range(8):
+        fail_to_connect(mpris, gio)
+        callback = timeout_add_seconds.call_args.args[1]
+        assert callback() is GLib.SOURCE_REMOVE
+
+    delays = [c.args[0] for c in timeout_add_seconds.call_args_list]
+    assert delays == [1, 2, 4, 8, 16, 32, 60, 60]
+    assert gio.bus_get.call_count == 9
+
+
+def test_delay_is_reset_after_connecting(mpris, gio, timeout_add_seconds):
+    mpris.publish()
+    fail_to_connect(mpris, gio)
+    timeout_add_seconds.call_args.args[1]()
+    fail_to_connect(mpris, gio)
+    timeout_add_seconds.call_args.args[1]()
+    connection = connect(mpris, gio)
+
+    mpris._on_connection_closed(connection, True, None)
+
+    assert timeout_add_seconds.call_args.args[0] == 1
+
+
+def test_republishes_when_connection_is_lost(mpris, gio, publication):
+    mpris.publish()
+    connection = connect(mpris, gio)
+    mpris._on_name_acquired(connection, server.BUS_NAME)
+    token = publication.return_value
+
+    connection.is_closed.return_value = True
+    mpris._on_name_lost(connection, server.BUS_NAME)
+    mpris._on_connection_closed(connection, True, None)
+
+    assert not mpris.ready.is_set()
+    token.unpublish.assert_called_once_with()
+    gio.bus_unown_name.assert_called_once()
+
+    mpris._on_reconnect()
+    connect(mpris, gio)
+
+    assert gio.bus_get.call_count == 2
+    assert publication.call_count == 2
+    # The same interfaces are published again, with the state they hold.
+    first_objects = publication.call_args_list[0].args[1:]
+    second_objects = publication.call_args_list[1].args[1:]
+    assert [o._interface for o in first_objects[:4]] == [
+        o._interface for o in second_objects[:4]
+    ]
+
+
+def test_waits_for_name_when_it_is_taken_over(mpris, gio, timeout_add_seconds):
+    mpris.publish()
+    connection = connect(mpris, gio)
+    mpris._on_name_acquired(connection, server.BUS_NAME)
+
+    mpris._on_name_lost(connection, server.BUS_NAME)
+
+    assert not mpris.ready.is_set()
+    # The bus gives us the name back when the other process releases it.
+    gio.bus_unown_name.assert_not_called()
+    timeout_add_seconds.assert_not_called()
+
+
+def test_unpublish_stops_reconnecting(mpris, gio, timeout_add_seconds):
+    mpris.publish()
+    fail_to_connect(mpris, gio)
+
+    mpris.unpublish()
+
+    server.GLib.source_remove.assert_called_once_with(100)
+    assert timeout_add_seconds.call_args.args[1]() is GLib.SOURCE_REMOVE
+    assert gio.bus_get.call_count == 1
+
+
+def test_unpublish_while_connecting_cancels(mpris, gio, publication):
+    mpris.publish()
+    cancellable = gio.Cancellable.return_value
+
+    mpris.unpublish()
+    connect(mpris, gio)
+
+    cancellable.cancel.assert_called_once_with()
+    publication.assert_not_called()
+
+
+def test_interfaces_share_the_stats(mpris):
+    for interface in [
+        mpris.root,
+        mpris.player,
+        mpris.playlists,
+        mpris.tracklist,
+        mpris.debug,
+    ]:
+        assert interface.stats is mpris.stats
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import inspect
+from typing import TYPE_CHECKING
+
+import pytest
+
+from mopidy_mpris.player import Player
+from mopidy_mpris.root import Root
+from mopidy_mpris.stats import (
+    LATENCY_BUCKETS_US,
+    CountingCore,
+    InstrumentedInterface,
+    Stats,
+)
+
+if TYPE_CHECKING:
+    from mopidy.config import Config
+    from mopidy.core import CoreProxy
+
+
+@pytest.fixture
+def stats() -> Stats:
+    return Stats()
+
+
+def test_record_call_counts_calls_and_latency(stats: Stats):
+    stats.record_call("Player.Position", 0.00005)
+    stats.record_call("Player.Position", 10)
+
+    assert stats.calls["Player.Position"] == 2
+    histogram = stats.latencies["Player.Position"]
+    assert len(histogram) == len(LATENCY_BUCKETS_US) + 1
+    assert histogram[0] == 1
+    assert histogram[-1] == 1
+
+
+def test_reset_clears_counters_in_place(stats: Stats):
+    signals = stats.signals
+    stats.record_call("Player.Position", 0.001)
+    stats.record_core_call("playback.get_state")
+    stats.record_signal("signals_emitted")
+    stats.record_timeout("Player.Volume")
+
+    stats.reset()
+
+    assert stats.calls == {}
+    assert stats.latencies == {}
+    assert stats.core_calls == {}
+    assert signals == {}
+    assert stats.signals is signals
+    assert stats.timeouts == {}
+
+
+def test_instrumented_interface_records_property_gets(
+    config: Config, core: CoreProxy, stats: Stats
+):
+    instrumented = InstrumentedInterface(Root(config, core), stats)
+
+    assert instrumented.Identity == "Mopidy"
+
+    assert stats.calls == {"Root.Identity": 1}
+
+
+def test_instrumented_interface_records_property_sets(
+    config: Config, core: CoreProxy, stats: Stats
+):
+    player = Player(config, core)
+    instrumented = InstrumentedInterface(player, stats)
+
+    instrumented.Volume = 0.5
+
+    assert core.mixer.get_volume().get() == 50
+    assert stats.calls == {"Player.Volume=": 1}
+
+
+def test_instrumented_interface_records_method_calls(
+    config: Config, core: CoreProxy, stats: Stats
+):
+    instrumented = InstrumentedInterface(Player(config, core), stats)
+
+    instrumented.Stop()
+
+    assert stats.calls == {"Player.Stop": 1}
+
+
+def test_instrumented_interface_keeps_method_signatures(
+    config: Config, core: CoreProxy, stats: Stats
+):
+    player = Player(config, core)
+    instrumented = InstrumentedInterface(player, stats)
+
+    assert inspect.signature(instrumented.Seek) == inspect.signature(player.Seek)
+
+
+def test_instrumented_interface_passes_other_attributes_through(
+    config: Config, core: CoreProxy, stats: Stats
+):
+    player = Player(config, core)
+    instrumented = InstrumentedInterface(player, stats)
+
+    assert instrumented.state is player.state
+    assert stats.calls == {}
+
+
+def test_counting_core_counts_calls_by_path(core: CoreProxy, stats: Stats):
+    counting_core = CountingCore(core, stats)
+
+    counting_core.playback.get_state().get()
+    counting_core.playback.get_state().get()
+    counting_core.tracklist.get_length().get()
+
+    assert stats.core_calls == {
+        "playback.get_state": 2,
+        "tracklist.get_length": 1,
+    }
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pykka
+import pytest
+from gi.repository import GLib  # pyright: ignore[reportMissingModuleSource]
+from mopidy.models import Image, Track
+from mopidy.types import PlaybackState
+
+from mopidy_mpris.tracklist import NO_TRACK, TrackList
+
+if TYPE_CHECKING:
+    from mopidy.core import CoreProxy
+
+
+@pytest.fixture
+def tracklist(config, core: CoreProxy) -> TrackList:
+    return TrackList(config, core)
+
+
+@pytest.fixture
+def tl_tracks(core: CoreProxy):
+    return core.tracklist.add(
+        [Track(uri=f"dummy:{name}", name=name) for name in "abcd"]
+    ).get()
+
+
+@pytest.fixture
+def signals(tracklist: TrackList):
+    result = []
+    for name in [
+        "TrackListReplaced",
+        "TrackAdded",
+        "TrackRemoved",
+        "TrackMetadataChanged",
+    ]:
+        getattr(tracklist, name).connect(
+            lambda *args, name=name: result.append((name, *args))
+        )
+    return result
+
+
+def test_tracks_is_empty_when_tracklist_is_empty(tracklist: TrackList):
+    assert tracklist.Tracks == []
+
+
+def test_tracks_returns_track_ids_in_order(tracklist: TrackList, tl_tracks):
+    assert tracklist.Tracks == [f"/com/mopidy/track/{t.tlid}" for t in tl_tracks]
+
+
+def test_tracks_is_limited_to_window_around_current_track(config, core: CoreProxy):
+    config["mpris"]["tracklist_window"] = 2
+    tl_tracks = core.tracklist.add([Track(uri=f"dummy:{i}") for i in range(10)]).get()
+    core.playback.play(tlid=tl_tracks[5].tlid).get()
+
+    result = TrackList(config, core).Tracks
+
+    assert result == [f"/com/mopidy/track/{t.tlid}" for t in tl_tracks[3:8]]
+
+
+def test_get_tracks_metadata_in_requested_order(tracklist: TrackList, tl_tracks):
+    track_ids = [
+        f"/com/mopidy/track/{tl_tracks[2].tlid}",
+        "/com/mopidy/track/9999",
+        "/not/a/track",
+        f"/com/mopidy/track/{tl_tracks[0].tlid}",
+    ]
+
+    result = tracklist.GetTracksMetadata(track_ids)
+
+    assert [m["xesam:title"] for m in result] == [
+        GLib.Variant("s", "c"),
+        GLib.Variant("s", "a"),
+    ]
+
+
+def test_get_tracks_metadata_includes_art_url(backend, tracklist: TrackList, tl_tracks):
+    backend.library.dummy_get_images_result = {
+        "dummy:a": [Image(uri="http://example.com/a.jpg")],
+    }
+
+    result = tracklist.GetTracksMetadata([f"/com/mopidy/track/{tl_tracks[0].tlid}"])
+
+    assert result[0]["mpris:artUrl"] == GLib.Variant("s", "http://example.com/a.jpg")
+
+
+def test_get_metadata_by_tlids(tracklist: TrackList, tl_tracks):
+    result = tracklist.GetMetadataByTlids([tl_tracks[3].tlid, 9999, tl_tracks[1].tlid])
+
+    assert [m["xesam:title"] for m in result] == [
+        GLib.Variant("s", "d"),
+        GLib.Variant("s", "b"),
+    ]
+
+
+def test_add_track_after_track(
+    backend, core: CoreProxy, tracklist: TrackList, tl_tracks
+):
+    backend.library.dummy_library = [Track(uri="dummy:new")]
+
+    tracklist.AddTrack("dummy:new", f"/com/mopidy/track/{tl_tracks[1].tlid}", False)
+
+    uris = [t.uri for t in core.tracklist.get_tracks().get()]
+    assert uris == ["dummy:a", "dummy:b", "dummy:new", "dummy:c", "dummy:d"]
+    assert core.playback.get_state().get() == PlaybackState.STOPPED
+
+
+def test_add_track_after_no_track_inserts_first(
+    backend, core: CoreProxy, tracklist: TrackList, tl_tracks
+):
+    backend.library.dummy_library = [Track(uri="dummy:new")]
+
+    tracklist.AddTrack("dummy:new", NO_TRACK, False)
+
+    assert core.tracklist.get_tracks().get()[0].uri == "dummy:new"
+
+
+def test_add_track_as_current_starts_playing_it(
+    backend, core: CoreProxy, tracklist: TrackList, tl_tracks
+):
+    backend.library.dummy_library = [Track(uri="dummy:new")]
+
+    tracklist.AddTrack("dummy:new", NO_TRACK, True)
+
+    assert core.playback.get_state().get() == PlaybackState.PLAYING
+    assert core.playback.get_current_track().get().uri == "dummy:new"
+
+
+def test_add_track_is_ignored_if_can_edit_tracks_is_false(
+    backend, core: CoreProxy, tracklist: TrackList, tl_tracks
+):
+    backend.library.dummy_library = [Track(uri="dummy:new")]
+    tracklist.CanEditTracks = False
+
+    tracklist.AddTrack("dummy:new", NO_TRACK, False)
+
+    assert core.tracklist.get_length().get() == 4
+
+
+def test_remove_track(core: CoreProxy, tracklist: TrackList, tl_tracks):
+    tracklist.RemoveTrack(f"/com/mopidy/track/{tl_tracks[1].tlid}")
+
+    uris = [t.uri for t in core.tracklist.get_tracks().get()]
+    assert uris == ["dummy:a", "dummy:c", "dummy:d"]
+
+
+def test_go_to_plays_track(core: CoreProxy, tracklist: TrackList, tl_tracks):
+    tracklist.GoTo(f"/com/mopidy/track/{tl_tracks[2].tlid}")
+
+    assert core.playback.get_state().get() == PlaybackState.PLAYING
+    assert core.playback.get_current_tlid().get() == tl_tracks[2].tlid
+
+
+def test_go_to_unknown_track_does_nothing(core: CoreProxy, tracklist: TrackList):
+    tracklist.GoTo("/com/mopidy/track/9999")
+
+    assert core.playback.get_state().get() == PlaybackState.STOPPED
+
+
+def test_refresh_before_first_use_emits_nothing(
+    core: CoreProxy, tracklist: TrackList, tl_tracks, signals
+):
+    tracklist.refresh()
+
+    assert signals == []
+
+
+def test_refresh_emits_track_added(
+    core: CoreProxy, tracklist: TrackList, tl_tracks, signals
+):
+    assert len(tracklist.Tracks) == 4
+    [new] = core.tracklist.add([Track(uri="dummy:e", name="e")]).get()
+
+    tracklist.refresh()
+
+    [(name, metadata, after_track)] = signals
+    assert name == "TrackAdded"
+    assert metadata["mpris:trackid"] == GLib.Variant(
+        "o", f"/com/mopidy/track/{new.tlid}"
+    )
+    assert after_track == f"/com/mopidy/track/{tl_tracks[3].tlid}"
+
+
+def test_refresh_emits_track_removed(
+    core: CoreProxy, tracklist: TrackList, tl_tracks, signals
+):
+    assert len(tracklist.Tracks) == 4
+    core.tracklist.remove({"tlid": [tl_tracks[1].tlid]}).get()
+
+    tracklist.refresh()
+
+    assert signals == [("TrackRemoved", f"/com/mopidy/track/{tl_tracks[1].tlid}")]
+    assert tracklist.stats.signals == {"track_removed": 1, "tracks_invalidated": 1}
+
+
+def test_refresh_emits_track_list_replaced_on_big_changes(
+    core: CoreProxy, tracklist: TrackList, tl_tracks, signals
+):
+    assert len(tracklist.Tracks) == 4
+    core.tracklist.clear().get()
+
+    tracklist.refresh()
+
+    assert signals == [("TrackListReplaced", [], NO_TRACK)]
+
+
+def test_refresh_emits_track_list_replaced_when_tracks_move(
+    core: CoreProxy, tracklist: TrackList, tl_tracks, signals
+):
+    assert len(tracklist.Tracks) == 4
+    core.tracklist.move(0, 1, 3).get()
+
+    tracklist.refresh()
+
+    [(name, tracks, _current_track)] = signals
+    assert name == "TrackListReplaced"
+    assert tracks == tracklist.Tracks
+
+
+@pytest.mark.parametrize("change", ["add", "clear"])
+def test_refresh_invalidates_tracks_property(
+    core: CoreProxy, tracklist: TrackList, tl_tracks, change
+):
+    assert len(tracklist.Tracks) == 4
+    properties_changed = []
+    tracklist.PropertiesChanged.connect(lambda *args: properties_changed.append(args))
+    if change == "add":
+        core.tracklist.add([Track(uri="dummy:e")]).get()
+    else:
+        core.tracklist.clear().get()
+
+    tracklist.refresh()
+
+    assert properties_changed == [(TrackList.INTERFACE, {}, ["Tracks"])]
+
+
+def test_refresh_without_changes_does_not_invalidate_tracks_property(
+    tracklist: TrackList, tl_tracks
+):
+    assert len(tracklist.Tracks) == 4
+    properties_changed = []
+    tracklist.PropertiesChanged.connect(lambda *args: properties_changed.append(args))
+
+    tracklist.refresh()
+
+    assert properties_changed == []
+
+
+def test_refresh_keeps_tracks_on_core_timeout(
+    config, core: CoreProxy, tl_tracks, signals
+):
+    config["mpris"]["core_timeout_ms"] = 10
+    tracklist = TrackList(config, core)
+    tracks = tracklist.Tracks
+    stuck_core = mock.Mock()
+    stuck_core.playback.get_current_tlid.return_value = pykka.ThreadingFuture()
+    stuck_core.tracklist.index.return_value = pykka.ThreadingFuture()
+    tracklist.core = stuck_core
+
+    tracklist.refresh()
+
+    assert tracklist.Tracks == tracks
+    assert tracklist.stats.timeouts == {"TrackList.Tracks": 1}
+
+
+def test_tracks_falls_back_on_core_timeout(config):
+    config["mpris"]["core_timeout_ms"] = 10
+    stuck_core = mock.Mock()
+    stuck_core.playback.get_current_tlid.return_value = pykka.ThreadingFuture()
+    stuck_core.tracklist.index.return_value = pykka.ThreadingFuture()
+    tracklist = TrackList(config, stuck_core)
+
+    assert tracklist.Tracks == []
+    assert tracklist.stats.timeouts == {"TrackList.Tracks": 1}
+
+
+def test_get_tracks_metadata_fails_on_core_timeout(config, tl_tracks):
+    config["mpris"]["core_timeout_ms"] = 10
+    stuck_core = mock.Mock()
+    stuck_core.tracklist.filter.return_value = pykka.ThreadingFuture()
+    tracklist = TrackList(config, stuck_core)
+
+    with pytest.raises(pykka.Timeout):
+        tracklist.GetTracksMetadata([f"/com/mopidy/track/{tl_tracks[0].tlid}"])
+
+    assert tracklist.stats.timeouts == {"TrackList.GetTracksMetadata": 1}
+
+
+def test_get_tracks_metadata_leaves_out_art_on_core_timeout(
+    config, core: CoreProxy, tl_tracks
+):
+    config["mpris"]["core_timeout_ms"] = 10
+    tracklist = TrackList(config, core)
+    tracklist.resolver.core = mock.Mock()
+    tracklist.resolver.core.library.get_images.return_value = pykka.ThreadingFuture()
+
+    result = tracklist.GetTracksMetadata([f"/com/mopidy/track/{tl_tracks[0].tlid}"])
+
+    assert result[0]["xesam:title"] == "a"
+    assert "mpris:artUrl" not in result[0]
+    assert tracklist.stats.timeouts == {"MetadataResolver.get_images": 1}
+
+
+def test_emit_track_metadata_changed_for_exposed_track(
+    tracklist: TrackList, tl_tracks, signals
+):
+    assert len(tracklist.Tracks) == 4
+    track_id = f"/com/mopidy/track/{tl_tracks[0].tlid}"
+    metadata = {"mpris:trackid": GLib.Variant("o", track_id)}
+
+    tracklist.emit_track_metadata_changed(metadata)
+
+    assert signals == [("TrackMetadataChanged", track_id, metadata)]
+
+
+def test_emit_track_metadata_changed_ignores_unknown_track(
+    tracklist: TrackList, tl_tracks, signals
+):
+    assert len(tracklist.Tracks) == 4
+    metadata = {"mpris:trackid": GLib.Variant("o", "/com/mopidy/track/9999")}
+
+    tracklist.emit_track_metadata_changed(metadata)
+
+    assert signals == []
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, cast
+
+import pykka
+
+from mopidy_mpris.stats import CountingCore, Stats
+from mopidy_mpris.volume import VolumeWriter
+
+if TYPE_CHECKING:
+    from mopidy.core import CoreProxy
+
+
+def test_first_change_is_applied_at_once(core: CoreProxy):
+    writer = VolumeWriter(core, min_interval=0)
+
+    writer.set(30)
+
+    # The change was sent to the mixer before set() returned.
+    assert core.mixer.get_volume().get() == 30
+    writer.join(timeout=5)
+
+
+def test_change_unmutes(core: CoreProxy):
+    core.mixer.set_mute(True).get()
+    writer = VolumeWriter(core, min_interval=0)
+
+    writer.set(30)
+    writer.join(timeout=5)
+
+    assert core.mixer.get_mute().get() is False
+
+
+def test_change_to_zero_does_not_unmute(core: CoreProxy):
+    core.mixer.set_mute(True).get()
+    writer = VolumeWriter(core, min_interval=0)
+
+    writer.set(0)
+    writer.join(timeout=5)
+
+    assert core.mixer.get_mute().get() is True
+
+
+def test_dragging_a_slider_only_applies_the_newest_volume(core: CoreProxy):
+    stats = Stats()
+    writer = VolumeWriter(
+        cast("CoreProxy", CountingCore(core, stats)),
+        min_interval=1,
+    )
+
+    # Within the interval, as if from a client dragging a volume slider.
+    for volume in range(1, 101):
+        writer.set(volume)
+    writer.join(timeout=5)
+
+    assert core.mixer.get_volume().get() == 100
+    # The first and the last of the hundred changes went to the mixer.
+    assert stats.core_calls["mixer.set_volume"] == 2
+
+
+def test_changes_wait_for_a_busy_mixer():
+    release = threading.Event()
+
+    class SlowMixer:
+        def __init__(self) -> None:
+            self.volumes: list[int] = []
+
+        def set_volume(self, volume: int) -> pykka.Future[bool]:
+            self.volumes.append(volume)
+            future: pykka.ThreadingFuture[bool] = pykka.ThreadingFuture()
+            threading.Thread(
+                target=lambda: (release.wait(5), future.set(True)),
+                daemon=True,
+            ).start()
+            return future
+
+        def set_mute(self, _mute: bool) -> pykka.Future[bool]:  # noqa: FBT001
+            future: pykka.ThreadingFuture[bool] = pykka.ThreadingFuture()
+            future.set(True)
+            return future
+
+    class SlowCore:
+        mixer = SlowMixer()
+
+    writer = VolumeWriter(cast("CoreProxy", SlowCore()), min_interval=0)
+
+    for volume in range(1, 51):
+        writer.set(volume)
+    release.set()
+    writer.join(timeout=5)
+
+    assert SlowCore.mixer.volumes == [1, 50]